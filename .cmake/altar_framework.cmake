@@ -47,11 +47,21 @@ function(altar_buildLibrary)
     libaltar PRIVATE
     ${GSL_LIBRARIES}
     )
+  # the bulk kernels use openmp, if it's available
+  if(OpenMP_CXX_FOUND)
+    target_link_libraries(libaltar PRIVATE OpenMP::OpenMP_CXX)
+  endif()
   # add the sources
   target_sources(
     libaltar PRIVATE
     lib/libaltar/bayesian/CoolingStep.cc
     lib/libaltar/bayesian/COV.cc
+    lib/libaltar/bayesian/metropolis.cc
+    lib/libaltar/bayesian/scheduler.cc
+    lib/libaltar/bayesian/covariance.cc
+    lib/libaltar/bayesian/langevin.cc
+    lib/libaltar/distributions/gaussian.cc
+    lib/libaltar/distributions/uniform.cc
     )
 
   # copy the altar headers; note the trickery with the terminating slash in the source
@@ -101,6 +111,13 @@ function(altar_buildModule)
     ext/metadata.cc
     ext/exceptions.cc
     ext/dbeta.cc
+    ext/scheduler.cc
+    ext/covariance.cc
+    ext/metropolis.cc
+    ext/langevin.cc
+    ext/distributions.cc
+    ext/buffers.cc
+    ext/rng.cc
     )
 
   # install the altar extension
@@ -0,0 +1,47 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+# get the package
+import altar
+
+
+# declaration
+class Convert(altar.panel(), family='altar.actions.convert'):
+    """
+    Convert text model inputs into binary files that can be memory mapped
+    """
+
+
+    # user configurable state
+    files = altar.properties.list(schema=altar.properties.path())
+    files.tip = "the text files to convert"
+
+
+    # commands
+    @altar.export(tip="convert text model inputs into .npy files")
+    def npy(self, plexus, argv=(), **kwds):
+        """
+        Convert each text file into a {.npy} file with the same name, next to it
+        """
+        # grab a channel
+        channel = plexus.info
+        # go through the files
+        for source in tuple(argv) or self.files:
+            # convert
+            destination = altar.models.bayesian.Inputs.convert(source=source)
+            # and show me
+            channel.line(f"{source} -> {destination}")
+        # flush
+        channel.log()
+        # all done
+        return 0
+
+
+# end of file
@@ -22,6 +22,17 @@ def about():
     return About
 
 
+# convert text model inputs into binary files
+@altar.foundry(implements=altar.action, tip="convert text model inputs into binary files")
+def convert():
+    # get the command panel
+    from .Convert import Convert
+    # attach the docstring
+    __doc__ = Convert.__doc__
+    # and  return the panel
+    return Convert
+
+
 # sample the posterior distribution of a model
 @altar.foundry(implements=altar.action, tip="sample the posterior distribution of a model")
 def sample():
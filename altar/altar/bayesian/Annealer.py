@@ -91,8 +91,11 @@ class Annealer(altar.component, family="altar.controllers.annealer", implements=
 
         # notify all interested parties that the simulation is about to start
         dispatcher.notify(event=dispatcher.start, controller=self)
-        # start the process
-        worker.start(annealer=self)
+        # start the process, or pick it up from the most recent checkpoint
+        if model.job.restart:
+            worker.restart(annealer=self)
+        else:
+            worker.start(annealer=self)
 
         # iterate until β is sufficiently close to one
         while worker.beta + tolerance < 1:
@@ -120,6 +123,8 @@ class Annealer(altar.component, family="altar.controllers.annealer", implements=
 
             # notify the worker we are at the bottom of the current step
             worker.bottom(annealer=self)
+            # give it a chance to save its state
+            worker.checkpoint(annealer=self)
             # and dispatch the matching event
             dispatcher.notify(event=dispatcher.betaFinish, controller=self)
 
@@ -157,8 +162,12 @@ class Annealer(altar.component, family="altar.controllers.annealer", implements=
 
         # if i don't have mpi
         if mode != "mpi":
+            # the user may prefer processes for cpu tasks, e.g. for models that hold the GIL
+            if gpus == 0 and tasks > 1 and job.concurrency == "processes":
+                # build the method
+                worker = self.processes(processes=tasks)
             # we need threads if either {tasks} or {gpus} is greater than one
-            if gpus > 1 or tasks > 1:
+            elif gpus > 1 or tasks > 1:
                 # compute the number  of threads we need
                 threads = tasks * gpus or tasks or gpus
                 # build the method
@@ -181,7 +190,8 @@ class Annealer(altar.component, family="altar.controllers.annealer", implements=
                 worker = worker()
 
             # in any case, use the mpi aware annealing method
-            worker = self.mpi(worker=worker)
+            worker = self.mpi(
+                worker=worker, distributed=job.distributed, balance=job.balance and gpus == 0)
 
         # all done
         return worker
@@ -217,13 +227,37 @@ class Annealer(altar.component, family="altar.controllers.annealer", implements=
         return ThreadedAnnealing(annealer=self, threads=threads, worker=worker)
 
 
-    def mpi(self, worker):
+    def processes(self, processes):
+        """
+        Instantiate the annealing method that walks the chains in a pool of local processes
+        """
+        # get the process based annealer
+        from .ProcessAnnealing import ProcessAnnealing
+        # instantiate it and return it
+        return ProcessAnnealing(annealer=self, processes=processes)
+
+
+    def mpi(self, worker, distributed=False, balance=False):
         """
         Instantiate the MPI aware annealing method
         """
+        # if the user wants the sample set to stay distributed
+        if distributed:
+            # the chains never move between tasks, so there is no way to balance the load
+            if balance:
+                # pick a channel
+                channel = self.warning
+                # complain
+                channel.line(f"the chains of a distributed sample set can't be rebalanced")
+                channel.log(f" -- ignoring the request to balance the load")
+            # get the annealing method that never assembles it
+            from .DistributedAnnealing import DistributedAnnealing
+            # instantiate it and return it
+            return DistributedAnnealing(annealer=self, worker=worker)
+        # otherwise
         from .MPIAnnealing import MPIAnnealing
         # instantiate it and return it
-        return MPIAnnealing(annealer=self, worker=worker)
+        return MPIAnnealing(annealer=self, worker=worker, balance=balance)
 
 
     # private data
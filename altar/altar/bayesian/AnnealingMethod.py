@@ -9,6 +9,10 @@
 #
 
 
+# the package
+import altar
+
+
 # declaration
 class AnnealingMethod:
     """
@@ -133,6 +137,30 @@ class AnnealingMethod:
         return self
 
 
+    def checkpoint(self, annealer):
+        """
+        Notification that we are at the end of a β update; give the archiver a chance to
+        record my state
+        """
+        # get the archiver
+        archiver = annealer.archiver
+        # if it isn't time
+        if not archiver.due(iteration=self.iteration):
+            # bail
+            return self
+        # get my state
+        step = self.step
+        # and hand it to the archiver, along with everything else needed to resume
+        archiver.checkpoint(
+            step=step, iteration=self.iteration, scaling=annealer.sampler.scaling,
+            carried=getattr(annealer.scheduler, "carried", None),
+            solver=self.solverState(annealer=annealer),
+            structure=self.structure(annealer=annealer, sigma=step.sigma),
+            states=(self.rngState(annealer=annealer),), counts=(step.samples,))
+        # all done
+        return self
+
+
     def finish(self, annealer):
         """
         Notification that the simulation is over
@@ -147,6 +175,115 @@ class AnnealingMethod:
         return self
 
 
+    # implementation details
+    def retrieve(self, annealer):
+        """
+        Ask the archiver for the most recent checkpoint
+        """
+        # get it
+        snapshot = annealer.archiver.restore()
+        # if there isn't one
+        if snapshot is None:
+            # grab a channel
+            channel = annealer.error
+            # complain
+            channel.line(f"the archiver has no checkpoint to restart from")
+            channel.line(f" -- please use an archiver that supports checkpoints")
+            channel.line(f" -- e.g., use '--controller.archiver=checkpoint' on the command line")
+            channel.log()
+            # and exit
+            raise SystemExit(1)
+        # otherwise, return it
+        return snapshot
+
+
+    def resume(self, annealer, snapshot, state):
+        """
+        Restore the parts of the simulation state in {snapshot} that live outside my cooling
+        step; {state} is the state of my random number generator
+        """
+        # pick up the iteration count
+        self.iteration = snapshot.iteration
+        # the covariance scaling of the sampler
+        annealer.sampler.scaling = snapshot.scaling
+        # the weights carried over by the scheduler
+        if snapshot.carried is not None: annealer.scheduler.carried = snapshot.carried
+        # the state of its δβ solver, so the schedule picks up where it left off
+        if snapshot.solver is not None: self.solverRestore(annealer=annealer, state=snapshot.solver)
+        # the structure of the covariance, so the sampler doesn't have to recover it
+        if snapshot.structure is not None:
+            # by handing it to the representation of the scheduler
+            annealer.scheduler.covariance.adopt(sigma=snapshot.sigma, shared=snapshot.structure)
+        # and the state of the random number generator
+        self.rngRestore(annealer=annealer, state=state)
+        # all done
+        return self
+
+
+    def restore(self, snapshot):
+        """
+        Build a cooling step out of the state in {snapshot}
+        """
+        # easy enough
+        return self.CoolingStep(
+            beta=snapshot.beta, theta=snapshot.theta,
+            likelihoods=(snapshot.prior, snapshot.data, snapshot.posterior),
+            sigma=snapshot.sigma)
+
+
+    def rngState(self, annealer):
+        """
+        Get the state of my random number generator
+        """
+        # ask the extension
+        return altar.libaltar.rng_state(annealer.model.rng.rng.rng)
+
+
+    def rngRestore(self, annealer, state):
+        """
+        Restore the {state} of my random number generator
+        """
+        # ask the extension
+        altar.libaltar.rng_restore(annealer.model.rng.rng.rng, state)
+        # all done
+        return self
+
+
+    def solverState(self, annealer):
+        """
+        Get the state of the δβ solver of the scheduler, if it has one
+        """
+        # get the solver
+        solver = getattr(annealer.scheduler, "solver", None)
+        # and ask it for its state
+        return None if solver is None else solver.state()
+
+
+    def solverRestore(self, annealer, state):
+        """
+        Restore the {state} of the δβ solver of the scheduler
+        """
+        # ask the solver
+        annealer.scheduler.solver.restore(state=state)
+        # all done
+        return self
+
+
+    def structure(self, annealer, sigma):
+        """
+        Ask the covariance representation of the scheduler, if it has one, for whatever the
+        other tasks need to draw displacements from {sigma} without recovering it themselves
+        """
+        # get the representation
+        representation = getattr(annealer.scheduler, "covariance", None)
+        # if there isn't one
+        if representation is None:
+            # there is nothing to share
+            return None
+        # otherwise, ask it
+        return representation.share(sigma=sigma)
+
+
     # meta-methods
     def __init__(self, annealer, **kwds):
         # chain up; absorb the {annealer}
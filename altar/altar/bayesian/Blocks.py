@@ -0,0 +1,166 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+# my protocol
+from .Covariance import Covariance as covariance
+
+
+# declaration
+class Blocks(altar.component, family="altar.bayesian.covariances.blocks",
+             implements=covariance):
+    """
+    A block diagonal parameter covariance, with one block per parameter set of the model
+
+    Correlations among parameters in different sets are ignored; for blocks of sizes b_i, the
+    costs are O(N Σ b_i^2) for estimation and O(Σ b_i^3) for the factorization, for N samples.
+    Models without parameter sets get a single block
+    """
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # save the model; the application initializes me before it, so its parameter sets have
+        # not been placed yet, and the blocks get carved out the first time they are needed
+        self.model = application.model
+        # all done
+        return self
+
+
+    @altar.export
+    def estimate(self, w, theta, sigma):
+        """
+        Fill {sigma} with the covariance of the samples in {theta}, given their normalized
+        weights {w}
+        """
+        # get the number of samples
+        samples = theta.rows
+        # clear out the correlations among the blocks
+        sigma.zero()
+        # go through the blocks
+        for offset, count in self.partition():
+            # get the samples of this parameter set
+            θ = theta.view(start=(0, offset), shape=(samples, count))
+            # and its block of the covariance
+            Σ = sigma.view(start=(offset, offset), shape=(count, count))
+            # room for the weighted mean
+            θbar = altar.vector(shape=count)
+            # compute
+            altar.libaltar.covariance(w.data, θ.data, θbar.data, Σ.data)
+        # all done
+        return sigma
+
+
+    @altar.export
+    def factor(self, sigma, scaling):
+        """
+        Prepare to draw displacements from the covariance {sigma} scaled by the square of
+        {scaling}
+        """
+        # the factors of the blocks
+        factors = []
+        # go through the blocks
+        for offset, count in self.partition():
+            # make a copy of this block
+            Σ = sigma.view(start=(offset, offset), shape=(count, count)).clone()
+            # scale it
+            Σ *= scaling**2
+            # decompose it and save it
+            factors.append(altar.lapack.cholesky_decomposition(Σ))
+        # save the factors
+        self.factors = factors
+        # there is no dense factor
+        return None
+
+
+    @altar.export
+    def displace(self, theta, candidate, pdf, workspace):
+        """
+        Fill {candidate} with random displacements of the samples in {theta}, using the unit
+        gaussian {pdf} as the source of randomness and the sampler {workspace} for any scratch
+        storage
+        """
+        # get the number of samples
+        samples = candidate.rows
+        # fill the candidates with random numbers
+        candidate.random(pdf=pdf)
+        # go through the blocks and their factors
+        for (offset, count), chol in zip(self.blocks, self.factors):
+            # get the candidates of this parameter set
+            cθ = candidate.view(start=(0, offset), shape=(samples, count))
+            # multiply each row from the right by the transpose of the factor
+            altar.blas.dtrmm(
+                chol.sideRight, chol.lowerTriangular, chol.opTrans, chol.nonUnitDiagonal,
+                1, chol, cθ)
+        # offset them by the original sample
+        candidate += theta
+        # and return them
+        return candidate
+
+
+    @altar.export
+    def share(self, sigma):
+        """
+        Return whatever, beyond {sigma} itself, other processes need to draw displacements from
+        it
+        """
+        # {sigma} is all there is
+        return None
+
+
+    @altar.export
+    def adopt(self, sigma, shared):
+        """
+        Take the structure in {shared} as the description of {sigma}
+        """
+        # nothing to do
+        return self
+
+
+    # implementation details
+    def partition(self):
+        """
+        Return the blocks of the parameter space of my model, carving them out on first use
+        """
+        # if i have done this already
+        if self.blocks:
+            # reuse them
+            return self.blocks
+        # get the model
+        model = self.model
+        # and its parameter sets, if it has any
+        psets = getattr(model, "psets", None)
+        # if it does
+        if psets:
+            # each one gets a block
+            blocks = sorted((pset.offset, pset.count) for pset in psets.values())
+        # otherwise
+        else:
+            # there is only one
+            blocks = [(0, model.parameters)]
+        # save them
+        self.blocks = blocks
+        # and return them
+        return blocks
+
+
+    # private data
+    model = None # the model whose parameter sets define the blocks
+    blocks = () # the (offset, count) pairs of the parameter sets
+    factors = () # the Cholesky factors of the scaled blocks
+
+
+# end of file
@@ -52,13 +52,36 @@ class Brent(altar.component, family="altar.bayesian.solvers.brent", implements=s
         :param weight: the normalized weight
         :return: β, cov
         """
-        # compute the median data log-likelihood; clone the source vector first, since the
-        # sorting happens in place
-        median = llk.clone().sort().median()
+        # compute the median data log-likelihood; the kernel uses selection rather than a full
+        # sort, and leaves {llk} alone
+        median = altar.libaltar.median(llk.data)
         # call gsl dbeta_solver, return β, cov
         return altar.libaltar.dbeta_brent(self.cov, llk.data, median, weight.data)
 
 
+    @altar.export
+    def state(self):
+        """
+        Return the state that i carry from one β step to the next: the temperature and the
+        last temperature increment
+        """
+        # ask my COV calculator
+        return altar.libaltar.cov_state(self.cov)
+
+
+    @altar.export
+    def restore(self, state):
+        """
+        Pick up the {state} saved by a checkpoint
+        """
+        # unpack
+        β, δβ = state
+        # and hand it to my COV calculator
+        altar.libaltar.cov_restore(self.cov, β, δβ)
+        # all done
+        return self
+
+
     # private data
     cov = None # the COV calculator
 
@@ -9,8 +9,6 @@
 #
 
 
-# externals
-import itertools
 # the package
 import altar
 # my protocol
@@ -40,10 +38,22 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
     solver = altar.bayesian.solver()
     solver.doc = 'the δβ solver'
 
+    resampler = altar.bayesian.resampler()
+    resampler.doc = 'the strategy for building the sample multiplicities'
+
+    covariance = altar.bayesian.covariance()
+    covariance.doc = 'the representation of the parameter covariance'
+
+    essThreshold = altar.properties.float(default=1.0)
+    essThreshold.doc = ('resample only when the effective sample size drops below this fraction '
+                        'of the number of samples; the default resamples at every step')
+
 
     # public data
     w = None # the vector of re-sampling weights
     cov = 0.0 # the actual value for COV we were able to attain
+    ess = 0.0 # the effective sample size of the weights
+    resampled = True # whether the last update resampled the sample set
 
 
     # protocol obligations
@@ -52,12 +62,12 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
         """
         Initialize me and my parts given an {application} context
         """
-        # get the rng wrapper
-        rng = application.rng.rng
         # initialize my solver
         self.solver.initialize(application=application, scheduler=self)
-        # set up the distribution for building the sample multiplicities
-        self.uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+        # my resampler
+        self.resampler.initialize(application=application)
+        # and my covariance representation
+        self.covariance.initialize(application=application)
         # all done
         return self
 
@@ -70,16 +80,29 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
         # get the new temperature and store it
         β = self.updateTemperature(step=step)
         # compute the new parameter covariance matrix
-        Σ = self.computeCovariance(step=step)
-        # rank the samples according to their likelihood
-        θ, (prior, data, posterior) = self.rank(step=step)
-
-        # update the step
+        self.computeCovariance(step=step)
+        # compute the effective sample size of the weights
+        self.ess = altar.libaltar.ess(self.w.data)
+        # and decide whether to resample; the final sample set must be unweighted, and a
+        # threshold of one resamples at every step, even when the weights are all equal
+        self.resampled = (
+            β >= 1 or self.essThreshold >= 1 or self.ess < self.essThreshold * step.samples)
+
+        # if we are resampling
+        if self.resampled:
+            # rank the samples according to their likelihood; they land in the back buffer
+            self.rank(step=step)
+            # the new samples carry equal weights
+            self.carried = None
+        # otherwise
+        else:
+            # the samples stay put, and carry their weights to the next step
+            self.carried = self.w
+
+        # the back buffer now holds the new state; make it current
+        step.swap(sample=self.resampled, sigma=True)
+        # update the temperature
         step.beta = β
-        step.theta.copy(θ)
-        step.sigma.copy(Σ)
-        step.prior.copy(prior)
-        step.data.copy(data)
         # recompute posterior with updated beta
         step.computePosterior()
 
@@ -92,14 +115,8 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
         """
         Generate the next temperature increment
         """
-        # grab the data log-likelihood
-        dataLikelihood  = step.data
-        # initialize the vector of weights
-        self.w = altar.vector(shape=step.samples).zero()
-        # compute {δβ} and the normalized {w}
-        β, self.cov = self.solver.solve(dataLikelihood, self.w)
-        # and return the new temperature
-        return β
+        # only the data log-likelihood matters
+        return self.solveTemperature(dataLikelihood=step.data)
 
 
     @altar.export
@@ -113,6 +130,10 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
 
           \bar{θ} = \sum_{i \in samples} \tilde{w}_{i} θ_{i}
 
+        My {covariance} representation decides how much of this gets computed: the dense one
+        evaluates it as c^T c, where the rows of c are the centered samples scaled by the
+        square root of their weights, while the others keep only part of its structure
+
         The covariance Σ gets used to build a proposal pdf for the posterior
         """
         # unpack what i need
@@ -122,32 +143,16 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
         samples = step.samples
         parameters = step.parameters
 
-        # initialize the covariance matrix
-        Σ = altar.matrix(shape=(parameters, parameters)).zero()
+        # the covariance matrix goes in the back buffer of the step
+        Σ = step.back().sigma
 
         # check the geometries
         assert w.shape == samples
         assert θ.shape == (samples, parameters)
         assert Σ.shape == (parameters, parameters)
 
-        # calculate the weighted mean of every parameter across all samples
-        θbar = altar.vector(shape=parameters)
-        # for each parameter
-        for j in range(parameters):
-            # the jth column in θ has the value of this parameter in the various samples
-            θbar[j] = θ.getColumn(j).mean(weights=w)
-        # start filling out Σ
-        for i in range(samples):
-            # get the sample
-            sample = θ.getRow(i)
-            # form Σ += w[i] sample sample^T
-            altar.blas.dsyr(Σ.lowerTriangular, w[i], sample, Σ)
-        # subtract θbar θbar^T
-        altar.blas.dsyr(Σ.lowerTriangular, -1, θbar, Σ)
-        # fill the upper triangle
-        for i in range(parameters):
-            for j in range(i):
-                Σ[j,i] = Σ[i,j]
+        # ask my representation to compute it
+        self.covariance.estimate(w=w, theta=θ, sigma=Σ)
 
         # condition the covariance matrix
         self.conditionCovariance(Σ=Σ)
@@ -160,55 +165,60 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
     def rank(self, step):
         """
         Rebuild the sample and its statistics sorted by the likelihood of the parameter values
+        in the back buffer of {step}
         """
         θOld = step.theta
         priorOld = step.prior
         dataOld = step.data
         postOld = step.posterior
-        # allocate the new entities
-        θ = altar.matrix(shape=θOld.shape)
-        prior = altar.vector(shape=priorOld.shape)
-        data = altar.vector(shape=dataOld.shape)
-        posterior = altar.vector(shape=postOld.shape)
-
-        # build a histogram for the new samples and convert it into a vector
-        multi = self.computeSampleMultiplicities(step=step).values()
-        # print("      histogram as vector:")
-        # print("        counts: {}".format(tuple(multi)))
-
-        # compute the permutation that would sort the frequency table according to the sample
-        # multiplicity, in reverse order
-        p = multi.sortIndirect().reverse()
-        # print("        sorted: {}".format(tuple(p[i] for i in range(p.shape))))
-
-        # the number of samples we have processed
-        done = 0
-        # start moving stuff around until we have built a complete sample set
-        for i in range(p.shape):
-            # the old sample index
-            old = p[i]
-            # and its multiplicity
-            count = int(multi[old])
-            # if the count has dropped to zero, we are done
-            if count == 0: break
-            # otherwise, duplicate this sample {count} times
-            for dupl in range(count):
-                # update the samples
-                for param in range(step.parameters):
-                    θ[done, param] = θOld[old, param]
-                # update the log-likelihoods
-                prior[done] = priorOld[old]
-                data[done] = dataOld[old]
-                posterior[done] = postOld[old]
-                # update the number of processed samples
-                done += 1
-                # print(i, old, count, done)
+        # the new entities go in the back buffer
+        back = step.back()
+        θ = back.theta
+        prior = back.prior
+        data = back.data
+        posterior = back.posterior
+
+        # compute the number of copies of each sample in the new sample set
+        multi = self.computeSampleMultiplicities(step=step)
+
+        # convert the multiplicities into the index of the source of each new sample, with the
+        # most popular samples first
+        index = altar.vector(shape=step.samples)
+        done = altar.libaltar.expand(multi.data, index.data)
+        # the multiplicities add up to the number of samples
+        assert done == step.samples
+
+        # move the samples
+        altar.libaltar.gather(index.data, θOld.data, θ.data)
+        # and their log-likelihoods
+        altar.libaltar.gather_likelihoods(
+            index.data,
+            priorOld.data, dataOld.data, postOld.data,
+            prior.data, data.data, posterior.data)
 
         # return the shuffled data
         return θ, (prior, data, posterior)
 
 
     # implementation details
+    def solveTemperature(self, dataLikelihood):
+        """
+        Compute the next temperature and the normalized weights of the samples, given their
+        {dataLikelihood}; distributed annealing methods call this directly with the data
+        likelihoods they gathered
+        """
+        # initialize the vector of weights
+        self.w = altar.vector(shape=dataLikelihood.shape).zero()
+        # compute {δβ} and the normalized {w}
+        β, self.cov = self.solver.solve(dataLikelihood, self.w)
+        # if the previous step did not resample
+        if self.carried is not None:
+            # fold in the weights the samples carried over
+            altar.libaltar.reweight(self.carried.data, self.w.data)
+        # and return the new temperature
+        return β
+
+
     def conditionCovariance(self, Σ):
         """
         Make sure the covariance matrix Σ is symmetric and positive definite
@@ -224,35 +234,14 @@ class COV(altar.component, family="altar.schedulers.cov", implements=scheduler):
         Prepare a frequency vector for the new samples given the scaled data log-likelihood in
         {w} for this cooling step
         """
-        # print("    computing sample multiplicities:")
-        # unpack what we need
-        w = self.w
-        samples = step.samples
-
-        # build a vector of random numbers uniformly distributed in [0,1]
-        r = altar.vector(shape=samples).random(pdf=self.uniform)
-        # compute the bin edges in the range [0, 1]
-        ticks = tuple(self.buildHistogramRanges(w))
-        # build a histogram
-        h = altar.histogram(bins=samples).ranges(points=ticks).fill(r)
-        # and return it
-        return h
-
-
-    def buildHistogramRanges(self, w):
-        """
-        Build histogram bins based on the scaled data log-likelihood
-        """
-        # start at 0
-        yield 0
-        # yield the partial sums
-        for partialSum in itertools.accumulate(w): yield partialSum
-        # all done
-        return
+        # make room for the multiplicities
+        multi = altar.vector(shape=step.samples)
+        # ask my resampler to fill them and return them
+        return self.resampler.multiplicities(w=self.w, multiplicities=multi)
 
 
     # private data
-    uniform = None
+    carried = None # the weights of samples that were not resampled in the previous step
 
 
 # end of file
@@ -100,6 +100,42 @@ class CoolingStep:
         # make one and return it
         return type(self)(beta=beta, theta=theta, likelihoods=likelihoods, sigma=sigma)
 
+    def back(self):
+        """
+        Return my back buffer: a step of my shape that schedulers can fill with the next state
+        and then {swap} with mine; it is allocated the first time it is needed
+        """
+        # if i don't have one yet
+        if self._back is None:
+            # make one
+            self._back = type(self).alloc(samples=self.samples, parameters=self.parameters)
+        # and return it
+        return self._back
+
+
+    def swap(self, sample=True, sigma=True):
+        """
+        Exchange my state with that of my back buffer: the sample set and its likelihoods if
+        {sample} is set, and the parameter covariance if {sigma} is set
+        """
+        # get the back buffer
+        back = self.back()
+        # if we are swapping the samples
+        if sample:
+            # exchange the sample sets
+            self.theta, back.theta = back.theta, self.theta
+            # and their likelihoods
+            self.prior, back.prior = back.prior, self.prior
+            self.data, back.data = back.data, self.data
+            self.posterior, back.posterior = back.posterior, self.posterior
+        # if we are swapping the covariance
+        if sigma:
+            # exchange it
+            self.sigma, back.sigma = back.sigma, self.sigma
+        # all done
+        return self
+
+
     def computePosterior(self):
         """
         Compute the posterior from prior, data, and beta
@@ -114,7 +150,7 @@ class CoolingStep:
 
 
     # meta-methods
-    def __init__(self, beta, theta, likelihoods, sigma=None, **kwds):
+    def __init__(self, beta, theta, likelihoods, sigma=None, back=None, **kwds):
         # chain up
         super().__init__(**kwds)
 
@@ -129,6 +165,8 @@ class CoolingStep:
         dof = self.parameters
         # initialize the covariance matrix
         self.sigma = altar.matrix(shape=(dof,dof)).zero() if sigma is None else sigma
+        # and the back buffer, if the caller wants control over where it lives
+        self._back = back
 
         # all done
         return
@@ -180,4 +218,8 @@ class CoolingStep:
         return channel
 
 
+    # private data
+    _back = None # storage for the next state, used by the schedulers
+
+
 # end of file
@@ -0,0 +1,87 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+
+
+# the covariance representation protocol
+class Covariance(altar.protocol, family="altar.bayesian.covariances"):
+    """
+    The protocol that all representations of the parameter covariance must implement
+
+    Representations know how to estimate the covariance from a weighted sample set, and how to
+    draw the random walk displacements of the Metropolis sampler from it
+    """
+
+
+    # required behavior
+    @altar.provides
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+
+
+    @altar.provides
+    def estimate(self, w, theta, sigma):
+        """
+        Fill {sigma} with the covariance of the samples in {theta}, given their normalized
+        weights {w}
+        """
+
+
+    @altar.provides
+    def factor(self, sigma, scaling):
+        """
+        Prepare to draw displacements from the covariance {sigma} scaled by the square of
+        {scaling}; return its Cholesky factor if it is dense, {None} otherwise
+        """
+
+
+    @altar.provides
+    def displace(self, theta, candidate, pdf, workspace):
+        """
+        Fill {candidate} with random displacements of the samples in {theta}, using the unit
+        gaussian {pdf} as the source of randomness and the sampler {workspace} for any scratch
+        storage
+        """
+
+
+    @altar.provides
+    def share(self, sigma):
+        """
+        Return whatever, beyond {sigma} itself, other processes need to draw displacements from
+        it, packed in a matrix with one column per parameter; {None} if there is nothing
+        """
+
+
+    @altar.provides
+    def adopt(self, sigma, shared):
+        """
+        Take the structure in {shared}, as packed by {share} in some other process, as the
+        description of {sigma}
+        """
+
+
+    # framework hooks
+    @classmethod
+    def pyre_default(cls, **kwds):
+        """
+        Provide a default implementation
+        """
+        # by default, use the full dense matrix
+        from .Dense import Dense
+        # and return it
+        return Dense
+
+
+# end of file
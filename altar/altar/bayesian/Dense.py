@@ -0,0 +1,114 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+# my protocol
+from .Covariance import Covariance as covariance
+
+
+# declaration
+class Dense(altar.component, family="altar.bayesian.covariances.dense", implements=covariance):
+    """
+    The full parameter covariance matrix
+
+    Estimation is a single rank-k update of the weighted samples, and sampling goes through
+    the Cholesky factor of the matrix; the costs are O(P^2 N) and O(P^3) per step, for N
+    samples of P parameters
+    """
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # nothing to do
+        return self
+
+
+    @altar.export
+    def estimate(self, w, theta, sigma):
+        """
+        Fill {sigma} with the covariance of the samples in {theta}, given their normalized
+        weights {w}
+        """
+        # room for the weighted mean of every parameter across all samples
+        θbar = altar.vector(shape=theta.columns)
+        # compute θbar and Σ; the kernel centers the samples, scales them by the square root of
+        # their weights, and forms Σ with a single rank-k update
+        altar.libaltar.covariance(w.data, theta.data, θbar.data, sigma.data)
+        # all done
+        return sigma
+
+
+    @altar.export
+    def factor(self, sigma, scaling):
+        """
+        Prepare to draw displacements from the covariance {sigma} scaled by the square of
+        {scaling}; return its Cholesky factor
+        """
+        # make a copy
+        Σ = sigma.clone()
+        # scale it
+        Σ *= scaling**2
+        # compute its Cholesky decomposition
+        self.chol = altar.lapack.cholesky_decomposition(Σ)
+        # and return it
+        return self.chol
+
+
+    @altar.export
+    def displace(self, theta, candidate, pdf, workspace):
+        """
+        Fill {candidate} with random displacements of the samples in {theta}, using the unit
+        gaussian {pdf} as the source of randomness and the sampler {workspace} for any scratch
+        storage
+        """
+        # get the factor
+        chol = self.chol
+        # fill the candidates with random numbers
+        candidate.random(pdf=pdf)
+        # multiply each row from the right by the transpose of the factor
+        altar.blas.dtrmm(
+            chol.sideRight, chol.lowerTriangular, chol.opTrans, chol.nonUnitDiagonal,
+            1, chol, candidate)
+        # offset it by the original sample
+        candidate += theta
+        # and return it
+        return candidate
+
+
+    @altar.export
+    def share(self, sigma):
+        """
+        Return whatever, beyond {sigma} itself, other processes need to draw displacements from
+        it
+        """
+        # {sigma} is all there is
+        return None
+
+
+    @altar.export
+    def adopt(self, sigma, shared):
+        """
+        Take the structure in {shared} as the description of {sigma}
+        """
+        # nothing to do
+        return self
+
+
+    # private data
+    chol = None # the Cholesky factor of the scaled covariance
+
+
+# end of file
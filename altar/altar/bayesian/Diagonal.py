@@ -0,0 +1,110 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import math
+# get the package
+import altar
+# my protocol
+from .Covariance import Covariance as covariance
+
+
+# declaration
+class Diagonal(altar.component, family="altar.bayesian.covariances.diagonal",
+               implements=covariance):
+    """
+    A parameter covariance that ignores the correlations among the parameters
+
+    Estimation and sampling are both O(P N), for N samples of P parameters; only the diagonal
+    of the covariance matrix is filled
+    """
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # nothing to do
+        return self
+
+
+    @altar.export
+    def estimate(self, w, theta, sigma):
+        """
+        Fill {sigma} with the covariance of the samples in {theta}, given their normalized
+        weights {w}
+        """
+        # ask the kernel to do the work
+        altar.libaltar.covariance_diagonal(w.data, theta.data, sigma.data)
+        # all done
+        return sigma
+
+
+    @altar.export
+    def factor(self, sigma, scaling):
+        """
+        Prepare to draw displacements from the covariance {sigma} scaled by the square of
+        {scaling}
+        """
+        # get the number of parameters
+        parameters = sigma.rows
+        # make room for the standard deviations
+        scale = altar.vector(shape=parameters)
+        # fill them
+        for parameter in range(parameters):
+            scale[parameter] = scaling * math.sqrt(sigma[parameter, parameter])
+        # save them
+        self.scale = scale
+        # there is no dense factor
+        return None
+
+
+    @altar.export
+    def displace(self, theta, candidate, pdf, workspace):
+        """
+        Fill {candidate} with random displacements of the samples in {theta}, using the unit
+        gaussian {pdf} as the source of randomness and the sampler {workspace} for any scratch
+        storage
+        """
+        # fill the candidates with random numbers
+        candidate.random(pdf=pdf)
+        # scale them and offset them by the original sample
+        altar.libaltar.displace_diagonal(theta.data, self.scale.data, candidate.data)
+        # and return them
+        return candidate
+
+
+    @altar.export
+    def share(self, sigma):
+        """
+        Return whatever, beyond {sigma} itself, other processes need to draw displacements from
+        it
+        """
+        # {sigma} is all there is
+        return None
+
+
+    @altar.export
+    def adopt(self, sigma, shared):
+        """
+        Take the structure in {shared} as the description of {sigma}
+        """
+        # nothing to do
+        return self
+
+
+    # private data
+    scale = None # the scaled standard deviations of the parameters
+
+
+# end of file
@@ -0,0 +1,421 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import bisect
+# the framework
+import altar
+# superclass
+from .MPIAnnealing import MPIAnnealing
+
+
+# declaration
+class DistributedAnnealing(MPIAnnealing):
+    """
+    A distributed implementation of the annealing method that never assembles the sample set
+
+    Every task keeps its own chains from one β step to the next. The manager gathers only the
+    data likelihoods, which it needs to pick δβ and the weights; the weighted mean and the
+    covariance are built out of partial sums contributed by every task, and resampling turns
+    into a global index, so that only the samples that change tasks get moved. The whole
+    sample set is assembled once, at the end, for the archiver. Requires the COV scheduler; the
+    covariance is always estimated densely, and structured representations recover their
+    factors from it on the manager, which broadcasts them along with it
+    """
+
+
+    # interface
+    def start(self, annealer):
+        """
+        Start the annealing process
+        """
+        # chain up
+        super().start(annealer=annealer)
+        # compute where the chains of each task start in the global sample set
+        self.offsets = [0]
+        for count in self.counts:
+            self.offsets.append(self.offsets[-1] + count)
+        # all done
+        return self
+
+
+    def restart(self, annealer):
+        """
+        Start the annealing process from a checkpoint
+        """
+        # chain up; the manager gets the global state
+        super().restart(annealer=annealer)
+        # distribute it, once
+        self.step = super().partition(annealer=annealer)
+        # and compute where the chains of each task start in the global sample set
+        self.offsets = [0]
+        for count in self.counts:
+            self.offsets.append(self.offsets[-1] + count)
+        # all done
+        return self
+
+
+    def cool(self, annealer):
+        """
+        Push my state forward along the cooling schedule
+        """
+        # get the scheduler
+        scheduler = annealer.scheduler
+        # cache my communicator
+        comm = self.communicator
+        # who is the boss
+        manager = self.manager
+        # get my local state
+        step = self.step
+        # and its shape
+        samples = step.samples
+        parameters = step.parameters
+
+        # the manager needs all the data likelihoods to compute δβ; they are a small fraction
+        # of the state
+        llk = altar.vector.collect(vector=step.data, communicator=comm, destination=manager)
+        # if i am the manager
+        if self.rank == manager:
+            # compute the new temperature and the weights
+            β = scheduler.solveTemperature(dataLikelihood=llk)
+            # the effective sample size
+            scheduler.ess = altar.libaltar.ess(scheduler.w.data)
+            # and decide whether to resample
+            scheduler.resampled = (
+                β >= 1 or scheduler.essThreshold >= 1
+                or scheduler.ess < scheduler.essThreshold * llk.shape)
+        # everybody gets their weights
+        w = altar.vector(shape=samples)
+        w.excerpt(
+            vector=scheduler.w if self.rank == manager else None,
+            source=manager, communicator=comm)
+
+        # the weighted mean, out of the partial sums
+        partial = altar.vector(shape=parameters)
+        altar.blas.dgemv(step.theta.opTrans, 1.0, step.theta, w, 0.0, partial)
+        mean = self.allsum(partial=self.row(partial)).getRow(0)
+        # the covariance, out of the partial second moments about the mean
+        partial = altar.matrix(shape=(parameters, parameters))
+        altar.libaltar.comoment(w.data, step.theta.data, mean.data, partial.data)
+        # the manager puts it together
+        Σ = self.sum(partial=partial)
+
+        # if i am the manager
+        if self.rank == manager:
+            # condition the covariance
+            scheduler.conditionCovariance(Σ=Σ)
+            # pack it along with the temperature and the scaling of the sampler, and its
+            # structure, which gets recovered here once rather than by every task
+            header = self.header(
+                sigma=Σ, beta=β, scaling=annealer.sampler.scaling,
+                shared=self.structure(annealer=annealer, sigma=Σ))
+            # and the decision to resample
+            flag = scheduler.resampled
+        # the others
+        else:
+            # know nothing
+            header = flag = None
+        # everybody gets the state of the scheduler
+        header = altar.matrix.bcast(matrix=header, source=manager, communicator=comm)
+        resampled = comm.bcast(item=flag, source=manager)
+
+        # if we are resampling
+        if resampled:
+            # the manager builds the global index of the resampled set
+            if self.rank == manager:
+                # get the multiplicities
+                multi = altar.vector(shape=llk.shape)
+                scheduler.resampler.multiplicities(w=scheduler.w, multiplicities=multi)
+                # expand them
+                index = altar.vector(shape=llk.shape)
+                altar.libaltar.expand(multi.data, index.data)
+                # and pack the index
+                index = self.row(index)
+            # the others
+            else:
+                # know nothing
+                index = None
+            # everybody gets the index
+            index = altar.matrix.bcast(matrix=index, source=manager, communicator=comm)
+            # and the samples move
+            self.exchange(index=index.getRow(0), step=step)
+
+        # if i am the manager
+        if self.rank == manager:
+            # the weights of the samples carry over to the next step, unless they were resampled
+            scheduler.carried = None if resampled else scheduler.w
+
+        # unpack the new state
+        self.install(annealer=annealer, header=header, step=step)
+        # update the posterior
+        step.computePosterior()
+        # update the iteration counter
+        self.iteration += 1
+        # all done
+        return self
+
+
+    def checkpoint(self, annealer):
+        """
+        Notification that we are at the end of a β update; give the archiver a chance to
+        record my state
+        """
+        # if it isn't time
+        if not annealer.archiver.due(iteration=self.iteration):
+            # bail
+            return self
+        # hold on to my local state
+        step = self.step
+        # assemble the sample set
+        self.step = super().collect()
+        # let my superclass record it
+        super().checkpoint(annealer=annealer)
+        # and go back to the local state
+        self.step = step
+        # all done
+        return self
+
+
+    def finish(self, annealer):
+        """
+        Shut down the annealing process
+        """
+        # the archiver needs the whole sample set; this is the only time it gets assembled
+        self.step = super().collect()
+        # chain up
+        return super().finish(annealer=annealer)
+
+
+    # implementation details
+    def collect(self):
+        """
+        My state stays distributed
+        """
+        # so there is nothing to do
+        return self.worker.step
+
+
+    def partition(self, annealer):
+        """
+        My state stays distributed
+        """
+        # so there is nothing to do
+        return self.worker.step
+
+
+    def exchange(self, index, step):
+        """
+        Rebuild my chains out of the global {index} of the resampled set; only the samples
+        that change tasks get moved, and only to the tasks that need them
+        """
+        # cache my communicator
+        comm = self.communicator
+        # my rank
+        rank = self.rank
+        # where the chains of each task start
+        offsets = self.offsets
+        # the range of global rows that are mine
+        low, high = offsets[rank], offsets[rank+1]
+        # figure out which rows each task must send to each of the others
+        routes = self.routes(index=index, offsets=offsets)
+
+        # pack my state
+        packed = self.pack(step=step)
+        # the pool of rows that i can draw from starts with my own
+        pool = [packed]
+        # and the map from the global rows that i receive to their position in the pool
+        received = {}
+        # the pool size so far
+        size = packed.rows
+
+        # every task that sends anything scatters one block per destination, so the exchange
+        # is an all-to-all built out of one scatter per source
+        for task, destinations in enumerate(routes):
+            # the size of the largest block this task sends
+            rows = max(len(wanted) for wanted in destinations)
+            # if it sends nothing
+            if not rows:
+                # move on
+                continue
+            # if it's me
+            if task == rank:
+                # lay out my outgoing rows, one block per destination
+                blocks = self.layout(packed=packed, low=low, destinations=destinations, rows=rows)
+            # otherwise
+            else:
+                # i will receive my block
+                blocks = None
+            # get my block
+            block = altar.matrix(shape=(rows, packed.columns))
+            block.excerpt(matrix=blocks, source=task, communicator=comm)
+            # the rows i asked this task for
+            wanted = destinations[rank]
+            # if there are any
+            if wanted:
+                # add them to my pool, without the padding
+                pool.append(block.view(start=(0,0), shape=(len(wanted), packed.columns)))
+                # record where each row lives
+                for position, row in enumerate(wanted):
+                    received[row] = size + position
+                # update the size of the pool
+                size += len(wanted)
+
+        # assemble the pool
+        if len(pool) > 1:
+            # make room
+            everything = altar.matrix(shape=(size, packed.columns))
+            # and copy the blocks
+            start = 0
+            for block in pool:
+                everything.view(start=(start, 0), shape=block.shape).copy(block)
+                start += block.rows
+        # otherwise
+        else:
+            # my own rows are all i need
+            everything = packed
+
+        # build the local index into the pool
+        local = self.localize(index=index, low=low, high=high, received=received)
+        # gather
+        resampled = altar.matrix(shape=packed.shape)
+        altar.libaltar.gather(local.data, everything.data, resampled.data)
+        # and unpack into my state
+        self.unpack(packed=resampled, step=step)
+
+        # all done
+        return step
+
+
+    @staticmethod
+    def routes(index, offsets):
+        """
+        Build the table of the global rows that each task must send to each of the others in
+        order to realize the resampled set in {index}, given the first global row of each task
+        in {offsets}; the rows in each entry are sorted
+        """
+        # the number of tasks
+        tasks = len(offsets) - 1
+        # the task that owns a global row
+        owner = lambda row: bisect.bisect_right(offsets, row) - 1
+        # make room
+        routes = [[set() for destination in range(tasks)] for source in range(tasks)]
+        # go through the resampled set
+        for row in range(index.shape):
+            # find the source of this row
+            source = int(index[row])
+            # the task that has it
+            task = owner(source)
+            # and the one that needs it
+            destination = owner(row)
+            # if it moves to a different task
+            if task != destination:
+                # mark it
+                routes[task][destination].add(source)
+        # order the rows
+        return [[sorted(rows) for rows in destinations] for destinations in routes]
+
+
+    @staticmethod
+    def layout(packed, low, destinations, rows):
+        """
+        Lay out the rows of my {packed} state that each of the {destinations} needs in blocks
+        of {rows} rows, one per task, so they can be moved with one scatter; {low} is the
+        global row of my first chain
+        """
+        # make room
+        blocks = altar.matrix(shape=(len(destinations)*rows, packed.columns)).zero()
+        # go through the destinations
+        for task, wanted in enumerate(destinations):
+            # if this one needs nothing
+            if not wanted:
+                # move on
+                continue
+            # convert the global rows into local ones
+            local = altar.vector(shape=len(wanted))
+            for position, row in enumerate(wanted):
+                local[position] = row - low
+            # gather them
+            block = altar.matrix(shape=(len(wanted), packed.columns))
+            altar.libaltar.gather(local.data, packed.data, block.data)
+            # and place them
+            blocks.view(start=(task*rows, 0), shape=block.shape).copy(block)
+        # all done
+        return blocks
+
+
+    @staticmethod
+    def localize(index, low, high, received):
+        """
+        Convert the global {index} of the rows {low} to {high} into positions in a pool that
+        starts with the rows of this task and continues with the ones it {received}
+        """
+        # make room
+        local = altar.vector(shape=high-low)
+        # go through my rows
+        for destination in range(low, high):
+            # find the source
+            source = int(index[destination])
+            # and its position in the pool
+            local[destination-low] = source - low if low <= source < high else received[source]
+        # all done
+        return local
+
+
+    def row(self, vector):
+        """
+        Pack {vector} into a single row matrix, so it can be moved with the matrix collectives
+        """
+        # make room
+        row = altar.matrix(shape=(1, vector.shape))
+        # fill
+        for column in range(vector.shape):
+            row[0, column] = vector[column]
+        # all done
+        return row
+
+
+    def sum(self, partial):
+        """
+        Add up the {partial} matrices of all tasks; the result is available at the manager
+        """
+        # gather the partials; they get stacked on top of each other
+        partials = altar.matrix.collect(
+            matrix=partial, communicator=self.communicator, destination=self.manager)
+        # if i am not the manager
+        if self.rank != self.manager:
+            # there is nothing else to do
+            return None
+        # otherwise, get the shape of each partial
+        rows, columns = partial.shape
+        # make room for the total
+        total = altar.matrix(shape=partial.shape).zero()
+        # go through the partials
+        for task in range(partials.rows // rows):
+            # and add them up
+            total += partials.view(start=(task*rows, 0), shape=(rows, columns))
+        # all done
+        return total
+
+
+    def allsum(self, partial):
+        """
+        Add up the {partial} matrices of all tasks and make the result available everywhere
+        """
+        # add them up and broadcast the result
+        return altar.matrix.bcast(
+            matrix=self.sum(partial=partial), source=self.manager, communicator=self.communicator)
+
+
+    # private data
+    offsets = () # where the chains of each task start in the global sample set
+
+
+# end of file
@@ -0,0 +1,147 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# the package
+import altar
+# my superclass
+from .Metropolis import Metropolis
+
+
+# declaration
+class Langevin(Metropolis, family="altar.samplers.langevin"):
+    """
+    The Metropolis adjusted Langevin algorithm as a sampler of the posterior distribution
+
+    Candidates are drawn from a gaussian with the scaled parameter covariance A, centered at
+    {θ + A g/2}, where g is the gradient of the log posterior at the current temperature; the
+    asymmetry of the proposal is corrected for during the accept/reject phase. Models must
+    implement {priorLikelihoodGradient} and {dataLikelihoodGradient}
+    """
+
+
+    # implementation details
+    def prepareSamplingPDF(self, annealer, step):
+        """
+        Re-scale and decompose the parameter covariance matrix, in preparation for the
+        Metropolis update
+        """
+        # chain up
+        super().prepareSamplingPDF(annealer=annealer, step=step)
+        # the drift and the proposal correction need the dense factor
+        if self.sigma_chol is None:
+            # complain
+            raise NotImplementedError(
+                f"class '{type(self).__name__}' requires a dense parameter covariance")
+        # all done
+        return
+
+
+    def prepareWorkspace(self, step):
+        """
+        Make sure my workspace matches the geometry of {step} and has room for the gradients
+        """
+        # chain up and enable the gradients
+        return super().prepareWorkspace(step=step).enableGradients()
+
+
+    def walkChains(self, annealer, step):
+        """
+        Run the Langevin algorithm on the Markov chains
+        """
+        # compute the gradient of the posterior at the current samples; after this, it is kept
+        # up to date as candidates get accepted
+        self.gradient(annealer=annealer, step=step, gradient=self.workspace.gradient)
+        # and chain up
+        return super().walkChains(annealer=annealer, step=step)
+
+
+    def propose(self, annealer, step):
+        """
+        Fill the candidate state in my workspace with random displacements of the samples in
+        {step}, drifting along the gradient of the posterior
+        """
+        # get my workspace
+        workspace = self.workspace
+        # and my decomposed covariance
+        Σ_chol = self.sigma_chol
+
+        # build the random part of the displacement
+        cθ = super().propose(annealer=annealer, step=step)
+
+        # the drift {A g / 2}, with {A = Σ_chol Σ_chol^T}; the samples are rows, so we
+        # multiply from the right
+        drift = workspace.scratch
+        drift.copy(workspace.gradient)
+        altar.blas.dtrmm(
+            Σ_chol.sideRight, Σ_chol.lowerTriangular, Σ_chol.opNoTrans, Σ_chol.nonUnitDiagonal,
+            1, Σ_chol, drift)
+        altar.blas.dtrmm(
+            Σ_chol.sideRight, Σ_chol.lowerTriangular, Σ_chol.opTrans, Σ_chol.nonUnitDiagonal,
+            .5, Σ_chol, drift)
+        # apply it
+        cθ += drift
+
+        # and return the candidates
+        return cθ
+
+
+    def merge(self, annealer, step, **kwds):
+        """
+        Merge the candidates in my workspace that pass the Metropolis test into {step}, after
+        correcting for the asymmetry of the proposal
+        """
+        # get my workspace
+        workspace = self.workspace
+        # and the candidate state
+        candidate = workspace.candidate
+
+        # compute the gradient of the posterior at the candidates
+        self.gradient(annealer=annealer, step=candidate, gradient=workspace.cgradient)
+        # compute the log of the ratio of the reverse and forward proposal densities
+        altar.libaltar.langevin_bias(
+            step.theta.data, workspace.gradient.data,
+            candidate.theta.data, workspace.cgradient.data,
+            self.sigma_chol.data, workspace.bias.data)
+
+        # accept/reject
+        stats = super().merge(
+            annealer=annealer, step=step, bias=workspace.bias, moves=workspace.moves)
+        # carry the gradients of the accepted candidates over
+        altar.libaltar.restore(
+            workspace.cgradient.data, workspace.gradient.data, workspace.moves.data)
+
+        # all done
+        return stats
+
+
+    def gradient(self, annealer, step, gradient):
+        """
+        Fill {gradient} with the gradient of the posterior at the samples in {step}
+        """
+        # get the model
+        model = annealer.model
+        # and a temporary
+        scratch = self.workspace.scratch
+
+        # get the gradient of the data likelihood
+        model.dataLikelihoodGradient(step=step, gradient=scratch.zero())
+        # temper it
+        scratch *= step.beta
+        # get the gradient of the prior
+        model.priorLikelihoodGradient(step=step, gradient=gradient.zero())
+        # and put them together
+        gradient += scratch
+
+        # all done
+        return gradient
+
+
+# end of file
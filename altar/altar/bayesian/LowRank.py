@@ -0,0 +1,203 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+# my protocol
+from .Covariance import Covariance as covariance
+
+
+# declaration
+class LowRank(altar.component, family="altar.bayesian.covariances.lowrank",
+              implements=covariance):
+    """
+    A parameter covariance of the form diag(d) + V V^T, with V a (parameters x rank) matrix
+
+    The columns of V span the dominant subspace of the sample covariance, found by projecting
+    the samples on random directions, and d holds the variance that V misses. For N samples of
+    P parameters and rank r, finding the factors is O(P N r) and sampling O(P N r); the rest of
+    the annealer still consumes the dense covariance, so estimation also assembles it, which is
+    O(P^2 r) in time and O(P^2) in space
+    """
+
+
+    # user configurable state
+    rank = altar.properties.int(default=8)
+    rank.doc = 'the number of dominant directions to keep'
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # get the capsule of the random number generator
+        rng = application.rng.rng
+        # set up the distribution for the random directions
+        self.uninormal = altar.pdf.ugaussian(rng=rng)
+        # all done
+        return self
+
+
+    @altar.export
+    def estimate(self, w, theta, sigma):
+        """
+        Fill {sigma} with the covariance of the samples in {theta}, given their normalized
+        weights {w}
+        """
+        # get the number of parameters
+        parameters = theta.columns
+        # and the rank
+        rank = min(self.rank, parameters)
+        # the random directions
+        Ω = altar.matrix(shape=(parameters, rank)).random(pdf=self.uninormal)
+        # room for the factors
+        d = altar.vector(shape=parameters)
+        V = altar.matrix(shape=(parameters, rank))
+        # compute them, and assemble Σ
+        altar.libaltar.covariance_lowrank(w.data, theta.data, Ω.data, d.data, V.data, sigma.data)
+        # save the factors, along with a copy of the matrix they describe
+        self.estimated = sigma.clone(), d, V
+        # all done
+        return sigma
+
+
+    @altar.export
+    def factor(self, sigma, scaling):
+        """
+        Prepare to draw displacements from the covariance {sigma} scaled by the square of
+        {scaling}
+        """
+        # get the factors of {sigma}
+        d, V = self.describe(sigma=sigma)
+        # make copies
+        d = d.clone()
+        V = V.clone()
+
+        # the standard deviations of the diagonal part
+        for parameter in range(d.shape):
+            d[parameter] = scaling * d[parameter]**.5
+        # and the scaled low rank part
+        V *= scaling
+        # save them
+        self.scale = d
+        self.V = V
+        # there is no dense factor
+        return None
+
+
+    @altar.export
+    def displace(self, theta, candidate, pdf, workspace):
+        """
+        Fill {candidate} with random displacements of the samples in {theta}, using the unit
+        gaussian {pdf} as the source of randomness and the sampler {workspace} for any scratch
+        storage
+        """
+        # get my factors
+        V = self.V
+        # draw the random coefficients of the low rank part; they live in the {workspace}, rather
+        # than with me, since the threaded annealing method has several walkers displacing their
+        # chains through me
+        z = workspace.enableCoefficients(rank=V.columns).coefficients.random(pdf=pdf)
+
+        # the diagonal part of the displacements
+        candidate.random(pdf=pdf)
+        altar.libaltar.displace_diagonal(theta.data, self.scale.data, candidate.data)
+        # and the low rank part
+        altar.blas.dgemm(V.opNoTrans, V.opTrans, 1, z, V, 1, candidate)
+        # all done
+        return candidate
+
+
+    @altar.export
+    def share(self, sigma):
+        """
+        Return whatever, beyond {sigma} itself, other processes need to draw displacements from
+        it: the diagonal part in the first row, followed by the columns of the low rank part
+        """
+        # get the factors of {sigma}
+        d, V = self.describe(sigma=sigma)
+        # and their shape
+        parameters, rank = V.shape
+        # make room
+        shared = altar.matrix(shape=(rank+1, parameters))
+        # the diagonal part goes first
+        shared.setRow(0, d)
+        # followed by the low rank part, one column per row
+        for column in range(rank):
+            shared.setRow(column+1, V.getColumn(column))
+        # all done
+        return shared
+
+
+    @altar.export
+    def adopt(self, sigma, shared):
+        """
+        Take the structure in {shared} as the description of {sigma}
+        """
+        # get the shape of the factors
+        parameters = shared.columns
+        rank = shared.rows - 1
+        # unpack the diagonal part
+        d = shared.getRow(0)
+        # and the low rank part
+        V = altar.matrix(shape=(parameters, rank))
+        for column in range(rank):
+            V.setColumn(column, shared.getRow(column+1))
+        # save them, along with a copy of the matrix they describe
+        self.estimated = sigma.clone(), d, V
+        # all done
+        return self
+
+
+    # implementation details
+    def describe(self, sigma):
+        """
+        Return the factors of {sigma}; they are recovered from the matrix itself, in O(P^2 r),
+        unless {sigma} holds the matrix i estimated or adopted
+
+        The comparison is by value, since the annealing methods hand me copies of the matrix i
+        know about; recovering the factors draws new random directions, and a run that resumes
+        from a checkpoint can only retrace the original if that happens at the same points
+        """
+        # get what i know
+        known = self.estimated
+        # if {sigma} is the matrix i know about
+        if known is not None and known[0].shape == sigma.shape and known[0] == sigma:
+            # use its factors
+            _, d, V = known
+            # and return them
+            return d, V
+
+        # otherwise, get the number of parameters
+        parameters = sigma.rows
+        # and the rank
+        rank = min(self.rank, parameters)
+        # the random directions
+        Ω = altar.matrix(shape=(parameters, rank)).random(pdf=self.uninormal)
+        # make room for the factors
+        d = altar.vector(shape=parameters)
+        V = altar.matrix(shape=(parameters, rank))
+        # and recover them from the dominant subspace of {sigma}
+        altar.libaltar.factor_lowrank(sigma.data, Ω.data, d.data, V.data)
+        # all done
+        return d, V
+
+
+    # private data
+    uninormal = None # the distribution of the random directions
+    estimated = None # a copy of the last estimated or adopted covariance, and its factors
+    scale = None # the scaled standard deviations of the diagonal part
+    V = None # the scaled low rank part
+
+
+# end of file
@@ -11,6 +11,7 @@
 
 # externals
 import mpi
+import time
 import journal
 # the framework
 import altar
@@ -22,6 +23,11 @@ from .AnnealingMethod import AnnealingMethod
 class MPIAnnealing(AnnealingMethod):
     """
     A distributed implementation of the annealing method that uses MPI
+
+    The manager assembles the global state after every walk and hands out the chains before
+    the next one. When asked to {balance}, it times the walks of every task and re-weights the
+    chain counts of the next partition by the measured throughput of each task, so that the
+    slowest task does not set the pace of every β step
     """
 
 
@@ -57,6 +63,8 @@ class MPIAnnealing(AnnealingMethod):
         super().start(annealer=annealer)
         # everybody has to get ready
         self.worker.start(annealer=annealer)
+        # find out how many chains everybody has
+        self.census()
         # collect the global state: at the master task, I get the entire state of the problem;
         # at the other tasks, I just get a reference to the local state so I have uniform
         # access to the annealing temperature
@@ -65,6 +73,84 @@ class MPIAnnealing(AnnealingMethod):
         return self
 
 
+    def restart(self, annealer):
+        """
+        Start the annealing process from a checkpoint
+        """
+        # cache my communicator
+        comm = self.communicator
+        # who is the boss
+        manager = self.manager
+        # reset my iteration count
+        super().start(annealer=annealer)
+        # everybody has to get ready; the workers build their parts, but their state gets
+        # replaced below
+        self.worker.start(annealer=annealer)
+        # find out how many chains everybody has
+        self.census()
+
+        # if i am the manager
+        if self.rank == manager:
+            # retrieve the checkpoint
+            snapshot = self.retrieve(annealer=annealer)
+            # it must have been taken with the same number of tasks
+            if len(snapshot.counts) != self.tasks:
+                # grab a channel
+                channel = annealer.error
+                # complain
+                channel.line(f"the checkpoint was taken with {len(snapshot.counts)} tasks")
+                channel.line(f" -- please restart with the same number of tasks")
+                channel.log()
+                # and exit
+                raise SystemExit(1)
+            # the checkpoint holds the global state
+            self.step = self.restore(snapshot=snapshot)
+            # which becomes the storage for assembling it from now on
+            self.state = self.step
+            # pack the rest of what everybody needs to know
+            progress = snapshot.iteration, tuple(snapshot.counts)
+            # get the size of the random number generator states
+            size = len(snapshot.states[0])
+            # and pack them
+            states = self.encode(blobs=snapshot.states, size=size)
+            # along with the temperature, the covariance and the scaling of the sampler, and the
+            # structure of the covariance as it was when the checkpoint was taken
+            header = self.header(
+                sigma=snapshot.sigma, beta=snapshot.beta, scaling=snapshot.scaling,
+                shared=snapshot.structure)
+        # the others
+        else:
+            # know nothing
+            snapshot = progress = states = header = None
+            # but have the local state handy, like {collect} does
+            self.step = self.worker.step
+
+        # everybody gets the iteration count and the chain counts
+        self.iteration, self.counts = comm.bcast(item=progress, source=manager)
+        # and the state of their random number generator
+        size = len(self.rngState(annealer=annealer))
+        mine = self.encode(blobs=(bytes(size),), size=size)
+        mine.excerpt(vector=states, source=manager, communicator=comm)
+        state, = self.decode(vector=mine, size=size)
+        # if i am the manager
+        if self.rank == manager:
+            # restore the rest of the state of the simulation
+            self.resume(annealer=annealer, snapshot=snapshot, state=state)
+        # the others
+        else:
+            # only need their random number generator
+            self.rngRestore(annealer=annealer, state=state)
+
+        # everybody gets the temperature, the covariance and the scaling in one broadcast, so
+        # the workers know right away whether the simulation is already over
+        header = altar.matrix.bcast(matrix=header, source=manager, communicator=comm)
+        # and unpack it into my local state
+        self.install(annealer=annealer, header=header, step=self.worker.step)
+
+        # all done; the chains get distributed by the next {partition}
+        return self
+
+
     def top(self, annealer):
         """
         Notification that we are at the beginning of a β update
@@ -85,6 +171,10 @@ class MPIAnnealing(AnnealingMethod):
         if self.rank == self.manager:
             # i have the global state; cool it
             super().cool(annealer=annealer)
+        # otherwise
+        else:
+            # just keep count, so everybody agrees on when to checkpoint
+            self.iteration += 1
         # all done
         return self
 
@@ -94,9 +184,13 @@ class MPIAnnealing(AnnealingMethod):
         Explore configuration space by walking the Markov chains
         """
         # partition and synchronize my state
-        self.partition()
+        self.partition(annealer=annealer)
+        # start the clock
+        start = time.perf_counter()
         # all workers walk their chains
         stats = self.worker.walk(annealer=annealer)
+        # and record how long it took
+        self.elapsed = time.perf_counter() - start
         # collect my state
         self.step = self.collect()
         # return the statistics
@@ -110,18 +204,31 @@ class MPIAnnealing(AnnealingMethod):
         """
         # who is the boss?
         manager = self.manager
-        # unpack the acceptance/rejection statistics
-        accepted, rejected, unlikely = statistics
-
-        # add up the acceptance/rejection statistics from all the nodes
-        accepted = self.communicator.sum(accepted, destination=manager)
-        rejected = self.communicator.sum(rejected, destination=manager)
-        unlikely = self.communicator.sum(unlikely, destination=manager)
+        # the number of statistics
+        columns = len(statistics)
+        # pack the acceptance/rejection statistics, followed by the duration of my walk
+        counts = altar.matrix(shape=(1, columns+1))
+        for column, count in enumerate(statistics):
+            counts[0, column] = count
+        counts[0, columns] = self.elapsed
+        # and collect them from all the nodes in one go
+        counts = altar.matrix.collect(
+            matrix=counts, communicator=self.communicator, destination=manager)
 
         # if I am the boss
         if self.rank == manager:
-            # chain up
-            super().resample(annealer=annealer, statistics=(accepted,rejected,unlikely))
+            # add them up
+            statistics = tuple(
+                int(sum(counts[task, column] for task in range(counts.rows)))
+                for column in range(columns))
+            # if i am supposed to balance the load
+            if self.balance:
+                # re-weight the chain counts of the next partition
+                self.rebalance(
+                    annealer=annealer,
+                    timings=tuple(counts[task, columns] for task in range(counts.rows)))
+            # and chain up
+            super().resample(annealer=annealer, statistics=statistics)
 
         # all done
         return self
@@ -139,6 +246,36 @@ class MPIAnnealing(AnnealingMethod):
         return self
 
 
+    def checkpoint(self, annealer):
+        """
+        Notification that we are at the end of a β update; give the archiver a chance to
+        record my state
+        """
+        # get the archiver
+        archiver = annealer.archiver
+        # if it isn't time
+        if not archiver.due(iteration=self.iteration):
+            # bail
+            return self
+        # get the state of my random number generator
+        state = self.rngState(annealer=annealer)
+        # pack it and gather everybody's
+        states = altar.vector.collect(
+            vector=self.encode(blobs=(state,), size=len(state)),
+            communicator=self.communicator, destination=self.manager)
+        # if i am the manager
+        if self.rank == self.manager:
+            # i have the global state; hand it to the archiver
+            archiver.checkpoint(
+                step=self.step, iteration=self.iteration, scaling=annealer.sampler.scaling,
+                carried=getattr(annealer.scheduler, "carried", None),
+                solver=self.solverState(annealer=annealer),
+                structure=self.structure(annealer=annealer, sigma=self.step.sigma),
+                states=self.decode(vector=states, size=len(state)), counts=self.counts)
+        # all done
+        return self
+
+
     def finish(self, annealer):
         """
         Shut down the annealing process
@@ -156,9 +293,11 @@ class MPIAnnealing(AnnealingMethod):
 
 
     # meta-methods
-    def __init__(self, annealer,  worker, communicator=None, **kwds):
+    def __init__(self, annealer,  worker, communicator=None, balance=False, **kwds):
         # chain up
         super().__init__(annealer=annealer, **kwds)
+        # record whether i should balance the load
+        self.balance = balance
 
         # make sure i have a valid communicator
         comm = communicator or mpi.world
@@ -194,84 +333,394 @@ class MPIAnnealing(AnnealingMethod):
         manager = self.manager
         # ask my worker for its local state
         step = self.worker.step
-        # get the temperature
-        β = step.beta
-        # assemble the sample set
-        θ = altar.matrix.collect(
-            matrix=step.theta, communicator=communicator, destination=manager)
-        # the prior
-        prior = altar.vector.collect(
-            vector=step.prior, communicator=communicator, destination=manager)
-        # the data
-        data = altar.vector.collect(
-            vector=step.data, communicator=communicator, destination=manager)
-        # the prior
-        posterior = altar.vector.collect(
-            vector=step.posterior, communicator=communicator, destination=manager)
+        # the tasks may own different numbers of chains, but the collectives move equal sized
+        # blocks; find the size of the largest one
+        rows = max(self.counts)
+        # pack my state and pad it; then gather everybody's in a single collective
+        packed = altar.matrix.collect(
+            matrix=self.pad(packed=self.pack(step=step), rows=rows),
+            communicator=communicator, destination=manager)
 
         # if I am not the manager task
-        if self.rank != self.manager:
+        if self.rank != manager:
             # just return the local state
             return step
 
-        # the manager packs the state of the problem and returns it; everybody has the same
-        # covariance matrix, so the local copy is good enough
-        return self.CoolingStep(
-            beta=β, theta=θ,
-            likelihoods=(prior,data,posterior), sigma=step.sigma)
+        # drop the padding
+        packed = self.compact(packed=packed, rows=rows)
+
+        # the manager keeps the global state around, so the storage is reused from one step to
+        # the next, along with the back buffer of the scheduler
+        state = self.state
+        # if it's not there yet
+        if state is None or state.samples != packed.rows:
+            # make it
+            state = self.CoolingStep.alloc(samples=packed.rows, parameters=step.parameters)
+            # everybody has the same covariance matrix, so the local copy is good enough
+            state.sigma.copy(step.sigma)
+            # and attach it
+            self.state = state
+        # update the temperature
+        state.beta = step.beta
+        # and the samples
+        self.unpack(packed=packed, step=state)
+        # all done
+        return state
 
 
-    def partition(self):
+    def partition(self, annealer):
         """
         Distribute my global state
         """
+        # cache my communicator
+        comm = self.communicator
         # who is the boss
         manager = self.manager
+        # the partitioning modifies my local state, which kept on my behalf by the manager of
+        # my local workers
+        step = self.worker.step
+        # get the number of parameters
+        parameters = step.parameters
+
+        # if i am balancing the load
+        if self.balance:
+            # everybody needs the chain counts of the new partition
+            self.share()
+        # find out how many chains are mine
+        samples = self.counts[self.rank]
+        # and the size of the largest partition
+        rows = max(self.counts)
+
         # am i the boss?
         if self.rank == manager:
-            # grab my global state
-            step = self.step
-            # unpack it
-            β = step.beta
-            θ = step.theta
-            Σ = step.sigma
-            prior = step.prior
-            data = step.data
-            posterior = step.posterior
+            # pack my global state and lay it out in equal sized blocks, one per task
+            packed = self.spread(packed=self.pack(step=self.step), rows=rows)
+            # and the temperature, the covariance and the scaling of the sampler
+            header = self.header(
+                sigma=self.step.sigma, beta=self.step.beta, scaling=annealer.sampler.scaling,
+                shared=self.structure(annealer=annealer, sigma=self.step.sigma))
         # the others
         else:
             # know nothing
-            β = θ = Σ = prior = data = posterior = None
-
-        # cache my communicator
-        comm = self.communicator
-        # the partitioning modifies my local state, which kept on my behalf by the manager of
-        # my local workers
-        step = self.worker.step
-
-        # everybody gets the temperature
-        step.beta = comm.bcast(item=β, source=manager)
+            packed = header = None
 
         # it is important not to disturb the memory held by the manager: threaded managers have
         # their workers set up views on the local state and we don't want to mess that up
 
-        # grab my portion of the sample set
-        step.theta.excerpt(matrix=θ, source=manager, communicator=comm)
-        # my portion of the likelihoods
-        step.prior.excerpt(vector=prior, source=manager, communicator=comm)
-        step.data.excerpt(vector=data, source=manager, communicator=comm)
-        step.posterior.excerpt(vector=posterior, source=manager, communicator=comm)
+        # grab my portion of the sample set and its likelihoods in a single collective
+        mine = altar.matrix(shape=(rows, parameters+3))
+        mine.excerpt(matrix=packed, source=manager, communicator=comm)
+        # if the number of my chains has changed
+        if step.samples != samples:
+            # make a new local state; my workers adjust their partitions and workspaces to it
+            step = self.CoolingStep.alloc(samples=samples, parameters=parameters)
+            # and hand it to them
+            self.worker.step = step
+        # unpack my portion
+        self.unpack(packed=mine, step=step)
+
+        # everybody gets the temperature, the covariance and the scaling in one broadcast
+        header = altar.matrix.bcast(matrix=header, source=manager, communicator=comm)
+        # unpack it
+        self.install(annealer=annealer, header=header, step=step)
+
+        # all done
+        return step
+
+
+    def census(self):
+        """
+        Find out how many chains each task owns, and how many chain processors it has
+        """
+        # pack mine
+        census = altar.matrix(shape=(1,2))
+        census[0,0] = self.worker.step.samples
+        census[0,1] = self.worker.workers
+        # gather them
+        census = altar.matrix.collect(
+            matrix=census, communicator=self.communicator, destination=self.manager)
+        # make sure everybody knows
+        census = altar.matrix.bcast(
+            matrix=census, source=self.manager, communicator=self.communicator)
+        # record the chain counts
+        self.counts = tuple(int(census[task, 0]) for task in range(census.rows))
+        # every chain processor needs at least one chain
+        self.minimums = tuple(int(census[task, 1]) for task in range(census.rows))
+        # all done
+        return self.counts
+
+
+    def rebalance(self, annealer, timings):
+        """
+        Re-weight the chain counts of the tasks using the {timings} of their walks
+        """
+        # grab the dispatcher
+        dispatcher = annealer.dispatcher
+        # notify we are about to balance the load
+        dispatcher.notify(event=dispatcher.balanceStart, controller=annealer)
+
+        # unpack the current chain counts
+        counts = self.counts
+        # the total number of chains is fixed
+        total = sum(counts)
+        # the throughput of each task, in chains per second
+        rates = tuple(
+            count / max(timing, self.resolution) for count, timing in zip(counts, timings))
+        # the duration of a walk with a perfectly balanced load
+        ideal = total / sum(rates)
+        # if the slowest task takes too long compared to it
+        if max(timings) > (1 + self.tolerance) * ideal:
+            # apportion the chains by throughput
+            self.counts = self.apportion(total=total, rates=rates)
+
+        # notify we are done; the monitors can find the decision in {counts}
+        dispatcher.notify(event=dispatcher.balanceFinish, controller=annealer)
+        # all done
+        return self.counts
+
 
-        # finally, the covariance matrix
-        step.sigma.copy(altar.matrix.bcast(matrix=Σ, source=manager, communicator=comm))
+    def apportion(self, total, rates):
+        """
+        Distribute {total} chains among the tasks in proportion to their {rates}
+        """
+        # the fair shares
+        shares = tuple(total * rate / sum(rates) for rate in rates)
+        # round them down, but give every chain processor at least one chain
+        counts = [max(minimum, int(share)) for minimum, share in zip(self.minimums, shares)]
+        # while there are chains left over
+        while sum(counts) < total:
+            # give one to the task that is furthest below its share
+            task = max(range(len(counts)), key=lambda task: shares[task] - counts[task])
+            counts[task] += 1
+        # while there are too many
+        while sum(counts) > total:
+            # take one from the task that is furthest above its share and can spare it
+            task = max(
+                (task for task in range(len(counts)) if counts[task] > self.minimums[task]),
+                key=lambda task: counts[task] - shares[task])
+            counts[task] -= 1
+        # all done
+        return tuple(counts)
+
+
+    def share(self):
+        """
+        Broadcast the chain counts decided by the manager
+        """
+        # if i am the manager
+        if self.rank == self.manager:
+            # pack the counts
+            counts = altar.matrix(shape=(1, self.tasks))
+            for task, count in enumerate(self.counts):
+                counts[0, task] = count
+        # the others
+        else:
+            # know nothing
+            counts = None
+        # broadcast
+        counts = altar.matrix.bcast(
+            matrix=counts, source=self.manager, communicator=self.communicator)
+        # and record
+        self.counts = tuple(int(counts[0, task]) for task in range(self.tasks))
+        # all done
+        return self.counts
+
+
+    def pad(self, packed, rows):
+        """
+        Pad {packed} with empty rows, up to {rows}
+        """
+        # if there is nothing to do
+        if packed.rows == rows:
+            # bail
+            return packed
+        # make room
+        padded = altar.matrix(shape=(rows, packed.columns)).zero()
+        # copy
+        padded.view(start=(0,0), shape=packed.shape).copy(packed)
+        # all done
+        return padded
+
+
+    def compact(self, packed, rows):
+        """
+        Remove the padding from the blocks of {rows} rows in {packed}, one per task
+        """
+        # unpack the counts
+        counts = self.counts
+        # if there is no padding
+        if min(counts) == rows:
+            # bail
+            return packed
+        # make room
+        compact = altar.matrix(shape=(sum(counts), packed.columns))
+        # go through the tasks
+        start = 0
+        for task, count in enumerate(counts):
+            # copy their chains
+            compact.view(start=(start, 0), shape=(count, packed.columns)).copy(
+                packed.view(start=(task*rows, 0), shape=(count, packed.columns)))
+            # and move on
+            start += count
+        # all done
+        return compact
 
+
+    def spread(self, packed, rows):
+        """
+        Lay out the chains in {packed} in blocks of {rows} rows, one per task
+        """
+        # unpack the counts
+        counts = self.counts
+        # if there is no padding
+        if min(counts) == rows:
+            # bail
+            return packed
+        # make room
+        spread = altar.matrix(shape=(self.tasks*rows, packed.columns)).zero()
+        # go through the tasks
+        start = 0
+        for task, count in enumerate(counts):
+            # copy their chains
+            spread.view(start=(task*rows, 0), shape=(count, packed.columns)).copy(
+                packed.view(start=(start, 0), shape=(count, packed.columns)))
+            # and move on
+            start += count
+        # all done
+        return spread
+
+
+    def encode(self, blobs, size):
+        """
+        Pack a sequence of {blobs} of {size} bytes each into a vector, so they can be moved with
+        the vector collectives
+        """
+        # the number of doubles needed to hold one blob
+        doubles = -(-size // 8)
+        # the total size of the vector
+        length = len(blobs) * doubles
+        # make room
+        buffer = bytearray(8 * length)
+        # copy the blobs
+        for index, blob in enumerate(blobs):
+            buffer[8*doubles*index:8*doubles*index+size] = blob
+        # build a vector that borrows the storage and return it
+        return altar.vector(
+            shape=length, data=altar.libaltar.buffer_vector(buffer, 0, length))
+
+
+    def decode(self, vector, size):
+        """
+        Unpack the blobs of {size} bytes in {vector}
+        """
+        # the number of doubles that hold one blob
+        doubles = -(-size // 8)
+        # make room
+        buffer = bytearray(8 * vector.shape)
+        # copy the vector into it
+        altar.vector(
+            shape=vector.shape,
+            data=altar.libaltar.buffer_vector(buffer, 0, vector.shape)).copy(vector)
+        # extract the blobs
+        return tuple(
+            bytes(buffer[start:start+size]) for start in range(0, len(buffer), 8*doubles))
+
+
+    def pack(self, step):
+        """
+        Pack the sample set of {step} and its likelihoods into a single matrix, one sample per
+        row, so they can be moved with one collective
+        """
+        # unpack the shape
+        samples = step.samples
+        parameters = step.parameters
+        # make room
+        packed = altar.matrix(shape=(samples, parameters+3))
+        # the samples go first
+        packed.view(start=(0,0), shape=(samples, parameters)).copy(step.theta)
+        # followed by the likelihoods
+        for column, likelihood in enumerate((step.prior, step.data, step.posterior)):
+            packed.setColumn(parameters+column, likelihood)
+        # all done
+        return packed
+
+
+    def unpack(self, packed, step):
+        """
+        Unpack the sample set and its likelihoods in {packed} into {step}
+        """
+        # unpack the shape
+        samples = step.samples
+        parameters = step.parameters
+        # the samples
+        step.theta.copy(packed.view(start=(0,0), shape=(samples, parameters)))
+        # and the likelihoods
+        for column, likelihood in enumerate((step.prior, step.data, step.posterior)):
+            likelihood.copy(packed.getColumn(parameters+column))
+        # all done
+        return step
+
+
+    def header(self, sigma, beta, scaling, shared=None):
+        """
+        Pack the parameter covariance, the temperature and the covariance scaling into a
+        single matrix, so they can be moved with one collective; the rows in {shared}, if any,
+        carry the structure of the covariance and go last
+        """
+        # get the number of parameters
+        parameters = sigma.rows
+        # and the number of rows of structure
+        extra = 0 if shared is None else shared.rows
+        # make room
+        header = altar.matrix(shape=(parameters+2+extra, parameters)).zero()
+        # the covariance goes first
+        header.view(start=(0,0), shape=(parameters, parameters)).copy(sigma)
+        # followed by the scalars
+        header[parameters, 0] = beta
+        header[parameters+1, 0] = scaling
+        # and the structure
+        if extra:
+            header.view(start=(parameters+2, 0), shape=(extra, parameters)).copy(shared)
+        # all done
+        return header
+
+
+    def install(self, annealer, header, step):
+        """
+        Unpack the parameter covariance, the temperature and the covariance scaling in
+        {header} into {step}, and hand the structure of the covariance, if any, to the
+        representation of the scheduler so the sampler doesn't have to recover it
+        """
+        # get the number of parameters
+        parameters = step.parameters
+        # unpack the covariance
+        step.sigma.copy(header.view(start=(0,0), shape=(parameters, parameters)))
+        # and the temperature
+        step.beta = header[parameters, 0]
+        # the samplers of the workers don't get to adjust their own scaling
+        annealer.sampler.scaling = header[parameters+1, 0]
+        # the rest of the rows describe the structure of the covariance
+        extra = header.rows - parameters - 2
+        # if there are any
+        if extra:
+            # get them
+            shared = header.view(start=(parameters+2, 0), shape=(extra, parameters))
+            # and describe my local covariance with them
+            annealer.scheduler.covariance.adopt(sigma=step.sigma, shared=shared)
         # all done
         return step
 
 
     # private data
     manager = 0 # the rank responsible for distributing and collecting the workload
+    balance = False # whether to re-weight the chain counts by the throughput of each task
+    counts = () # the number of chains owned by each task
+    minimums = () # the smallest number of chains each task can own
+    elapsed = 0 # the duration of my last walk
+    tolerance = 0.1 # the acceptable slowdown of the slowest task over a balanced walk
+    resolution = 1.0e-6 # the shortest walk duration taken at face value
     worker = None # the annealing method implementation; deduced at start up time
+    state = None # the global state, assembled by the manager
 
 
 # end of file
@@ -10,7 +10,7 @@
 
 
 # externals
-import math
+import copy
 # the package
 import altar
 # my protocol
@@ -26,6 +26,7 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
 
     # types
     from .CoolingStep import CoolingStep
+    from .Workspace import Workspace
 
 
     # user configurable state
@@ -38,6 +39,25 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
     rejectionWeight = altar.properties.float(default=1)
     rejectionWeight.doc = 'the weight of rejected samples during covariance rescaling'
 
+    adaptive = altar.properties.bool(default=False)
+    adaptive.doc = 'stop walking the chains as soon as they have mixed sufficiently'
+
+    minSteps = altar.properties.int(default=1)
+    minSteps.doc = 'the shortest chain walk in adaptive mode'
+
+    maxSteps = altar.properties.int(default=0)
+    maxSteps.doc = 'the longest chain walk in adaptive mode; zero means {job.steps}'
+
+    mixing = altar.properties.float(default=.25)
+    mixing.doc = ('the squared jump distance per parameter, in units of the variances in Σ, '
+                  'that the chains must accumulate on average before an adaptive walk stops')
+
+    blocked = altar.properties.bool(default=False)
+    blocked.doc = 'cycle the proposals through the parameter sets of the model, one per link'
+
+    blockSize = altar.properties.int(default=1)
+    blockSize.doc = 'the width of the parameter blocks of models without parameter sets'
+
 
     # protocol obligations
     @altar.export
@@ -47,6 +67,13 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
         """
         # pull the chain length from the job specification
         self.steps = application.job.steps
+        # in adaptive mode, the job chain length is the default upper bound
+        if self.adaptive:
+            # deduce the bounds on the chain length, leaving the user settings alone
+            longest = self.maxSteps or self.steps
+            self.shortest = max(1, min(self.minSteps, longest))
+            # and use the upper bound as the length of the walk
+            self.steps = longest
         # get the capsule of the random number generator
         rng = application.rng.rng
         # set up the distribution for building the sample multiplicities; use a strictly
@@ -54,6 +81,11 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
         self.uniform = altar.pdf.uniform_pos(rng=rng)
         # set up the distribution for the random walk displacement vectors
         self.uninormal = altar.pdf.ugaussian(rng=rng)
+        # the GPU implementations of the forward models are sized for the full set of chains,
+        # so they can't handle the dense sets of survivors built by {evaluate}
+        self.compact = application.job.gpus == 0
+        # the blocks of the blocked mode get carved out of the parameter space the first time
+        # the sampling pdf is prepared, since the model has not placed its parameter sets yet
 
         # all done
         return self
@@ -70,6 +102,8 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
         dispatcher.notify(event=dispatcher.samplePosteriorStart, controller=annealer)
         # prepare the sampling pdf
         self.prepareSamplingPDF(annealer=annealer, step=step)
+        # and the storage for walking the chains
+        self.prepareWorkspace(step=step)
         # walk the chains
         statistics = self.walkChains(annealer=annealer, step=step)
         # notify we are done sampling the posterior
@@ -99,18 +133,74 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
         dispatcher = annealer.dispatcher
         # notify we have started preparing the sampling PDF
         dispatcher.notify(event=dispatcher.prepareSamplingPDFStart, controller=annealer)
-        # unpack what i need
-        Σ = step.sigma.clone()
-        # scale it
-        Σ *= self.scaling**2
-        # compute its Cholesky decomposition
-        self.sigma_chol = altar.lapack.cholesky_decomposition(Σ)
+        # get the representation of the covariance used by the scheduler, if it has one
+        proposal = getattr(annealer.scheduler, "covariance", None)
+        # in blocked mode
+        if self.blocked:
+            # if i haven't done so yet, carve the parameter space into blocks
+            if not self.blocks: self.blocks = self.partition(model=annealer.model)
+            # the factors of the blocks
+            factors = []
+            # go through the blocks
+            for offset, count in self.blocks:
+                # make a copy of this block of the covariance
+                Σ = step.sigma.view(start=(offset, offset), shape=(count, count)).clone()
+                # scale it
+                Σ *= self.scaling**2
+                # decompose it and save it
+                factors.append(altar.lapack.cholesky_decomposition(Σ))
+            # save them
+            self.factors = factors
+            # there is no dense factor
+            self.sigma_chol = None
+            # and i draw the displacements myself
+            self.proposal = None
+        # if the scheduler has a representation of the covariance
+        elif proposal is not None:
+            # ask it to prepare; dense representations return the Cholesky factor
+            self.sigma_chol = proposal.factor(sigma=step.sigma, scaling=self.scaling)
+            # structured ones will draw the displacements themselves
+            self.proposal = proposal if self.sigma_chol is None else None
+        # otherwise
+        else:
+            # unpack what i need
+            Σ = step.sigma.clone()
+            # scale it
+            Σ *= self.scaling**2
+            # compute its Cholesky decomposition
+            self.sigma_chol = altar.lapack.cholesky_decomposition(Σ)
+            # and draw the displacements myself
+            self.proposal = None
+        # in adaptive mode
+        if self.adaptive:
+            # the jumps are measured in units of the parameter variances
+            self.weights = self.precisions(sigma=step.sigma)
         # notify we are done preparing the sampling PDF
         dispatcher.notify(event=dispatcher.prepareSamplingPDFFinish, controller=annealer)
         # all done
         return
 
 
+    def prepareWorkspace(self, step):
+        """
+        Make sure my workspace matches the geometry of {step}
+        """
+        # get the current workspace
+        workspace = self.workspace
+        # if there isn't one, or its shape is out of date
+        if (workspace is None
+            or workspace.samples != step.samples or workspace.parameters != step.parameters):
+            # make a new one
+            workspace = self.Workspace(
+                beta=step.beta, samples=step.samples, parameters=step.parameters)
+            # and attach it
+            self.workspace = workspace
+        # update the temperature of the candidates
+        workspace.candidate.beta = step.beta
+        # all done
+        return workspace
+
+
     def walkChains(self, annealer, step):
         """
         Run the Metropolis algorithm on the Markov chains
@@ -121,106 +211,103 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
         dispatcher = annealer.dispatcher
 
         # unpack what i need from the cooling step
-        β = step.beta
         θ = step.theta
-        prior = step.prior
-        data = step.data
-        posterior = step.posterior
-        # get the parameter covariance
-        Σ_chol = self.sigma_chol
-        # the sample geometry
+        # the number of samples
         samples = step.samples
+        # and the number of parameters
         parameters = step.parameters
-        # a couple of functions from the math module
-        exp = math.exp
-        log = math.log
+
+        # unpack my workspace: the candidate state
+        workspace = self.workspace
+        candidate = workspace.candidate
+        cθ = candidate.theta
+        # the mask of samples rejected due to model constraint violations
+        rejects = workspace.rejects
+        # and the vector with random numbers for the Metropolis acceptance
+        dice = workspace.dice
+
+        # in blocked mode, give the model a chance to prepare for updating its data likelihood
+        # one block at a time
+        incremental = (
+            self.blocked and self.incremental and model.blockStart(annealer=annealer, step=step))
+        # if i have to measure how far the chains travel, i need room for the jumps
+        if self.adaptive: workspace.enableJumps()
+        # and both the model and i need to know which candidates get accepted
+        moves = workspace.enableMoves().moves if incremental or self.adaptive else None
 
         # reset the accept/reject counters
         accepted = rejected = unlikely = 0
-
-        # allocate some vectors that we use throughout the following
-        # candidate likelihoods
-        cprior = altar.vector(shape=samples)
-        cdata = altar.vector(shape=samples)
-        cpost = altar.vector(shape=samples)
-        # a fake covariance matrix for the candidate steps, just so we don't have to rebuild it
-        # every time
-        csigma = altar.matrix(shape=(parameters,parameters))
-        # the mask of samples rejected due to model constraint violations
-        rejects = altar.vector(shape=samples)
-        # and a vector with random numbers for the Metropolis acceptance
-        dice = altar.vector(shape=samples)
+        # the squared jump distance per parameter accumulated by the chains, on average
+        jump = 0
 
         # step all chains together
-        for step in range(self.steps):
+        for link in range(self.steps):
             # notify we are advancing the chains
             dispatcher.notify(event=dispatcher.chainAdvanceStart, controller=annealer)
 
-            # initialize the candidate sample by randomly displacing the current one
-            cθ = self.displace(sample=θ)
-            # initialize the likelihoods
-            likelihoods = cprior.zero(), cdata.zero(), cpost.zero()
-            # and the covariance matrix
-            csigma.zero()
-            # build a candidate state
-            candidate = self.CoolingStep(beta=β, theta=cθ,
-                                         likelihoods=likelihoods, sigma=csigma)
+            # clear the candidate state
+            workspace.reset()
+            # in blocked mode
+            if self.blocked:
+                # pick the block to move during this link
+                block = link % len(self.blocks)
+                offset, count = self.blocks[block]
+                # and displace only its parameters
+                self.proposeBlock(step=step, offset=offset, count=count, chol=self.factors[block])
+            # otherwise
+            else:
+                # all parameters move together
+                count = parameters
+                # so initialize the candidate sample by displacing the current one
+                self.propose(annealer=annealer, step=step)
 
             # the random displacement may have generated candidates that are outside the
             # support of the model, so we must give it an opportunity to reject them;
             # notify we are starting the verification process
             dispatcher.notify(event=dispatcher.verifyStart, controller=annealer)
-            # reset the mask and ask the model to verify the sample validity
-            model.verify(step=candidate, mask=rejects.zero())
+            # ask the model to verify the sample validity
+            model.verify(step=candidate, mask=rejects)
             # make the candidate a consistent set by replacing the rejected samples with copies
             # of the originals from {θ}
-            for index, flag in enumerate(rejects):
-                # if this sample was rejected
-                if flag:
-                    # copy the corresponding row from {θ} into {candidate}
-                    cθ.setRow(index, θ.getRow(index))
+            restored = altar.libaltar.restore(θ.data, cθ.data, rejects.data)
             # notify that the verification process is finished
             dispatcher.notify(event=dispatcher.verifyFinish, controller=annealer)
 
-            # compute the likelihoods
-            model.likelihoods(annealer=annealer, step=candidate)
+            # if the model can update the data likelihood of the candidates incrementally
+            if incremental:
+                # let it; the rejected candidates are copies of the originals, so there is no
+                # point in compacting the survivors
+                self.evaluateBlock(
+                    annealer=annealer, step=step, candidate=candidate, offset=offset, count=count)
+            # otherwise
+            else:
+                # compute the likelihoods of the candidates that survived verification
+                self.evaluate(annealer=annealer, candidate=candidate,
+                              rejects=rejects, survivors=samples-restored)
+
+            # in adaptive mode
+            if self.adaptive:
+                # measure how far each candidate is from its original
+                altar.libaltar.jumps(
+                    θ.data, cθ.data, self.weights.data, workspace.distances.data)
 
-            # build a vector to hold the difference of the two posterior likelihoods
-            diff = cpost.clone()
-            # subtract the previous posterior
-            diff -= posterior
             # randomize the Metropolis acceptance vector
             dice.random(self.uniform)
 
             # notify we are starting accepting samples
             dispatcher.notify(event=dispatcher.acceptStart, controller=annealer)
 
-            # accept/reject: go through all the samples
-            for sample in range(samples):
-                # a candidate is rejected if the model considered it invalid
-                if rejects[sample]:
-                    # nothing to do: θ, priorL, dataL, and postL contain the right statistics
-                    # for this sample; just update the rejection count
-                    rejected += 1
-                    # and move on
-                    continue
-                # a candidate is also rejected if the model considered it less likely than the
-                # original and it wasn't saved by the {dice}
-                if log(dice[sample]) > diff[sample]:
-                    # nothing to do: θ, priorL, dataL, and postL contain the right statistics
-                    # for this sample; just update the unlikely count
-                    unlikely += 1
-                    # and move on
-                    continue
-
-                # otherwise, update the acceptance count
-                accepted += 1
-                # copy the candidate sample
-                θ.setRow(sample, cθ.getRow(sample))
-                # and its likelihoods
-                prior[sample] = cprior[sample]
-                data[sample] = cdata[sample]
-                posterior[sample] = cpost[sample]
+            # accept/reject: merge the candidates that pass the Metropolis test into the current
+            # sample set
+            stats = self.merge(annealer=annealer, step=step, moves=moves)
+            # if the model is tracking the samples
+            if incremental:
+                # tell it which candidates were accepted
+                model.blockAccept(annealer=annealer, step=step, candidate=candidate, moves=moves)
+            # update the counters
+            accepted += stats[0]
+            rejected += stats[1]
+            unlikely += stats[2]
 
             # notify we are done accepting samples
             dispatcher.notify(event=dispatcher.acceptFinish, controller=annealer)
@@ -228,35 +315,199 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
             # notify we are done advancing the chains
             dispatcher.notify(event=dispatcher.chainAdvanceFinish, controller=annealer)
 
+            # record the length of the walk so far
+            self.length = link + 1
+            # in adaptive mode
+            if self.adaptive:
+                # accumulate the squared jumps of the accepted candidates; the rejected ones
+                # didn't move
+                jump += altar.blas.ddot(workspace.distances, workspace.moves) / (
+                    samples * parameters)
+                # and stop if the chains have traveled far enough
+                if self.length >= self.shortest and jump >= self.mixing: break
 
         # all done
         return accepted, rejected, unlikely
 
 
-    def displace(self, sample):
+    def propose(self, annealer, step):
+        """
+        Fill the candidate state in my workspace with random displacements of the samples in
+        {step}
         """
-        Construct a set of displacement vectors for the random walk from a distribution with zero
-        mean and my covariance
+        # get the structured covariance representation, if any
+        proposal = self.proposal
+        # if there is one
+        if proposal is not None:
+            # let it draw the displacements
+            return proposal.displace(
+                theta=step.theta, candidate=self.workspace.candidate.theta, pdf=self.uninormal,
+                workspace=self.workspace)
+        # otherwise, the random walk displacements come from a distribution with zero mean and
+        # my covariance
+        return self.workspace.displace(
+            theta=step.theta, sigma_chol=self.sigma_chol, pdf=self.uninormal)
+
+
+    def proposeBlock(self, step, offset, count, chol):
         """
-        # get my decomposed covariance
-        Σ_chol = self.sigma_chol
-
-        # build a set of random displacement vectors; note that, for convenience, this starts
-        # out as (parameters x samples), i.e. the transpose of what we need
-        δT = altar.matrix(shape=tuple(reversed(sample.shape))).random(pdf=self.uninormal)
-        # multiply the displacement vectors by the decomposed covariance
-        δT = altar.blas.dtrmm(
-            Σ_chol.sideLeft, Σ_chol.lowerTriangular, Σ_chol.opNoTrans, Σ_chol.nonUnitDiagonal,
-            1, Σ_chol, δT)
-
-        # allocate the transpose
-        δ = altar.matrix(shape=sample.shape)
-        # fill it
-        δT.transpose(δ)
-        # offset it by the original sample
-        δ += sample
-        # and return it
-        return δ
+        Fill the candidate state in my workspace with copies of the samples in {step}, with the
+        {count} parameters starting at column {offset} displaced by a distribution with zero
+        mean and covariance {chol} times its transpose
+        """
+        # get the samples
+        θ = step.theta
+        # and the candidates
+        cθ = self.workspace.candidate.theta
+        # start out with the current samples
+        cθ.copy(θ)
+        # get the block of the candidates that moves
+        δ = cθ.view(start=(0, offset), shape=(step.samples, count))
+        # fill it with random numbers
+        δ.random(pdf=self.uninormal)
+        # multiply each row from the right by the transpose of the factor
+        altar.blas.dtrmm(
+            chol.sideRight, chol.lowerTriangular, chol.opTrans, chol.nonUnitDiagonal, 1, chol, δ)
+        # and offset it by the original block
+        δ += θ.view(start=(0, offset), shape=(step.samples, count))
+        # all done
+        return cθ
+
+
+    def merge(self, annealer, step, bias=None, moves=None):
+        """
+        Merge the candidates in my workspace that pass the Metropolis test into {step}, in a
+        single pass through the samples; return the acceptance statistics
+        """
+        # unpack my workspace
+        workspace = self.workspace
+        candidate = workspace.candidate
+        # ask the kernel to do the work
+        return altar.libaltar.accept(
+            candidate.theta.data,
+            candidate.prior.data, candidate.data.data, candidate.posterior.data,
+            step.theta.data, step.prior.data, step.data.data, step.posterior.data,
+            workspace.dice.data, workspace.rejects.data,
+            bias.data if bias is not None else None,
+            moves.data if moves is not None else None)
+
+
+    def evaluate(self, annealer, candidate, rejects, survivors):
+        """
+        Compute the likelihoods of the {candidate} samples that are not flagged in {rejects}
+        """
+        # if all candidates survived verification, or i'm not allowed to compact them
+        if survivors == candidate.samples or not self.compact:
+            # compute the likelihoods of the whole set in place
+            annealer.model.likelihoods(annealer=annealer, step=candidate)
+            # and we are done
+            return self
+
+        # if nobody survived
+        if survivors == 0:
+            # there is nothing to compute; the likelihoods of the rejected samples are ignored
+            # during the accept/reject phase
+            return self
+
+        # otherwise, build a dense step with just the survivors out of my workspace
+        dense = self.workspace.compact(survivors=survivors)
+        # gather them
+        altar.libaltar.compact(candidate.theta.data, rejects.data, dense.theta.data)
+        # compute the likelihoods
+        annealer.model.likelihoods(annealer=annealer, step=dense)
+
+        # spread the results over the slots of the survivors
+        altar.libaltar.scatter(dense.prior.data, rejects.data, candidate.prior.data)
+        altar.libaltar.scatter(dense.data.data, rejects.data, candidate.data.data)
+        altar.libaltar.scatter(dense.posterior.data, rejects.data, candidate.posterior.data)
+
+        # all done
+        return self
+
+
+    def evaluateBlock(self, annealer, step, candidate, offset, count):
+        """
+        Compute the likelihoods of the {candidate} samples, given that they differ from the
+        samples in {step} only in the {count} parameters starting at column {offset}
+        """
+        # get the model
+        model = annealer.model
+        # and the dispatcher
+        dispatcher = annealer.dispatcher
+
+        # the prior is cheap, so compute it from scratch
+        dispatcher.notify(event=dispatcher.priorStart, controller=annealer)
+        model.priorLikelihood(step=candidate)
+        dispatcher.notify(event=dispatcher.priorFinish, controller=annealer)
+
+        # ask the model to update the data likelihood
+        dispatcher.notify(event=dispatcher.dataStart, controller=annealer)
+        model.blockLikelihood(
+            annealer=annealer, step=step, candidate=candidate, offset=offset, count=count)
+        dispatcher.notify(event=dispatcher.dataFinish, controller=annealer)
+
+        # and put together the posterior
+        dispatcher.notify(event=dispatcher.posteriorStart, controller=annealer)
+        model.posteriorLikelihood(step=candidate)
+        dispatcher.notify(event=dispatcher.posteriorFinish, controller=annealer)
+
+        # all done
+        return self
+
+
+    def partition(self, model):
+        """
+        Carve the parameter space of {model} into the blocks visited by the blocked proposals
+        """
+        # get the parameter sets of the model, if it has any
+        psets = getattr(model, "psets", None)
+        # if it does
+        if psets:
+            # each one gets a block
+            return sorted((pset.offset, pset.count) for pset in psets.values())
+        # otherwise, get the number of parameters
+        parameters = model.parameters
+        # and the width of the blocks
+        size = max(1, self.blockSize)
+        # and split them evenly; the last block gets the remainder
+        return [
+            (offset, min(size, parameters - offset)) for offset in range(0, parameters, size)]
+
+
+    def precisions(self, sigma):
+        """
+        Build the vector with the inverses of the variances on the diagonal of {sigma}
+        """
+        # get the number of parameters
+        parameters = sigma.rows
+        # make a vector
+        precisions = altar.vector(shape=parameters)
+        # go through the diagonal
+        for parameter in range(parameters):
+            # invert the variance
+            precisions[parameter] = 1 / sigma[parameter, parameter]
+        # all done
+        return precisions
+
+
+    def clone(self, rng, workspace=None):
+        """
+        Make a copy of me that shares my configuration and my sampling pdf, but walks its chains
+        with its own random number generator and {workspace}; used by the annealing methods
+        that walk partitions of the chains concurrently
+        """
+        # make a shallow copy
+        twin = copy.copy(self)
+        # give it its own distributions
+        twin.uniform = altar.pdf.uniform_pos(rng=rng)
+        twin.uninormal = altar.pdf.ugaussian(rng=rng)
+        # and its own workspace
+        twin.workspace = workspace
+        # the model keeps a single cache of the samples, so the twins can't update the data
+        # likelihoods incrementally
+        twin.incremental = False
+        # all done
+        return twin
 
 
     def adjustCovarianceScaling(self, accepted, rejected, unlikely):
@@ -283,10 +534,19 @@ class Metropolis(altar.component, family="altar.samplers.metropolis", implements
 
     # private data
     steps = 1          # the length of each Markov chain
+    shortest = 1       # the shortest chain walk in adaptive mode
+    length = 0         # the number of steps taken by the most recent chain walk
+    weights = None     # the inverses of the parameter variances, for measuring the jumps
 
     uniform = None     # the distribution of the sample multiplicities
     uninormal = None   # the distribution of random walk displacement vectors
     sigma_chol = None  # placeholder for the scaled and decomposed parameter covariance matrix
+    proposal = None    # the structured covariance representation that draws the displacements
+    blocks = ()        # the (offset, count) pairs of the blocks visited in blocked mode
+    factors = ()       # the Cholesky factors of the scaled blocks of the covariance
+    workspace = None   # the storage for walking the chains
+    compact = True     # whether to evaluate only the candidates that pass model verification
+    incremental = True # whether models may update data likelihoods one block at a time
 
     dispatcher = None  # a reference to the event dispatcher
 
@@ -0,0 +1,81 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import itertools
+# get the package
+import altar
+# my protocol
+from .Resampler import Resampler as resampler
+
+
+# declaration
+class Multinomial(altar.component, family="altar.bayesian.resamplers.multinomial",
+                  implements=resampler):
+    """
+    Multinomial resampling: every new sample is an independent draw from the weights
+
+    This is the simplest scheme, but it has the largest variance in the sample multiplicities
+    """
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # get the rng wrapper
+        rng = application.rng.rng
+        # set up the distribution for building the sample multiplicities
+        self.uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+        # all done
+        return self
+
+
+    @altar.export
+    def multiplicities(self, w, multiplicities):
+        """
+        Fill {multiplicities} with the number of copies of each sample in the next sample set,
+        given the normalized weights {w}
+        """
+        # get the number of samples
+        samples = w.shape
+        # build a vector of random numbers uniformly distributed in [0,1]
+        r = altar.vector(shape=samples).random(pdf=self.uniform)
+        # compute the bin edges in the range [0, 1]
+        ticks = tuple(self.buildHistogramRanges(w))
+        # build a histogram
+        h = altar.histogram(bins=samples).ranges(points=ticks).fill(r)
+        # and convert it into a vector
+        multiplicities.copy(h.values())
+        # all done
+        return multiplicities
+
+
+    # implementation details
+    def buildHistogramRanges(self, w):
+        """
+        Build histogram bins based on the scaled data log-likelihood
+        """
+        # start at 0
+        yield 0
+        # yield the partial sums
+        for partialSum in itertools.accumulate(w): yield partialSum
+        # all done
+        return
+
+
+    # private data
+    uniform = None
+
+
+# end of file
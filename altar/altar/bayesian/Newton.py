@@ -0,0 +1,96 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+
+
+# get the package
+import altar
+# my protocol
+from .Solver import Solver as solver
+
+
+# declaration
+class Newton(altar.component, family="altar.bayesian.solvers.newton", implements=solver):
+    """
+    A δβ solver that finds the root of COV(δβ) = target with a safeguarded Newton method
+
+    The COV of the weights is an increasing function of δβ, so the solver maintains a bracket
+    around the root and falls back to bisection whenever a Newton step would leave it. The
+    search starts from the δβ of the previous step, and the weights are computed relative to
+    the maximum log-likelihood so that they never overflow
+    """
+
+
+    # user configurable state
+    tolerance = altar.properties.float(default=.01)
+    tolerance.doc = 'the fractional tolerance for achieving convergence'
+
+    maxiter = altar.properties.int(default=100)
+    maxiter.doc = 'the maximum number of evaluations of COV while looking for a δβ'
+
+
+    # public data
+    iterations = 0 # the number of COV evaluations during the last solve
+
+
+    # protocol obligations
+    @altar.provides
+    def initialize(self, application, scheduler):
+        """
+        Initialize me and my parts given an {application} context and a {scheduler}
+        """
+        # get the simulation RNG
+        rng = application.rng.rng
+        # instantiate my COV calculator
+        self.cov = altar.libaltar.cov(rng.rng, self.maxiter, self.tolerance, scheduler.target)
+        # all done
+        return self
+
+
+    @altar.export
+    def solve(self, llk, weight):
+        """
+        Compute the next temperature in the cooling schedule
+        :param llk: data log-likelihood
+        :param weight: the normalized weight
+        :return: β, cov
+        """
+        # solve
+        β, cov, self.iterations = altar.libaltar.dbeta_newton(self.cov, llk.data, weight.data)
+        # and return β, cov
+        return β, cov
+
+
+    @altar.export
+    def state(self):
+        """
+        Return the state that i carry from one β step to the next: the temperature and the
+        last temperature increment
+        """
+        # ask my COV calculator
+        return altar.libaltar.cov_state(self.cov)
+
+
+    @altar.export
+    def restore(self, state):
+        """
+        Pick up the {state} saved by a checkpoint
+        """
+        # unpack
+        β, δβ = state
+        # and hand it to my COV calculator
+        altar.libaltar.cov_restore(self.cov, β, δβ)
+        # all done
+        return self
+
+
+    # private data
+    cov = None # the COV calculator
+
+
+# end of file
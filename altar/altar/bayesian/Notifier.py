@@ -46,6 +46,8 @@ class Notifier(altar.component,
     walkChainsFinish = "walkChainsFinish"
     resampleStart = "resampleStart"
     resampleFinish = "resampleFinish"
+    balanceStart = "balanceStart"
+    balanceFinish = "balanceFinish"
     betaFinish = "betaFinish"
     samplePosteriorFinish = "samplePosteriorFinish"
 
@@ -123,6 +125,8 @@ class Notifier(altar.component,
             self.walkChainsFinish: altar.patterns.observable(),
             self.resampleStart: altar.patterns.observable(),
             self.resampleFinish: altar.patterns.observable(),
+            self.balanceStart: altar.patterns.observable(),
+            self.balanceFinish: altar.patterns.observable(),
             self.samplePosteriorFinish: altar.patterns.observable(),
             self.betaFinish: altar.patterns.observable(),
             self.finish: altar.patterns.observable(),
@@ -0,0 +1,344 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import atexit
+import multiprocessing
+import multiprocessing.shared_memory
+# the framework
+import altar
+# superclass
+from .AnnealingMethod import AnnealingMethod
+# the event dispatcher
+from .Notifier import Notifier
+# the view of the annealer seen by the workers
+from .ThreadedAnnealing import Partition
+
+
+# declaration
+class ProcessAnnealing(AnnealingMethod):
+    """
+    Annealing method that walks the chains in a pool of worker processes on the local machine
+
+    The sample set, its likelihoods and the parameter covariance live in shared memory, so the
+    workers walk their slices of the chains in place while the parent runs the scheduler; this
+    helps forward models that hold the interpreter lock, which gain nothing from threads. So
+    does the structure of the covariance, for representations that have one, so the workers
+    draw their proposals from the same factors as the parent. The workers are forked once the
+    annealer is configured, so that they inherit it
+    """
+
+
+    # public data
+    wid = 0     # my worker id
+    workers = 1 # the number of processes i manage
+
+
+    # interface
+    def start(self, annealer):
+        """
+        Start the annealing process
+        """
+        # chain up
+        super().start(annealer=annealer)
+        # get the model
+        model = annealer.model
+        # each of my workers gets a full set of chains
+        samples = self.processes * model.job.chains
+        # and the parameter count
+        parameters = model.parameters
+
+        # the shared storage must not outlive me, even if the simulation never gets to {finish}
+        atexit.register(self.release)
+        # allocate two sets of shared storage, so the scheduler can fill one while the other
+        # holds the current state
+        front = self.allocate(samples=samples, parameters=parameters)
+        back = self.allocate(samples=samples, parameters=parameters)
+        # remember where everything lives, since the schedulers swap them around
+        self.states = [
+            (step.theta, step.prior, step.data, step.posterior) for step in (front, back) ]
+        self.sigmas = [front.sigma, back.sigma]
+        # make room for the structure of the covariance; representations share at most one
+        # row per parameter, plus one
+        self.shared = self.reserve(rows=parameters+1, columns=parameters)
+        # build my state
+        step = self.CoolingStep(
+            beta=0, theta=front.theta, likelihoods=(front.prior, front.data, front.posterior),
+            sigma=front.sigma, back=back)
+        # ask the model to initialize it
+        model.initializeSample(step=step)
+        # and attach it
+        self.step = step
+
+        # get the fork context; the workers must inherit the configured annealer
+        context = multiprocessing.get_context("fork")
+        # build the channels to my workers
+        pipes = [context.Pipe() for worker in range(self.processes)]
+        # keep my ends
+        self.channels = [parent for parent, child in pipes]
+        # launch the workers
+        self.pool = [
+            context.Process(
+                target=self.serve, kwargs={"annealer": annealer, "wid": wid, "channel": child},
+                daemon=True)
+            for wid, (parent, child) in enumerate(pipes) ]
+        # start them
+        for worker in self.pool: worker.start()
+
+        # have the workers compute the likelihoods of their partitions
+        self.request(command="likelihoods")
+
+        # all done
+        return self
+
+
+    def walk(self, annealer):
+        """
+        Explore configuration space by walking the Markov chains
+        """
+        # get the sampler
+        sampler = annealer.sampler
+        # and the dispatcher
+        dispatcher = annealer.dispatcher
+
+        # notify we have started sampling the posterior
+        dispatcher.notify(event=dispatcher.samplePosteriorStart, controller=annealer)
+        # get the structure of the covariance, if there is any
+        structure = self.structure(annealer=annealer, sigma=self.step.sigma)
+        # and place it where the workers can see it
+        rows = 0 if structure is None else structure.rows
+        if rows: self.shared.view(start=(0,0), shape=structure.shape).copy(structure)
+        # have the workers walk their chains with the current covariance scaling
+        replies = self.request(command="walk", scaling=sampler.scaling, structure=rows)
+        # record the length of the longest walk
+        sampler.length = max(length for stats, length in replies)
+        # notify we are done sampling the posterior
+        dispatcher.notify(event=dispatcher.samplePosteriorFinish, controller=annealer)
+
+        # add up the acceptance statistics
+        return tuple(sum(counts) for counts in zip(*(stats for stats, length in replies)))
+
+
+    def finish(self, annealer):
+        """
+        Shut down the annealing process
+        """
+        # chain up
+        super().finish(annealer=annealer)
+        # tell the workers to go away
+        for channel in self.channels:
+            channel.send(("stop",))
+        # wait for them
+        for worker in self.pool:
+            worker.join()
+        # and release the shared storage
+        self.release()
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, annealer, processes, **kwds):
+        # chain up
+        super().__init__(annealer=annealer, **kwds)
+        # save the number of processes
+        self.processes = processes
+        # each one is a chain processor
+        self.workers = processes
+        # initialize my shared memory segments
+        self.segments = []
+        # all done
+        return
+
+
+    # implementation details
+    def allocate(self, samples, parameters):
+        """
+        Build a cooling step whose storage is a shared memory segment
+        """
+        # the storage size of a double
+        size = 8
+        # make a segment with room for θ, the three likelihood vectors and Σ
+        segment = multiprocessing.shared_memory.SharedMemory(
+            create=True, size=size*(samples*parameters + 3*samples + parameters*parameters))
+        # hold on to it
+        self.segments.append(segment)
+        # get its buffer
+        buffer = segment.buf
+
+        # carve the sample set out of it
+        θ = altar.matrix(
+            shape=(samples, parameters),
+            data=altar.libaltar.buffer_matrix(buffer, 0, samples, parameters))
+        # the likelihoods follow
+        offset = size * samples * parameters
+        likelihoods = []
+        for vector in range(3):
+            likelihoods.append(altar.vector(
+                shape=samples, data=altar.libaltar.buffer_vector(buffer, offset, samples)))
+            offset += size * samples
+        # and then the covariance
+        Σ = altar.matrix(
+            shape=(parameters, parameters),
+            data=altar.libaltar.buffer_matrix(buffer, offset, parameters, parameters))
+
+        # build the step and return it
+        return self.CoolingStep(beta=0, theta=θ.zero(), likelihoods=likelihoods, sigma=Σ.zero())
+
+
+    def reserve(self, rows, columns):
+        """
+        Build a matrix whose storage is a shared memory segment
+        """
+        # make a segment
+        segment = multiprocessing.shared_memory.SharedMemory(create=True, size=8*rows*columns)
+        # hold on to it
+        self.segments.append(segment)
+        # and carve the matrix out of it
+        matrix = altar.matrix(
+            shape=(rows, columns),
+            data=altar.libaltar.buffer_matrix(segment.buf, 0, rows, columns))
+        # all done
+        return matrix.zero()
+
+
+    def release(self):
+        """
+        Remove my shared memory segments; the mappings go away with the last reference
+        """
+        # go through the segments
+        while self.segments:
+            # remove each one, exactly once
+            self.segments.pop().unlink()
+        # all done
+        return self
+
+
+    def request(self, command, **kwds):
+        """
+        Ask my workers to carry out {command} on their partitions of my state, and collect
+        their replies
+        """
+        # get my state
+        step = self.step
+        # find out which storage holds the current sample set
+        state = next(
+            index for index, (θ, *_) in enumerate(self.states) if θ is step.theta)
+        # and the covariance
+        sigma = next(index for index, Σ in enumerate(self.sigmas) if Σ is step.sigma)
+        # send the request to everybody
+        for channel in self.channels:
+            channel.send((command, step.beta, state, sigma, kwds))
+        # collect the replies
+        replies = [channel.recv() for channel in self.channels]
+        # if any of the workers failed
+        for reply in replies:
+            # raise its exception here
+            if isinstance(reply, Exception): raise reply
+        # all done
+        return replies
+
+
+    def partition(self, wid, beta, state, sigma):
+        """
+        Build the step with the chains of worker {wid}, out of the storage in {state} and
+        {sigma}
+        """
+        # unpack the storage
+        θ, prior, data, posterior = self.states[state]
+        # the number of chains in each partition
+        chains = θ.rows // self.processes
+        # find the first chain of this partition
+        start = wid * chains
+        # make views
+        θ = θ.view(start=(start, 0), shape=(chains, θ.columns))
+        likelihoods = tuple(
+            vector.view(start=start, shape=chains) for vector in (prior, data, posterior))
+        # and build the step
+        return self.CoolingStep(
+            beta=beta, theta=θ, likelihoods=likelihoods, sigma=self.sigmas[sigma])
+
+
+    def serve(self, annealer, wid, channel):
+        """
+        The body of worker {wid}: carry out requests that arrive through {channel}
+        """
+        # get the random number generator
+        rng = annealer.model.rng
+        # make a worker dependent seed
+        rng.rng.seed(seed=rng.seed + 29*(wid+1) + 1)
+        # the monitors live in the parent, so my view of the annealer has a silent dispatcher
+        view = Partition(annealer=annealer, dispatcher=Notifier())
+        # get the sampler
+        sampler = annealer.sampler
+
+        # process requests
+        while True:
+            # get one
+            command, *request = channel.recv()
+            # if it's time to go
+            if command == "stop":
+                # bail
+                break
+            # unpack the rest
+            beta, state, sigma, kwds = request
+            # attempt to
+            try:
+                # build my partition
+                step = self.partition(wid=wid, beta=beta, state=state, sigma=sigma)
+                # if the parent wants the likelihoods of my samples
+                if command == "likelihoods":
+                    # compute them
+                    annealer.model.likelihoods(annealer=view, step=step)
+                    # nothing to report
+                    reply = None
+                # if the parent wants me to walk my chains
+                elif command == "walk":
+                    # use the current covariance scaling
+                    sampler.scaling = kwds["scaling"]
+                    # and the structure of the covariance, if there is any
+                    rows = kwds["structure"]
+                    if rows:
+                        # get it
+                        structure = self.shared.view(
+                            start=(0,0), shape=(rows, self.shared.columns))
+                        # and describe the covariance of my partition with it
+                        annealer.scheduler.covariance.adopt(sigma=step.sigma, shared=structure)
+                    # walk
+                    stats = sampler.samplePosterior(annealer=view, step=step)
+                    # and report the statistics
+                    reply = stats, sampler.length
+                # anything else
+                else:
+                    # is a bug
+                    raise NotImplementedError(f"unknown request '{command}'")
+            # if anything goes wrong
+            except Exception as error:
+                # send the exception to the parent
+                reply = error
+            # send the reply
+            channel.send(reply)
+
+        # all done
+        return
+
+
+    # private data
+    processes = 1     # the number of worker processes
+    pool = ()         # the worker processes
+    channels = ()     # my ends of the pipes to the workers
+    segments = ()     # the shared memory segments
+    states = ()       # the sample sets and their likelihoods, in shared memory
+    sigmas = ()       # the parameter covariances, in shared memory
+    shared = None     # the structure of the covariance, in shared memory
+
+
+# end of file
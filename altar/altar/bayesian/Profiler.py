@@ -45,6 +45,16 @@ class Profiler(altar.component,
         super().__init__(**kwds)
         # the counter of beta steps
         self.beta = 0
+        # the length of the chain walk at each beta step
+        self.lengths = []
+        # the effective sample size at each beta step
+        self.ess = []
+        # and the number of steps that skipped resampling
+        self.skipped = 0
+        # the number of iterations of the δβ solver at each beta step
+        self.iterations = []
+        # and the chain counts of the tasks after each load balancing decision
+        self.balances = []
         # all done
         return
 
@@ -246,6 +256,41 @@ class Profiler(altar.component,
         """
         # grab the timer and stop it
         self.pyre_executive.newTimer(name="altar.profiler.resample").stop()
+        # get the scheduler
+        scheduler = controller.scheduler
+        # if it tracks the effective sample size
+        if hasattr(scheduler, "ess"):
+            # record it
+            self.ess.append(scheduler.ess)
+            # and whether resampling was skipped
+            self.skipped += 0 if scheduler.resampled else 1
+        # if its solver counts its iterations
+        solver = getattr(scheduler, "solver", None)
+        if hasattr(solver, "iterations"):
+            # record them
+            self.iterations.append(solver.iterations)
+        # all done
+        return
+
+
+    def balanceStart(self, controller, **kwds):
+        """
+        Handler invoked before the chains get re-weighted across tasks
+        """
+        # start the timer
+        self.pyre_executive.newTimer(name="altar.profiler.balance").start()
+        # all done
+        return
+
+
+    def balanceFinish(self, controller, **kwds):
+        """
+        Handler invoked after the chains get re-weighted across tasks
+        """
+        # grab the timer and stop it
+        self.pyre_executive.newTimer(name="altar.profiler.balance").stop()
+        # record the chain counts of the tasks
+        self.balances.append((self.beta,) + tuple(controller.worker.counts))
         # all done
         return
 
@@ -256,6 +301,8 @@ class Profiler(altar.component,
         """
         # grab the timer and stop it
         self.pyre_executive.newTimer(name="altar.profiler.walk").stop()
+        # record the length of the walk
+        self.lengths.append(controller.sampler.length)
         # all done
         return
 
@@ -320,6 +367,7 @@ class Profiler(altar.component,
             "posterior",
             "accept",
             "resample",
+            "balance",
         ]
         # convert it into a list of the associated timers
         timers = [
@@ -348,6 +396,17 @@ class Profiler(altar.component,
             writer.writerow(("parameters", parameters))
             writer.writerow(("chains", chains))
             writer.writerow(("steps", steps))
+            # the total number of chain steps actually taken, and their distribution over β
+            writer.writerow(("chain steps", sum(self.lengths)))
+            writer.writerow(("chain lengths",) + tuple(self.lengths))
+            # the effective sample sizes, and how many resampling steps were skipped
+            writer.writerow(("ess",) + tuple(self.ess))
+            writer.writerow(("skipped resamples", self.skipped))
+            # the work done by the δβ solver
+            writer.writerow(("solver iterations",) + tuple(self.iterations))
+            # the chain counts of the tasks, at every beta step that rebalanced them
+            for balance in self.balances:
+                writer.writerow(("chain counts",) + balance)
 
             # persist the timings
             writer.writerow(("timings",))
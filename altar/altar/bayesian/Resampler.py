@@ -0,0 +1,51 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+
+
+# the resampler protocol
+class Resampler(altar.protocol, family="altar.bayesian.resamplers"):
+    """
+    The protocol that all strategies for building the sample multiplicities must implement
+    """
+
+
+    # required behavior
+    @altar.provides
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+
+
+    @altar.provides
+    def multiplicities(self, w, multiplicities):
+        """
+        Fill {multiplicities} with the number of copies of each sample in the next sample set,
+        given the normalized weights {w}
+        """
+
+
+    # framework hooks
+    @classmethod
+    def pyre_default(cls, **kwds):
+        """
+        Provide a default implementation
+        """
+        # by default, use multinomial resampling
+        from .Multinomial import Multinomial
+        # and return it
+        return Multinomial
+
+
+# end of file
@@ -0,0 +1,66 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+# my protocol
+from .Resampler import Resampler as resampler
+
+
+# declaration
+class Residual(altar.component, family="altar.bayesian.resamplers.residual",
+               implements=resampler):
+    """
+    Residual resampling: each sample gets the integer part of its expected number of copies,
+    and the remaining copies are distributed by stratified resampling of the residual weights
+
+    This is O(samples) and guarantees that every sample whose weight exceeds 1/samples survives
+    """
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # get the rng wrapper
+        rng = application.rng.rng
+        # set up the distribution for drawing the positions
+        self.uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+        # all done
+        return self
+
+
+    @altar.export
+    def multiplicities(self, w, multiplicities):
+        """
+        Fill {multiplicities} with the number of copies of each sample in the next sample set,
+        given the normalized weights {w}
+        """
+        # make sure i have room for one variate per sample
+        if self.u is None or self.u.shape != w.shape:
+            # allocate it
+            self.u = altar.vector(shape=w.shape)
+        # fill my vector of uniform variates
+        self.u.random(pdf=self.uniform)
+        # and ask the kernel to do the work
+        altar.libaltar.resample_residual(w.data, self.u.data, multiplicities.data)
+        # all done
+        return multiplicities
+
+
+    # private data
+    uniform = None
+    u = None # the uniform variates
+
+
+# end of file
@@ -39,4 +39,20 @@ class SequentialAnnealing(AnnealingMethod):
         return self
 
 
+    def restart(self, annealer):
+        """
+        Start the annealing process from a checkpoint
+        """
+        # reset my iteration count
+        super().start(annealer=annealer)
+        # retrieve the checkpoint
+        snapshot = self.retrieve(annealer=annealer)
+        # make it my state
+        self.step = self.restore(snapshot=snapshot)
+        # and restore everything else
+        self.resume(annealer=annealer, snapshot=snapshot, state=snapshot.states[0])
+        # all done
+        return self
+
+
 # end of file
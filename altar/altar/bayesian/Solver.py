@@ -41,6 +41,20 @@ class Solver(altar.protocol, family="altar.bayesian.solvers"):
         """
 
 
+    @altar.provides
+    def state(self):
+        """
+        Return the state that i carry from one β step to the next, so it can be checkpointed
+        """
+
+
+    @altar.provides
+    def restore(self, state):
+        """
+        Pick up the {state} saved by a checkpoint
+        """
+
+
     # framework hooks
     @classmethod
     def pyre_default(cls, **kwds):
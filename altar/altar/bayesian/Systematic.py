@@ -0,0 +1,61 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# get the package
+import altar
+# my protocol
+from .Resampler import Resampler as resampler
+
+
+# declaration
+class Systematic(altar.component, family="altar.bayesian.resamplers.systematic",
+                 implements=resampler):
+    """
+    Systematic resampling: a single uniform variate offsets a regular grid of positions in [0,1)
+
+    This is O(samples) and has the lowest variance of the supported schemes, but the new
+    samples are correlated through the common offset
+    """
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me and my parts given an {application} context
+        """
+        # get the rng wrapper
+        rng = application.rng.rng
+        # set up the distribution for drawing the positions
+        self.uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+        # all done
+        return self
+
+
+    @altar.export
+    def multiplicities(self, w, multiplicities):
+        """
+        Fill {multiplicities} with the number of copies of each sample in the next sample set,
+        given the normalized weights {w}
+        """
+        # draw the offset of the grid
+        u = self.uniform.sample()
+        # and ask the kernel to do the work
+        altar.libaltar.resample_systematic(w.data, u, multiplicities.data)
+        # all done
+        return multiplicities
+
+
+    # private data
+    uniform = None
+
+
+# end of file
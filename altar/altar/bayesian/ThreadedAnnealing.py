@@ -9,15 +9,237 @@
 #
 
 
+# externals
+import concurrent.futures
+# the framework
+import altar
 # superclass
 from .AnnealingMethod import AnnealingMethod
+# the event dispatcher
+from .Notifier import Notifier
 
 
 # declaration
 class ThreadedAnnealing(AnnealingMethod):
     """
     Annealing method that uses threads on the local machine
+
+    The chains of my cooling step are partitioned into row views, one per thread, and each
+    thread walks its partition with its own copy of the sampler, random number generator and
+    workspace. The python bookkeeping is serialized by the interpreter lock, but the sampler
+    kernels and the forward models of the {fast} strategies release it, so the expensive parts
+    of the walks overlap. Models must be able to compute the likelihoods of different sample
+    sets concurrently
     """
 
 
+    # public data
+    wid = 0     # my worker id
+    workers = 1 # the number of threads i manage
+
+
+    # interface
+    def start(self, annealer):
+        """
+        Start the annealing process
+        """
+        # chain up
+        super().start(annealer=annealer)
+        # get the model
+        model = annealer.model
+        # each of my threads gets a full set of chains
+        samples = self.threads * model.job.chains
+        # build a cooling step to hold the state of the problem
+        step = self.CoolingStep.alloc(samples=samples, parameters=model.parameters)
+        # ask the model to initialize it
+        model.initializeSample(step=step)
+        # and attach it
+        self.step = step
+
+        # build the annealing methods of my threads
+        self.walkers = [self.worker() for thread in range(self.threads)]
+        # assign them worker ids
+        for thread, walker in enumerate(self.walkers):
+            # that are unique across all my peers
+            walker.wid = self.wid * self.threads + thread
+
+        # get the random number generator
+        rng = model.rng
+        # use it to seed the generators of my threads, so that the runs are reproducible
+        uniform = altar.pdf.uniform(support=(0,1), rng=rng.rng)
+        # make one for each thread
+        self.rngs = [altar.rng(algorithm=rng.algorithm) for thread in range(self.threads)]
+        # and seed them
+        for generator in self.rngs:
+            generator.seed(seed=int(uniform.sample() * 2**31))
+
+        # the monitors are not prepared to field events from several threads at once, so my
+        # threads get a view of the annealer with a dispatcher that has no observers
+        self.view = Partition(annealer=annealer, dispatcher=Notifier())
+        # partition my state
+        self.partition()
+        # compute the likelihoods of the partitions concurrently
+        self.distribute(self.likelihoods, model=model)
+
+        # all done
+        return self
+
+
+    def walk(self, annealer):
+        """
+        Explore configuration space by walking the Markov chains
+        """
+        # get the sampler
+        sampler = annealer.sampler
+        # and the dispatcher
+        dispatcher = annealer.dispatcher
+
+        # notify we have started sampling the posterior
+        dispatcher.notify(event=dispatcher.samplePosteriorStart, controller=annealer)
+        # the partitions share the sampling pdf, so prepare it once
+        sampler.prepareSamplingPDF(annealer=annealer, step=self.step)
+        # make a copy of the sampler for each thread; keep their workspaces from one step to
+        # the next
+        self.samplers = [
+            sampler.clone(rng=rng, workspace=twin.workspace if twin is not None else None)
+            for rng, twin in zip(self.rngs, self.samplers or [None]*self.threads) ]
+        # partition my state
+        self.partition()
+        # walk the chains
+        stats = self.distribute(self.chains)
+        # record the length of the longest walk
+        sampler.length = max(twin.length for twin in self.samplers)
+        # notify we are done sampling the posterior
+        dispatcher.notify(event=dispatcher.samplePosteriorFinish, controller=annealer)
+
+        # add up the acceptance statistics
+        return tuple(sum(counts) for counts in zip(*stats))
+
+
+    def finish(self, annealer):
+        """
+        Shut down the annealing process
+        """
+        # chain up
+        super().finish(annealer=annealer)
+        # shut down my threads
+        self.pool.shutdown()
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, annealer, threads, worker, **kwds):
+        # chain up
+        super().__init__(annealer=annealer, **kwds)
+        # save the number of threads
+        self.threads = threads
+        # and the factory of their annealing methods
+        self.worker = worker
+        # each one is a chain processor
+        self.workers = threads
+        # build the thread pool
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+        # all done
+        return
+
+
+    # implementation details
+    def partition(self):
+        """
+        Carve my state into row views, one for each thread
+        """
+        # get my state
+        step = self.step
+        # the temperature
+        β = step.beta
+        # the covariance is shared by everybody
+        Σ = step.sigma
+        # the number of chains in each partition; the chains that are left over go to the first
+        # few partitions, since my state may have been resized by a load balancer
+        chains, extra = divmod(step.samples, self.threads)
+        # go through the annealing methods of my threads
+        start = 0
+        for thread, walker in enumerate(self.walkers):
+            # find the size of this partition
+            size = chains + (1 if thread < extra else 0)
+            # and make views of the sample set and its likelihoods
+            θ = step.theta.view(start=(start, 0), shape=(size, step.parameters))
+            prior = step.prior.view(start=start, shape=size)
+            data = step.data.view(start=start, shape=size)
+            posterior = step.posterior.view(start=start, shape=size)
+            # use them to build a step
+            walker.step = self.CoolingStep(
+                beta=β, theta=θ, likelihoods=(prior, data, posterior), sigma=Σ)
+            # and move on to the next partition
+            start += size
+        # all done
+        return self
+
+
+    def distribute(self, task, **kwds):
+        """
+        Invoke {task} on each partition of my state, one per thread, and collect the results
+        """
+        # launch
+        futures = [
+            self.pool.submit(task, thread=thread, **kwds) for thread in range(self.threads) ]
+        # wait for everybody and return the results, in order
+        return [future.result() for future in futures]
+
+
+    def likelihoods(self, thread, model):
+        """
+        Compute the likelihoods of the samples in the partition of {thread}
+        """
+        # ask the model
+        model.likelihoods(annealer=self.view, step=self.walkers[thread].step)
+        # all done
+        return
+
+
+    def chains(self, thread):
+        """
+        Walk the chains in the partition of {thread}
+        """
+        # get the sampler of this thread
+        sampler = self.samplers[thread]
+        # and its partition
+        step = self.walkers[thread].step
+        # make sure the workspace matches the partition
+        sampler.prepareWorkspace(step=step)
+        # walk and return the acceptance statistics
+        return sampler.walkChains(annealer=self.view, step=step)
+
+
+    # private data
+    threads = 1       # the number of threads
+    worker = None     # the factory of the annealing methods of my threads
+    walkers = ()      # the annealing methods of my threads; their steps are my partitions
+    samplers = None   # the copies of the sampler used by my threads
+    rngs = ()         # the random number generators of my threads
+    view = None       # the view of the annealer seen by my threads
+    pool = None       # the thread pool
+
+
+# the view of the annealer seen by the threads
+class Partition:
+    """
+    The parts of the annealer needed by the threads that walk partitions of the chains
+    """
+
+
+    # meta-methods
+    def __init__(self, annealer, dispatcher, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # borrow the model and the scheduler
+        self.model = annealer.model
+        self.scheduler = annealer.scheduler
+        # and use the given dispatcher
+        self.dispatcher = dispatcher
+        # all done
+        return
+
+
 # end of file
@@ -0,0 +1,189 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# the package
+import altar
+# the state of the candidate samples
+from .CoolingStep import CoolingStep
+
+
+# declaration
+class Workspace:
+    """
+    The storage used by the Metropolis sampler while advancing its Markov chains
+
+    Everything is allocated once per β step and reused by every link of the chains, so that
+    walking the chains does not allocate any new {gsl} storage
+    """
+
+
+    # public data
+    samples = 0       # the number of chains
+    parameters = 0    # the number of model parameters
+
+    candidate = None  # the candidate state, a {CoolingStep} with the proposed samples
+    rejects = None    # the mask of candidates rejected by the model
+    dice = None       # the random numbers for the Metropolis acceptance test
+    dense = None      # storage for the candidates that survive model verification
+
+    # for samplers that use the gradient of the posterior; allocated on demand
+    gradient = None   # the gradients at the current samples
+    cgradient = None  # the gradients at the candidates
+    scratch = None    # a (samples x parameters) temporary
+    bias = None       # the correction to the acceptance ratio for asymmetric proposals
+
+    # for samplers that track which candidates get accepted; allocated on demand
+    moves = None      # the mask of accepted candidates
+    distances = None  # the weighted squared distances of the candidates from the samples
+
+    # for proposals with a low rank covariance; allocated on demand
+    coefficients = None # the random coefficients of the low rank part of the displacements
+
+
+    # interface
+    def displace(self, theta, sigma_chol, pdf):
+        """
+        Fill the candidate sample set with random displacements of {theta} drawn from a
+        distribution with zero mean and covariance {sigma_chol} times its transpose
+        """
+        # get the candidate sample set
+        cθ = self.candidate.theta
+        # fill it with random numbers; the samples are its rows, so the displacements are
+        # generated directly in the layout we need
+        cθ.random(pdf=pdf)
+        # multiply each row from the right by the transpose of the decomposed covariance
+        altar.blas.dtrmm(
+            sigma_chol.sideRight, sigma_chol.lowerTriangular,
+            sigma_chol.opTrans, sigma_chol.nonUnitDiagonal,
+            1, sigma_chol, cθ)
+        # offset it by the original sample
+        cθ += theta
+        # and return it
+        return cθ
+
+
+    def reset(self):
+        """
+        Prepare the candidate state for a new link of the chains
+        """
+        # get the candidate
+        candidate = self.candidate
+        # clear its likelihoods
+        candidate.prior.zero()
+        candidate.data.zero()
+        candidate.posterior.zero()
+        # and its covariance
+        candidate.sigma.zero()
+        # and the mask of rejected samples
+        self.rejects.zero()
+        # all done
+        return candidate
+
+
+    def compact(self, survivors):
+        """
+        Build a step with the first {survivors} slots of my dense storage
+        """
+        # get my dense storage
+        dense = self.dense
+        # make views of the right shape
+        θ = dense.theta.view(start=(0,0), shape=(survivors, self.parameters))
+        prior = dense.prior.view(start=0, shape=survivors)
+        data = dense.data.view(start=0, shape=survivors)
+        posterior = dense.posterior.view(start=0, shape=survivors)
+        # and use them to build a step
+        return CoolingStep(beta=self.candidate.beta, theta=θ,
+                           likelihoods=(prior, data, posterior), sigma=self.candidate.sigma)
+
+
+    def enableMoves(self):
+        """
+        Allocate the mask that records which candidates get accepted
+        """
+        # if it's not already there
+        if self.moves is None:
+            # allocate it
+            self.moves = altar.vector(shape=self.samples).zero()
+        # all done
+        return self
+
+
+    def enableJumps(self):
+        """
+        Allocate the storage needed to measure how far the accepted candidates moved
+        """
+        # if it's not already there
+        if self.distances is None:
+            # allocate it
+            self.distances = altar.vector(shape=self.samples).zero()
+        # and the mask of accepted candidates
+        return self.enableMoves()
+
+
+    def enableCoefficients(self, rank):
+        """
+        Allocate room for the random coefficients of displacements along {rank} directions
+        """
+        # if it's not already there, or it has the wrong shape
+        if self.coefficients is None or self.coefficients.columns != rank:
+            # allocate it
+            self.coefficients = altar.matrix(shape=(self.samples, rank)).zero()
+        # all done
+        return self
+
+
+    def enableGradients(self):
+        """
+        Allocate the storage needed by samplers that use gradients of the posterior
+        """
+        # if it's already there
+        if self.gradient is not None:
+            # nothing to do
+            return self
+        # unpack my shape
+        shape = self.samples, self.parameters
+        # allocate the matrices
+        self.gradient = altar.matrix(shape=shape).zero()
+        self.cgradient = altar.matrix(shape=shape).zero()
+        self.scratch = altar.matrix(shape=shape).zero()
+        # and the vectors
+        self.bias = altar.vector(shape=self.samples).zero()
+        # and the mask of accepted candidates
+        self.enableMoves()
+        # all done
+        return self
+
+
+    # meta-methods
+    def __init__(self, beta, samples, parameters, **kwds):
+        # chain up
+        super().__init__(**kwds)
+
+        # record the geometry
+        self.samples = samples
+        self.parameters = parameters
+
+        # allocate the candidate state
+        self.candidate = CoolingStep.alloc(samples=samples, parameters=parameters)
+        # at the current temperature
+        self.candidate.beta = beta
+        # the mask of samples rejected due to model constraint violations
+        self.rejects = altar.vector(shape=samples).zero()
+        # the random numbers for the Metropolis acceptance
+        self.dice = altar.vector(shape=samples)
+        # and room for the survivors of the model verification
+        self.dense = CoolingStep.alloc(samples=samples, parameters=parameters)
+
+        # all done
+        return
+
+
+# end of file
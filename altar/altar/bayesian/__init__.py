@@ -16,6 +16,8 @@ from .Controller import Controller as controller
 from .Sampler import Sampler as sampler
 from .Scheduler import Scheduler as scheduler
 from .Solver import Solver as solver
+from .Resampler import Resampler as resampler
+from .Covariance import Covariance as covariance
 
 
 # implementations
@@ -67,6 +69,114 @@ def grid():
     return Grid
 
 
+@altar.foundry(
+    implements=solver,
+    tip="a solver for δβ based on a safeguarded Newton root finder")
+def newton():
+    # grab the factory
+    from .Newton import Newton
+    # attach its docstring
+    __doc__ = Newton.__doc__
+    # and return it
+    return Newton
+
+
+@altar.foundry(
+    implements=resampler,
+    tip="a resampler that draws every new sample independently")
+def multinomial():
+    # grab the factory
+    from .Multinomial import Multinomial
+    # attach its docstring
+    __doc__ = Multinomial.__doc__
+    # and return it
+    return Multinomial
+
+
+@altar.foundry(
+    implements=resampler,
+    tip="a resampler based on a regular grid with a random offset")
+def systematic():
+    # grab the factory
+    from .Systematic import Systematic
+    # attach its docstring
+    __doc__ = Systematic.__doc__
+    # and return it
+    return Systematic
+
+
+@altar.foundry(
+    implements=resampler,
+    tip="a resampler that draws one position per stratum")
+def stratified():
+    # grab the factory
+    from .Stratified import Stratified
+    # attach its docstring
+    __doc__ = Stratified.__doc__
+    # and return it
+    return Stratified
+
+
+@altar.foundry(
+    implements=resampler,
+    tip="a resampler that keeps the integer part of the expected counts")
+def residual():
+    # grab the factory
+    from .Residual import Residual
+    # attach its docstring
+    __doc__ = Residual.__doc__
+    # and return it
+    return Residual
+
+
+@altar.foundry(
+    implements=covariance,
+    tip="the full parameter covariance matrix")
+def dense():
+    # grab the factory
+    from .Dense import Dense
+    # attach its docstring
+    __doc__ = Dense.__doc__
+    # and return it
+    return Dense
+
+
+@altar.foundry(
+    implements=covariance,
+    tip="a parameter covariance without correlations")
+def diagonal():
+    # grab the factory
+    from .Diagonal import Diagonal
+    # attach its docstring
+    __doc__ = Diagonal.__doc__
+    # and return it
+    return Diagonal
+
+
+@altar.foundry(
+    implements=covariance,
+    tip="a block diagonal parameter covariance, one block per parameter set")
+def blocks():
+    # grab the factory
+    from .Blocks import Blocks
+    # attach its docstring
+    __doc__ = Blocks.__doc__
+    # and return it
+    return Blocks
+
+
+@altar.foundry(
+    implements=covariance,
+    tip="a low rank plus diagonal parameter covariance")
+def lowrank():
+    # grab the factory
+    from .LowRank import LowRank
+    # attach its docstring
+    __doc__ = LowRank.__doc__
+    # and return it
+    return LowRank
+
+
 @altar.foundry(
     implements=sampler,
     tip="a Bayesian sampler based on the Metropolis algorithm")
@@ -79,6 +189,18 @@ def metropolis():
     return Metropolis
 
 
+@altar.foundry(
+    implements=sampler,
+    tip="a Bayesian sampler based on the Metropolis adjusted Langevin algorithm")
+def langevin():
+    # grab the factory
+    from .Langevin import Langevin
+    # attach its docstring
+    __doc__ = Langevin.__doc__
+    # and return it
+    return Langevin
+
+
 @altar.foundry(
     implements=altar.simulations.monitor,
     tip="a monitor that times the various simulation phases")
@@ -62,23 +62,56 @@ class Base(altar.component, implements=distribution):
         """
         Fill my portion of {likelihood} with the likelihoods of the samples in {theta}
         """
-        # get my pdf implementation
-        pdf = self.pdf
         # grab the portion of the sample that's mine
         θ = self.restrict(theta=theta)
+        # and compute the log densities of its samples
+        self.logDensity(theta=θ, likelihood=likelihood)
+        # all done
+        return self
+
+
+    @altar.export
+    def logDensity(self, theta, likelihood):
+        """
+        Add the log density of each sample in {theta}, a (samples x parameters) matrix, to the
+        corresponding entry of {likelihood}
+        """
+        # get my pdf implementation
+        pdf = self.pdf
         # find out how may samples there are
-        samples = θ.rows
+        samples = theta.rows
 
         # for each one
         for sample in range(samples):
             # fill the vector with the log likelihoods
             likelihood[sample] += sum(
-                math.log(pdf.density(parameter)) for parameter in θ.getRow(sample))
+                math.log(pdf.density(parameter)) for parameter in theta.getRow(sample))
 
         # all done
         return self
 
 
+    @altar.export
+    def priorLikelihoodGradient(self, theta, gradient):
+        """
+        Add the gradient of the log likelihood of the samples in {theta} to my portion of
+        {gradient}
+        """
+        # being abstract, i don't know what to do here
+        raise NotImplementedError(
+            f"class '{type(self).__name__}' must implement 'priorLikelihoodGradient'")
+
+
+    @altar.export
+    def bounds(self, low, high):
+        """
+        Fill the vectors {low} and {high} with the per-parameter limits of my support
+        """
+        # being abstract, i don't know what to do here
+        raise NotImplementedError(
+            f"class '{type(self).__name__}' must implement 'bounds'")
+
+
     @altar.export
     def verify(self, theta, mask):
         """
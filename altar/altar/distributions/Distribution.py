@@ -49,6 +49,26 @@ class Distribution(altar.protocol, family="altar.distributions"):
         Fill my portion of {prior} with the likelihoods of the samples in {theta}
         """
 
+    @altar.provides
+    def logDensity(self, theta, likelihood):
+        """
+        Add the log density of each sample in {theta}, a (samples x parameters) matrix, to the
+        corresponding entry of {likelihood}
+        """
+
+    @altar.provides
+    def priorLikelihoodGradient(self, theta, gradient):
+        """
+        Add the gradient of the log likelihood of the samples in {theta} to my portion of
+        {gradient}
+        """
+
+    @altar.provides
+    def bounds(self, low, high):
+        """
+        Fill the vectors {low} and {high} with the per-parameter limits of my support
+        """
+
     @altar.provides
     def verify(self, theta, mask):
         """
@@ -41,35 +41,82 @@ class Uniform(base, family="altar.distributions.uniform"):
         return self
 
 
+    @altar.export
+    def logDensity(self, theta, likelihood):
+        """
+        Add the log density of each sample in {theta}, a (samples x parameters) matrix, to the
+        corresponding entry of {likelihood}
+        """
+        # unpack my support
+        low, high = self.support
+        # and ask the kernel to do the work
+        altar.libaltar.uniform_logpdf(low, high, theta.data, likelihood.data)
+        # all done
+        return self
+
+
+    @altar.export
+    def priorLikelihoodGradient(self, theta, gradient):
+        """
+        Add the gradient of the log likelihood of the samples in {theta} to my portion of
+        {gradient}
+        """
+        # my density is constant inside my support, so there is nothing to add
+        return self
+
+
     @altar.export
     def verify(self, theta, mask):
         """
         Check whether my portion of the samples in {theta} are consistent with my constraints, and
         update {mask}, a vector with zeroes for valid samples and non-zero for invalid ones
         """
-        # unpack my support
-        low, high = self.support
         # grab the portion of the sample that's mine
         θ = self.restrict(theta=theta)
-
-        # find out how many samples in the set
-        samples = θ.rows
-        # and how many parameters belong to me
-        parameters = θ.columns
-
-        # go through the samples in θ
-        for sample in range(samples):
-            # and the parameters in this sample
-            for parameter in range(parameters):
-                # if the parameter lies outside my support
-                if not (low <= θ[sample,parameter] <= high):
-                    # mark the entire sample as invalid
-                    mask[sample] += 1
-                    # and skip checking the rest of the parameters
-                    break
-
+        # get the per-parameter limits of my support
+        low, high = self.limits(parameters=θ.columns)
+        # and ask the kernel to check the samples
+        altar.libaltar.uniform_verify(low.data, high.data, θ.data, mask.data)
         # all done; return the rejection map
         return mask
 
 
+    @altar.export
+    def bounds(self, low, high):
+        """
+        Fill the vectors {low} and {high} with the per-parameter limits of my support
+        """
+        # unpack my support
+        lo, hi = self.support
+        # and spread it
+        low.fill(lo)
+        high.fill(hi)
+        # all done
+        return self
+
+
+    # implementation details
+    def limits(self, parameters):
+        """
+        Build vectors with a copy of my support for each of my {parameters}
+        """
+        # if i have the right ones already
+        if self.support_limits is not None and self.support_limits[0].shape == parameters:
+            # reuse them
+            return self.support_limits
+        # otherwise, allocate
+        low = altar.vector(shape=parameters)
+        high = altar.vector(shape=parameters)
+        # fill
+        self.bounds(low=low, high=high)
+        # save them
+        self.support_limits = low, high
+        # and return them
+        return low, high
+
+
+    # private data
+    support_limits = None # per-parameter copies of my support, for the compiled bounds check
+
+
 # end of file
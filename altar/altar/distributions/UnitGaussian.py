@@ -8,6 +8,8 @@
 # all rights reserved
 #
 
+# externals
+import math
 # get the package
 import altar
 
@@ -36,6 +38,45 @@ class UnitGaussian(base, family="altar.distributions.ugaussian"):
         return self
 
 
+    @altar.export
+    def logDensity(self, theta, likelihood):
+        """
+        Add the log density of each sample in {theta}, a (samples x parameters) matrix, to the
+        corresponding entry of {likelihood}
+        """
+        # ask the kernel to do the work
+        altar.libaltar.gaussian_logpdf(0, 1, theta.data, likelihood.data)
+        # all done
+        return self
+
+
+    @altar.export
+    def priorLikelihoodGradient(self, theta, gradient):
+        """
+        Add the gradient of the log likelihood of the samples in {theta} to my portion of
+        {gradient}
+        """
+        # grab the portions of the sample and the gradient that are mine
+        θ = self.restrict(theta=theta)
+        g = self.restrict(theta=gradient)
+        # and ask the kernel to do the work
+        altar.libaltar.gaussian_gradient(0, 1, θ.data, g.data)
+        # all done
+        return self
+
+
+    @altar.export
+    def bounds(self, low, high):
+        """
+        Fill the vectors {low} and {high} with the per-parameter limits of my support
+        """
+        # my support is the entire real line
+        low.fill(-math.inf)
+        high.fill(math.inf)
+        # all done
+        return self
+
+
     @altar.export
     def verify(self, theta, mask):
         """
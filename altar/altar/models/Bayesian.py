@@ -22,6 +22,11 @@ class Bayesian(altar.component, family="altar.models.bayesian", implements=model
     """
 
 
+    # types
+    from .Inputs import Inputs
+    from .Factorization import Factorization
+
+
     # user configurable state
     offset = altar.properties.int(default=0)
     offset.doc = "the starting point of my state in the overall controller state"
@@ -29,10 +34,15 @@ class Bayesian(altar.component, family="altar.models.bayesian", implements=model
     parameters = altar.properties.int(default=1)
     parameters.doc = "the number of model degrees of freedom"
 
+    cache = altar.properties.str(default="")
+    cache.doc = "the directory for saved data covariance factorizations; leave empty to disable"
+
 
     # public data
     rng = None
     controller = None
+    support = None  # the per-parameter limits of the supports of my priors, if known
+    strategy = None # the engine that computes my data likelihood, for models that have one
 
 
     # protocol obligations
@@ -101,6 +111,66 @@ class Bayesian(altar.component, family="altar.models.bayesian", implements=model
             f"model '{type(self).__name__}' must implement 'dataLikelihood'")
 
 
+    def priorLikelihoodGradient(self, step, gradient):
+        """
+        Add the gradient of the prior log likelihood of each sample in {step.theta} to the
+        corresponding row of {gradient}; required by the gradient based samplers
+        """
+        # i don't know what to do, so...
+        raise NotImplementedError(
+            f"model '{type(self).__name__}' must implement 'priorLikelihoodGradient'")
+
+
+    def dataLikelihoodGradient(self, step, gradient):
+        """
+        Add the gradient of the data log likelihood of each sample in {step.theta} to the
+        corresponding row of {gradient}; required by the gradient based samplers
+        """
+        # i don't know what to do, so...
+        raise NotImplementedError(
+            f"model '{type(self).__name__}' must implement 'dataLikelihoodGradient'")
+
+
+    def blockStart(self, annealer, step):
+        """
+        Notification that the blocked samplers are about to walk the chains in {step}, one
+        parameter block at a time; return {True} if my data likelihood can be updated one block
+        at a time. By default, the question goes to my {strategy}, which opts in by implementing
+        {blockStart}, {blockLikelihood} and {blockAccept}; models without strategies that can
+        update their data likelihood incrementally should override all three
+        """
+        # ask my strategy whether it can update the data likelihood one block at a time
+        start = getattr(self.strategy, "blockStart", None)
+        # if not, every candidate gets the full forward model
+        if start is None: return False
+        # otherwise, let it cache whatever it needs about the samples in {step}
+        return start(model=self, step=step)
+
+
+    def blockLikelihood(self, annealer, step, candidate, offset, count):
+        """
+        Fill {candidate.data} with the data likelihoods of the samples in {candidate.theta},
+        given that they differ from the ones in {step.theta} only in the {count} parameters
+        that start at column {offset}; required by the blocked samplers after {blockStart}
+        """
+        # delegate to my strategy
+        self.strategy.blockLikelihood(
+            model=self, step=step, candidate=candidate, offset=offset, count=count)
+        # all done
+        return self
+
+
+    def blockAccept(self, annealer, step, candidate, moves):
+        """
+        Notification that the {candidate} samples flagged in {moves} were merged into {step};
+        required by the blocked samplers after {blockStart}
+        """
+        # delegate to my strategy
+        self.strategy.blockAccept(model=self, moves=moves)
+        # all done
+        return self
+
+
     @altar.export
     def posteriorLikelihood(self, step):
         """
@@ -156,9 +226,30 @@ class Bayesian(altar.component, family="altar.models.bayesian", implements=model
         Check whether the samples in {step.theta} are consistent with the model requirements and
         update the {mask}, a vector with zeroes for valid samples and non-zero for invalid ones
         """
-        # i don't know what to do, so...
-        raise NotImplementedError(
-            f"model '{type(self).__name__}' must implement 'verify'")
+        # get my parameter sets, if i have any
+        psets = getattr(self, "psets", None)
+        # if i don't
+        if self.support is None and not psets:
+            # i don't know what to do, so...
+            raise NotImplementedError(
+                f"model '{type(self).__name__}' must implement 'verify'")
+
+        # grab the portion of the sample that's mine
+        θ = self.restrict(theta=step.theta)
+        # if i know the support of all my priors
+        if self.support is not None:
+            # unpack it
+            low, high = self.support
+            # and check all my parameter sets at once
+            altar.libaltar.uniform_verify(low.data, high.data, θ.data, mask.data)
+            # all done; return the rejection map
+            return mask
+        # otherwise, go through each parameter set
+        for pset in psets.values():
+            # and ask each one to verify the sample
+            pset.verify(theta=θ, mask=mask)
+        # all done; return the rejection map
+        return mask
 
 
     # notifications
@@ -181,6 +272,52 @@ class Bayesian(altar.component, family="altar.models.bayesian", implements=model
 
 
     # implementation details
+    def loadInput(self, uri, shape):
+        """
+        Load the contents of the input file {uri} into a matrix, if {shape} is a pair, or a
+        vector; binary formats are memory mapped
+        """
+        # ask my loader
+        return self.Inputs.load(uri=uri, shape=shape)
+
+
+    def collectSupport(self):
+        """
+        Assemble the per-parameter limits of the supports of the priors of my parameter sets;
+        return {None} if any of them can't describe its support this way
+        """
+        # allocate room for the limits
+        low = altar.vector(shape=self.parameters)
+        high = altar.vector(shape=self.parameters)
+        # go through my parameter sets
+        for pset in self.psets.values():
+            # attempt to
+            try:
+                # get each one to fill its portion
+                pset.bounds(low=low, high=high)
+            # if this prior doesn't know how
+            except NotImplementedError:
+                # the samples have to be checked one parameter set at a time
+                return None
+        # all done
+        return low, high
+
+
+    def factorCovariance(self, cd):
+        """
+        Compute the Cholesky factor of the inverse of the data covariance {cd} and the log of
+        its determinant; both are reused from my {cache} when an earlier run saved them
+        """
+        # the normalization and the inverse both need the factorization, so hold on to it
+        if self.factorization is None or self.factorization[0] is not cd:
+            # ask my helper
+            self.factorization = (cd,) + self.Factorization.factor(cd=cd, cache=self.cache)
+        # unpack
+        _, chol, lndet = self.factorization
+        # and return
+        return chol, lndet
+
+
     def restrict(self, theta):
         """
         Return my portion of the sample matrix {theta}
@@ -213,5 +350,8 @@ class Bayesian(altar.component, family="altar.models.bayesian", implements=model
     default = None
     firewall = None
 
+    # private data
+    factorization = None # the data covariance and its factorization
+
 
 # end of file
@@ -82,8 +82,38 @@ class Contiguous(altar.component,
         """
         # grab the portion of the sample that's mine
         θ = self.restrict(theta=theta)
+        # delegate; my prior covers exactly my block of parameters
+        self.prior.logDensity(theta=θ, likelihood=priorLLK)
+        # all done
+        return self
+
+
+    @altar.export
+    def priorLikelihoodGradient(self, theta, gradient):
+        """
+        Add the gradient of the log likelihood of the samples in {theta} in my prior distribution
+        to {gradient}
+        """
+        # grab the portions of the sample and the gradient that are mine
+        θ = self.restrict(theta=theta)
+        g = self.restrict(theta=gradient)
+        # delegate
+        self.prior.priorLikelihoodGradient(theta=θ, gradient=g)
+        # all done
+        return self
+
+
+    @altar.export
+    def bounds(self, low, high):
+        """
+        Fill my portion of the vectors {low} and {high} with the limits of the support of my
+        prior distribution
+        """
+        # grab the portions of the vectors that are mine
+        low = low.view(start=self.offset, shape=self.count)
+        high = high.view(start=self.offset, shape=self.count)
         # delegate
-        self.prior.priorLikelihood(theta=θ, likelihood=priorLLK)
+        self.prior.bounds(low=low, high=high)
         # all done
         return self
 
@@ -0,0 +1,184 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import os
+import hashlib
+# the package
+import altar
+# the {.npy} support
+from .Inputs import Inputs
+
+
+# declaration
+class Factorization:
+    """
+    The factorization of a data covariance matrix that the L2 norm needs: the Cholesky factor
+    of its inverse and the log of its determinant
+
+    Both come from a single LU decomposition. When given a cache directory, the results are
+    saved there under a digest of the contents of the matrix, and later runs with the same
+    covariance memory map the Cholesky factor instead of computing it again. The factor is a
+    {.npy} file; the log of the determinant lives in a small text file next to it that is
+    written last, so its presence marks a complete entry
+    """
+
+
+    # interface
+    @classmethod
+    def factor(cls, cd, cache=None):
+        """
+        Compute the Cholesky factor of the inverse of {cd} and the log of its determinant; look
+        in the {cache} directory first, if there is one
+        """
+        # if there is no cache
+        if not cache:
+            # just do the work
+            return cls.compute(cd=cd)
+
+        # normalize the path
+        cache = str(cache)
+        # compute the digest of the matrix
+        key = cls.digest(matrix=cd)
+        # look for an earlier factorization
+        entry = cls.retrieve(cache=cache, key=key, shape=cd.shape)
+        # if it's there
+        if entry is not None:
+            # use it
+            return entry
+
+        # otherwise, do the work
+        chol, lndet = cls.compute(cd=cd)
+        # attempt to
+        try:
+            # save it for the next run
+            cls.store(cache=cache, key=key, chol=chol, lndet=lndet)
+        # if the cache is not writable
+        except OSError:
+            # no big deal
+            pass
+        # all done
+        return chol, lndet
+
+
+    # implementation details
+    @classmethod
+    def compute(cls, cd):
+        """
+        Factor {cd}
+        """
+        # make a copy so we don't destroy the original
+        cd = cd.clone()
+        # perform the LU decomposition
+        lu = altar.lapack.LU_decomposition(cd)
+        # use it to compute the log of the determinant
+        lndet = altar.lapack.LU_lndet(*lu)
+        # invert; this creates a new matrix
+        inverse = altar.lapack.LU_invert(*lu)
+        # compute the Cholesky decomposition of the inverse
+        chol = altar.lapack.cholesky_decomposition(inverse)
+        # and return both
+        return chol, lndet
+
+
+    @classmethod
+    def digest(cls, matrix, rows=1024):
+        """
+        Compute a digest of the shape and the contents of {matrix}, a few {rows} at a time
+        """
+        # unpack the shape
+        height, width = matrix.shape
+        # start the digest with the shape
+        digest = hashlib.sha256(f"{height}x{width}".encode())
+        # make room for a block of rows
+        buffer = bytearray(8 * rows * width)
+        # go through the blocks
+        for start in range(0, height, rows):
+            # the number of rows in this block
+            count = min(rows, height - start)
+            # copy them into the buffer
+            Inputs.view(buffer=buffer, offset=0, shape=(count, width)).copy(
+                matrix.view(start=(start, 0), shape=(count, width)))
+            # and add them to the digest
+            digest.update(memoryview(buffer)[:8*count*width])
+        # all done
+        return digest.hexdigest()
+
+
+    @classmethod
+    def retrieve(cls, cache, key, shape):
+        """
+        Look for the factorization with the given {key} in {cache}
+        """
+        # the locations of the parts
+        factor, determinant = cls.paths(cache=cache, key=key)
+        # attempt to
+        try:
+            # read the log of the determinant
+            with open(determinant, "r") as stream:
+                # which is saved exactly
+                lndet = float.fromhex(stream.read().strip())
+            # and map the factor
+            chol = Inputs.load(uri=factor, shape=shape)
+        # if the entry is missing or damaged
+        except (OSError, ValueError):
+            # there is nothing to reuse
+            return None
+        # all done
+        return chol, lndet
+
+
+    @classmethod
+    def store(cls, cache, key, chol, lndet):
+        """
+        Save the factorization in {cache} under {key}
+        """
+        # make sure the cache exists
+        os.makedirs(cache, exist_ok=True)
+        # the locations of the parts
+        factor, determinant = cls.paths(cache=cache, key=key)
+        # unpack the shape
+        rows, columns = chol.shape
+        # other processes may be doing the same thing, so write to private temporary files
+        suffix = f".{os.getpid()}.tmp"
+
+        # make the factor
+        with open(factor + suffix, "w+b") as stream:
+            # write the header
+            stream.write(Inputs.header(shape=(rows, columns)))
+            # write the data through a buffer that a matrix can borrow
+            buffer = bytearray(8 * rows * columns)
+            Inputs.view(buffer=buffer, offset=0, shape=(rows, columns)).copy(chol)
+            stream.write(buffer)
+        # move it in place
+        os.replace(factor + suffix, factor)
+
+        # save the log of the determinant
+        with open(determinant + suffix, "w") as stream:
+            # exactly
+            stream.write(float(lndet).hex() + "\n")
+        # move it in place; this completes the entry
+        os.replace(determinant + suffix, determinant)
+
+        # all done
+        return
+
+
+    @classmethod
+    def paths(cls, cache, key):
+        """
+        Build the paths to the parts of the cache entry with the given {key}
+        """
+        # the factor and the log of the determinant
+        return os.path.join(cache, f"{key}.npy"), os.path.join(cache, f"{key}.lndet")
+
+
+# end of file
@@ -0,0 +1,261 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import os
+import ast
+import sys
+import mmap
+import struct
+# the package
+import altar
+
+
+# declaration
+class Inputs:
+    """
+    Loaders of the file based model inputs
+
+    The format is deduced from the file extension: {.npy} files, raw files of doubles in the
+    byte order of the machine ({.bin}, {.raw}) and contiguous HDF5 datasets ({.h5}, {.hdf5})
+    are memory mapped into gsl matrices and vectors without copying; anything else is parsed
+    as text. The mappings are private, so models that modify their inputs in place only touch
+    their own copy of the affected pages
+    """
+
+
+    # constants
+    magic = b"\x93NUMPY" # the {.npy} signature
+    preamble = 128 # the size of the {.npy} headers i write
+    # the type of the entries, in the byte order of the machine
+    descr = ("<" if sys.byteorder == "little" else ">") + "f8"
+
+
+    # interface
+    @classmethod
+    def load(cls, uri, shape):
+        """
+        Load the contents of {uri} into a matrix, if {shape} is a pair, or a vector
+        """
+        # normalize the path
+        path = str(uri)
+        # get the extension
+        suffix = os.path.splitext(path)[1].lower()
+        # the number of doubles i expect
+        size = shape[0] * shape[1] if isinstance(shape, (tuple, list)) else shape
+
+        # {.npy} files
+        if suffix == ".npy":
+            # map them past their header
+            return cls.map(path=path, offset=cls.npy(path=path, size=size), shape=shape)
+        # raw files
+        if suffix in (".bin", ".raw"):
+            # make sure the size is right
+            if os.path.getsize(path) != 8 * size:
+                # complain
+                raise ValueError(f"'{path}': expected {size} doubles")
+            # and map them
+            return cls.map(path=path, offset=0, shape=shape)
+        # HDF5 files
+        if suffix in (".h5", ".hdf5"):
+            # need more work
+            return cls.hdf5(path=path, size=size, shape=shape)
+
+        # everything else is text
+        return cls.text(path=path, shape=shape)
+
+
+    @classmethod
+    def convert(cls, source, destination=None):
+        """
+        Convert the text file {source} into a {.npy} file; the shape is deduced from the layout
+        of the text, one row per line, but the loaders only check the number of entries, so
+        files with one entry per line work just as well
+        """
+        # normalize the path
+        source = str(source)
+        # by default, the result lives next to the source
+        destination = destination or os.path.splitext(source)[0] + ".npy"
+
+        # count the rows and the columns
+        rows = columns = 0
+        with open(source, "r") as stream:
+            # go through the lines
+            for line in stream:
+                # split
+                fields = line.split()
+                # skip blank lines
+                if not fields: continue
+                # count
+                rows += 1
+                columns = columns or len(fields)
+        # single columns and single rows are vectors
+        shape = rows * columns if rows == 1 or columns == 1 else (rows, columns)
+        # parse the text
+        block = cls.text(path=source, shape=shape)
+
+        # the number of doubles
+        size = rows * columns
+        # make the destination
+        with open(destination, "w+b") as stream:
+            # write the header
+            stream.write(cls.header(shape=shape if isinstance(shape, tuple) else (shape,)))
+            # make room for the data
+            stream.truncate(cls.preamble + 8 * size)
+            # map it
+            mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_WRITE)
+            # copy the data
+            cls.view(buffer=mapping, offset=cls.preamble, shape=shape).copy(block)
+            # and make sure it reaches the disk
+            mapping.flush()
+
+        # all done
+        return destination
+
+
+    # implementation details
+    @classmethod
+    def text(cls, path, shape):
+        """
+        Parse the text file at {path}
+        """
+        # allocate the matrix or the vector
+        block = altar.matrix(shape=shape) if isinstance(shape, (tuple, list)) else (
+            altar.vector(shape=shape))
+        # load the file contents
+        block.load(path)
+        # and return it
+        return block
+
+
+    @classmethod
+    def map(cls, path, offset, shape):
+        """
+        Map the doubles that start at {offset} bytes in the file at {path}
+        """
+        # open the file
+        with open(path, "rb") as stream:
+            # map it; the copy-on-write mapping survives the file and is writable, as the gsl
+            # objects require
+            mapping = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_COPY)
+        # the gsl object holds on to the mapping
+        return cls.view(buffer=mapping, offset=offset, shape=shape)
+
+
+    @classmethod
+    def view(cls, buffer, offset, shape):
+        """
+        Build a matrix or a vector that borrows its storage from {buffer}
+        """
+        # if it's a matrix
+        if isinstance(shape, (tuple, list)):
+            # unpack
+            rows, columns = shape
+            # build it
+            return altar.matrix(
+                shape=(rows, columns),
+                data=altar.libaltar.buffer_matrix(buffer, offset, rows, columns))
+        # otherwise, it's a vector
+        return altar.vector(
+            shape=shape, data=altar.libaltar.buffer_vector(buffer, offset, shape))
+
+
+    @classmethod
+    def npy(cls, path, size):
+        """
+        Parse the header of the {.npy} file at {path} and return the offset of its data
+        """
+        # open the file
+        with open(path, "rb") as stream:
+            # read the signature and the version
+            magic = stream.read(8)
+            # check it
+            if magic[:6] != cls.magic:
+                # complain
+                raise ValueError(f"'{path}' is not a .npy file")
+            # the length of the header is encoded differently in version 1
+            if magic[6] == 1:
+                length, = struct.unpack("<H", stream.read(2))
+            # and the later versions
+            else:
+                length, = struct.unpack("<I", stream.read(4))
+            # read the header
+            header = ast.literal_eval(stream.read(length).decode("latin1"))
+            # and find out where the data start
+            offset = stream.tell()
+
+        # the data must be doubles in my byte order, in row major order
+        if header["descr"] not in (cls.descr, "=f8") or header["fortran_order"]:
+            # complain
+            raise ValueError(f"'{path}': expected row major doubles of type '{cls.descr}'")
+        # and have the right size
+        count = 1
+        for extent in header["shape"]: count *= extent
+        if count != size:
+            # complain
+            raise ValueError(f"'{path}': expected {size} doubles, found {count}")
+
+        # all done
+        return offset
+
+
+    @classmethod
+    def hdf5(cls, path, size, shape):
+        """
+        Load the dataset in the HDF5 file at {path}
+        """
+        # HDF5 support is optional
+        try:
+            # so attempt to
+            import h5py
+        # if it's not there
+        except ImportError:
+            # complain
+            raise ValueError(f"'{path}': reading HDF5 files requires 'h5py'")
+
+        # open the file
+        with h5py.File(path, "r") as h5:
+            # the dataset is the first one in the file
+            dataset = h5[next(iter(h5))]
+            # make sure it has the right size
+            if dataset.size != size:
+                # complain
+                raise ValueError(f"'{path}': expected {size} doubles, found {dataset.size}")
+            # find out where it lives in the file; chunked datasets don't have an offset
+            offset = dataset.id.get_offset()
+            # if it's contiguous, uncompressed and in my byte order
+            if offset is not None and dataset.dtype.str == cls.descr:
+                # map it
+                return cls.map(path=path, offset=offset, shape=shape)
+            # otherwise, read it
+            data = bytearray(dataset[()].astype(cls.descr).tobytes())
+
+        # and let the gsl object borrow it
+        return cls.view(buffer=data, offset=0, shape=shape)
+
+
+    @classmethod
+    def header(cls, shape):
+        """
+        Build a {.npy} header for an array of doubles with the given {shape}
+        """
+        # the array description
+        description = (
+            f"{{'descr': '{cls.descr}', 'fortran_order': False, 'shape': {tuple(shape)}, }}")
+        # the room left after the signature, the version and the length of the description
+        room = cls.preamble - len(cls.magic) - 4
+        # pad the description with spaces and terminate it with a newline
+        description = description.ljust(room - 1) + "\n"
+        # assemble
+        return cls.magic + b"\x01\x00" + struct.pack("<H", room) + description.encode("latin1")
+
+
+# end of file
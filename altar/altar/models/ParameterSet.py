@@ -50,6 +50,20 @@ class ParameterSet(altar.protocol, family="altar.models.parameters"):
         Fill {priorLLK} with the likelihoods of the samples in {theta} in my prior distribution
         """
 
+    @altar.provides
+    def priorLikelihoodGradient(self, theta, gradient):
+        """
+        Add the gradient of the log likelihood of the samples in {theta} in my prior distribution
+        to {gradient}
+        """
+
+    @altar.provides
+    def bounds(self, low, high):
+        """
+        Fill my portion of the vectors {low} and {high} with the limits of the support of my
+        prior distribution
+        """
+
     @altar.provides
     def verify(self, theta, mask):
         """
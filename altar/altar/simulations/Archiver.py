@@ -32,6 +32,28 @@ class Archiver(altar.protocol, family="altar.simulations.archivers"):
         Record the final state of the simulation
         """
 
+    @altar.provides
+    def due(self, iteration):
+        """
+        Check whether the state at the end of β step {iteration} should be checkpointed
+        """
+
+    @altar.provides
+    def checkpoint(self, step, iteration, scaling, carried, solver, structure, states, counts):
+        """
+        Record the intermediate state of the simulation: the cooling {step} at the end of β step
+        {iteration}, the covariance {scaling} of the sampler, the weights {carried} over by the
+        scheduler, the state of its δβ {solver}, the {structure} of its covariance
+        representation, the {states} of the random number generators and the chain {counts} of
+        the tasks
+        """
+
+    @altar.provides
+    def restore(self):
+        """
+        Retrieve the most recent checkpoint
+        """
+
     # framework hooks
     @classmethod
     def pyre_default(cls, **kwds):
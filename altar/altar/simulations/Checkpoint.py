@@ -0,0 +1,281 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import os
+import struct
+# the package
+import altar
+# my superclass
+from .Recorder import Recorder
+
+
+# an implementation of the archiver protocol
+class Checkpoint(Recorder, family="altar.simulations.archivers.checkpoint"):
+    """
+    Checkpoint saves the complete state of the simulation every few β steps, so that an
+    interrupted run can be resumed; the final state is recorded just like {Recorder} does
+
+    The checkpoint is a single binary file: a fixed header, the chain counts of the tasks, the
+    sample set, its likelihoods, the parameter covariance, the weights carried over by the
+    scheduler, the structure of its covariance representation, and the states of the random
+    number generators of all tasks, in native byte order; the header also holds the state of
+    the δβ solver of the scheduler. It is written to a temporary file that replaces the previous
+    checkpoint only once it is complete, so an interruption never leaves a damaged checkpoint
+    behind
+    """
+
+
+    # user configurable state
+    snapshot = altar.properties.path(default="checkpoint.bin")
+    snapshot.doc = "the path to the file with the most recent checkpoint"
+
+    period = altar.properties.int(default=1)
+    period.doc = "the number of β steps between checkpoints; zero disables checkpointing"
+
+
+    # constants
+    magic = b"ALTARCKP" # the file signature
+    version = 3 # the layout version
+    # the header: signature, version, iteration, samples, parameters, tasks, rng state size,
+    # whether there are carried weights, whether there is a solver state, the number of rows
+    # of the covariance structure, β, the covariance scaling, and the temperature and
+    # temperature increment of the solver
+    header = struct.Struct("=8sQQQQQQQQQdddd")
+
+
+    # protocol obligations
+    @altar.export
+    def due(self, iteration):
+        """
+        Check whether the state at the end of β step {iteration} should be checkpointed
+        """
+        # every {period} steps, unless checkpointing is disabled
+        return self.period > 0 and iteration % self.period == 0
+
+
+    @altar.export
+    def checkpoint(self, step, iteration, scaling, carried, solver, structure, states, counts):
+        """
+        Record the intermediate state of the simulation
+        """
+        # unpack the shape of the problem
+        samples = step.samples
+        parameters = step.parameters
+        # the number of tasks
+        tasks = len(counts)
+        # the size of the random number generator states
+        size = len(states[0])
+        # the state of the solver, if there is one
+        β, δβ = (0, 0) if solver is None else solver
+        # the number of rows of the covariance structure
+        rows = 0 if structure is None else structure.rows
+
+        # lay out the file
+        offsets, total = self.layout(
+            samples=samples, parameters=parameters, tasks=tasks, size=size,
+            carried=carried is not None, rows=rows)
+        # make room
+        buffer = bytearray(total)
+        # fill the header
+        self.header.pack_into(
+            buffer, 0,
+            self.magic, self.version, iteration, samples, parameters, tasks, size,
+            carried is not None, solver is not None, rows, step.beta, scaling, β, δβ)
+        # the chain counts
+        struct.pack_into(f"={tasks}Q", buffer, offsets["counts"], *counts)
+
+        # go through the blocks of doubles
+        for name, block in self.blocks(
+                buffer=buffer, offsets=offsets, samples=samples, parameters=parameters,
+                rows=rows):
+            # the carried weights and the covariance structure are optional
+            source = (
+                carried if name == "carried" else
+                structure if name == "structure" else
+                getattr(step, name))
+            # copy
+            block.copy(source)
+
+        # the random number generator states go last
+        start = offsets["states"]
+        for state in states:
+            # copy
+            buffer[start:start+size] = state
+            # and move on
+            start += size
+
+        # write everything to a temporary file
+        temporary = f"{self.snapshot}.tmp"
+        with open(temporary, "wb") as stream:
+            # write
+            stream.write(buffer)
+            # and make sure it reaches the disk
+            stream.flush()
+            os.fsync(stream.fileno())
+        # then replace the previous checkpoint in one step
+        os.replace(temporary, str(self.snapshot))
+
+        # all done
+        return self
+
+
+    @altar.export
+    def restore(self):
+        """
+        Retrieve the most recent checkpoint
+        """
+        # if there isn't one
+        if not os.path.exists(str(self.snapshot)):
+            # nothing to do
+            return None
+        # otherwise, read it
+        with open(str(self.snapshot), "rb") as stream:
+            # in a mutable buffer, so the matrices can borrow its storage
+            buffer = bytearray(stream.read())
+
+        # unpack the header
+        (magic, version, iteration, samples, parameters, tasks, size, carried, solved, rows,
+         β, scaling, solverβ, solverδβ) = self.header.unpack_from(buffer, 0)
+        # check the signature
+        if magic != self.magic:
+            # complain
+            raise ValueError(f"'{self.snapshot}' is not a checkpoint")
+        # and the layout
+        if version != self.version:
+            # complain
+            raise ValueError(f"'{self.snapshot}' has an unsupported layout, version {version}")
+
+        # lay out the file
+        offsets, total = self.layout(
+            samples=samples, parameters=parameters, tasks=tasks, size=size, carried=carried,
+            rows=rows)
+        # the chain counts
+        counts = struct.unpack_from(f"={tasks}Q", buffer, offsets["counts"])
+
+        # build the snapshot
+        snapshot = Snapshot(
+            beta=β, iteration=iteration, scaling=scaling, counts=counts,
+            solver=(solverβ, solverδβ) if solved else None,
+            # with copies of the blocks of doubles, so the buffer can go away
+            **{
+                name: block.clone()
+                for name, block in self.blocks(
+                    buffer=buffer, offsets=offsets, samples=samples, parameters=parameters,
+                    rows=rows)
+            },
+            # and the random number generator states
+            states=tuple(
+                bytes(buffer[start:start+size])
+                for start in range(offsets["states"], offsets["states"] + tasks*size, size)))
+
+        # all done
+        return snapshot
+
+
+    # implementation details
+    def layout(self, samples, parameters, tasks, size, carried, rows):
+        """
+        Compute the offsets of the parts of a checkpoint, and its total size
+        """
+        # the size of a double
+        double = 8
+        # the names and sizes of the parts, in order
+        parts = [
+            ("counts", tasks * double),
+            ("theta", samples * parameters * double),
+            ("prior", samples * double),
+            ("data", samples * double),
+            ("posterior", samples * double),
+            ("sigma", parameters * parameters * double),
+            ("carried", samples * double if carried else 0),
+            ("structure", rows * parameters * double),
+            ("states", tasks * size),
+        ]
+        # the parts start after the header; all of them are multiples of a double except the
+        # last, so the blocks of doubles are aligned
+        offset = self.header.size
+        # go through the parts
+        offsets = {}
+        for name, length in parts:
+            # record the offset
+            offsets[name] = offset
+            # and move on
+            offset += length
+        # all done
+        return offsets, offset
+
+
+    def blocks(self, buffer, offsets, samples, parameters, rows):
+        """
+        Build the matrices and vectors that borrow their storage from {buffer}
+        """
+        # the sample set
+        yield "theta", altar.matrix(
+            shape=(samples, parameters),
+            data=altar.libaltar.buffer_matrix(buffer, offsets["theta"], samples, parameters))
+        # the likelihoods
+        for name in ("prior", "data", "posterior"):
+            yield name, altar.vector(
+                shape=samples,
+                data=altar.libaltar.buffer_vector(buffer, offsets[name], samples))
+        # the covariance
+        yield "sigma", altar.matrix(
+            shape=(parameters, parameters),
+            data=altar.libaltar.buffer_matrix(buffer, offsets["sigma"], parameters, parameters))
+        # the carried weights, if there are any
+        if offsets["structure"] > offsets["carried"]:
+            yield "carried", altar.vector(
+                shape=samples,
+                data=altar.libaltar.buffer_vector(buffer, offsets["carried"], samples))
+        # and the structure of the covariance, if there is one
+        if rows:
+            yield "structure", altar.matrix(
+                shape=(rows, parameters),
+                data=altar.libaltar.buffer_matrix(buffer, offsets["structure"], rows, parameters))
+        # all done
+        return
+
+
+# the contents of a checkpoint
+class Snapshot:
+    """
+    The state of a simulation retrieved from a checkpoint
+    """
+
+
+    # public data
+    beta = None      # the inverse temperature
+    theta = None     # the sample set
+    prior = None     # the likelihoods of the samples
+    data = None
+    posterior = None
+    sigma = None     # the parameter covariance matrix
+    carried = None   # the weights carried over by the scheduler, if any
+    solver = None    # the temperature and temperature increment of the δβ solver, if any
+    structure = None # the structure of the covariance representation of the scheduler, if any
+    iteration = 0    # the β step at the end of which the checkpoint was taken
+    scaling = None   # the covariance scaling of the sampler
+    states = ()      # the states of the random number generators of the tasks
+    counts = ()      # the chain counts of the tasks
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__()
+        # record the state
+        for name, value in kwds.items(): setattr(self, name, value)
+        # all done
+        return
+
+
+# end of file
@@ -36,6 +36,21 @@ class Job(altar.component, family="altar.simulations.runs.job", implements=run):
     gpus = altar.properties.int(default=0)
     gpus.doc = "the number of gpus per task"
 
+    concurrency = altar.properties.str(default="threads")
+    concurrency.doc = "how the tasks on a host share the chains without mpi: threads or processes"
+    concurrency.validators = altar.constraints.isMember("threads", "processes")
+
+    distributed = altar.properties.bool(default=False)
+    distributed.doc = ("under mpi, keep the sample set distributed across the tasks and drive "
+                       "the scheduler with reductions")
+
+    restart = altar.properties.bool(default=False)
+    restart.doc = "resume the simulation from the most recent checkpoint of the archiver"
+
+    balance = altar.properties.bool(default=False)
+    balance.doc = ("under mpi, re-weight the chains of each cpu task by the measured speed of "
+                   "its walks")
+
     chains = altar.properties.int(default=1)
     chains.doc = "the number of chains per worker"
 
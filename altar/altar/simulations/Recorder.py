@@ -58,4 +58,31 @@ class Recorder(altar.component, family="altar.simulations.archivers.recorder", i
         return self
 
 
+    @altar.export
+    def due(self, iteration):
+        """
+        Check whether the state at the end of β step {iteration} should be checkpointed
+        """
+        # i only record the final state
+        return False
+
+
+    @altar.export
+    def checkpoint(self, step, iteration, scaling, carried, solver, structure, states, counts):
+        """
+        Record the intermediate state of the simulation
+        """
+        # i only record the final state
+        return self
+
+
+    @altar.export
+    def restore(self):
+        """
+        Retrieve the most recent checkpoint
+        """
+        # i don't have any
+        return None
+
+
 # end of file
@@ -256,7 +256,7 @@ class Reporter(altar.component, family="altar.simulations.monitors.reporter", im
         # grab a channel
         channel = controller.info
         # say something
-        channel.log(f"{self.pyre_name}: walkChainsFinish")
+        channel.log(f"{self.pyre_name}: walkChainsFinish: {controller.sampler.length} steps")
         # all done
         return
 
@@ -281,6 +281,18 @@ class Reporter(altar.component, family="altar.simulations.monitors.reporter", im
         channel = controller.info
         # say something
         channel.log(f"{self.pyre_name}: resampleFinish")
+        # get the scheduler
+        scheduler = controller.scheduler
+        # if it tracks the effective sample size
+        if hasattr(scheduler, "ess"):
+            # report it, along with what happened to the samples
+            action = "resampled" if scheduler.resampled else "kept the weighted samples"
+            channel.log(f"{self.pyre_name}: ess={scheduler.ess:.1f}, {action}")
+        # if its solver counts its iterations
+        solver = getattr(scheduler, "solver", None)
+        if hasattr(solver, "iterations"):
+            # report them
+            channel.log(f"{self.pyre_name}: δβ solver: {solver.iterations} iterations")
         # all done
         return
 
@@ -0,0 +1,319 @@
+# -*- python -*-
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+# externals
+import os
+import queue
+import struct
+import zipfile
+import threading
+# the package
+import altar
+# my protocol
+from .Archiver import Archiver as archiver
+# the {.npy} headers
+from ..models.Inputs import Inputs
+
+
+# an implementation of the archiver protocol
+class Stream(altar.component, family="altar.simulations.archivers.stream", implements=archiver):
+    """
+    Stream appends the state of the simulation at every few β steps to a set of binary files
+    in the {.npy} format, as the simulation progresses
+
+    The sample set, its likelihoods, the parameter covariance, β and the COV of the weights
+    are copied out of the cooling step as soon as the archiver sees them, and handed to a
+    background thread that does the writing, so the I/O overlaps with the next chain walk.
+    Without compression, each quantity is a single {.npy} file whose leading dimension grows
+    by one with every archived step, and which can be memory mapped while the run is still in
+    progress; with compression, each archived step adds a set of compressed members to an
+    {.npz} archive
+    """
+
+
+    # user configurable state
+    path = altar.properties.path(default="archive")
+    path.doc = "the directory with the {.npy} files; the {.npz} archive when compressing"
+
+    period = altar.properties.int(default=1)
+    period.doc = "the number of β steps between archived states"
+
+    compression = altar.properties.int(default=0)
+    compression.doc = "the zlib compression level; zero writes uncompressed {.npy} files"
+
+    depth = altar.properties.int(default=2)
+    depth.doc = "the number of β steps that can be waiting for the writer before the run stalls"
+
+
+    # protocol obligations
+    @altar.export
+    def initialize(self, application):
+        """
+        Initialize me given an {application} context
+        """
+        # the scheduler knows the COV of the weights
+        self.scheduler = application.controller.scheduler
+        # all done
+        return self
+
+
+    @altar.export
+    def record(self, step, **kwds):
+        """
+        Record the final state of the calculation
+        """
+        # unless i have archived it already
+        if step.beta != self.beta:
+            # queue it
+            self.append(step=step)
+        # tell the writer there is nothing more to do
+        self.submit(None)
+        # wait for it to finish
+        self.writer.join()
+        # and check whether it ran into trouble
+        self.check()
+        # all done
+        return self
+
+
+    @altar.export
+    def due(self, iteration):
+        """
+        Check whether the state at the end of β step {iteration} should be archived
+        """
+        # every {period} steps
+        return self.period > 0 and iteration % self.period == 0
+
+
+    @altar.export
+    def checkpoint(self, step, iteration, scaling, carried, solver, structure, states, counts):
+        """
+        Archive the state of the simulation at the end of a β step
+        """
+        # only the cooling step is of interest
+        self.append(step=step)
+        # all done
+        return self
+
+
+    @altar.export
+    def restore(self):
+        """
+        Retrieve the most recent checkpoint
+        """
+        # my archives can't be used to restart a simulation
+        return None
+
+
+    # meta-methods
+    def __init__(self, **kwds):
+        # chain up
+        super().__init__(**kwds)
+        # the open {.npy} files, and the number of entries in each one
+        self.files = {}
+        self.entries = {}
+        # the number of archived steps
+        self.steps = 0
+        # all done
+        return
+
+
+    # implementation details
+    def append(self, step):
+        """
+        Capture the state in {step} and hand it to the writer
+        """
+        # unpack the shape
+        samples = step.samples
+        parameters = step.parameters
+        # copy the parts of the step; they are overwritten by the next β step, so this must
+        # happen before the writer gets them
+        parts = [
+            ("theta", (samples, parameters), self.capture(block=step.theta)),
+            ("prior", (samples,), self.capture(block=step.prior)),
+            ("data", (samples,), self.capture(block=step.data)),
+            ("posterior", (samples,), self.capture(block=step.posterior)),
+            ("sigma", (parameters, parameters), self.capture(block=step.sigma)),
+            ("beta", (), struct.pack("=d", step.beta)),
+            ("cov", (), struct.pack("=d", getattr(self.scheduler, "cov", float("nan")))),
+        ]
+        # remember the temperature, so the final state doesn't get archived twice
+        self.beta = step.beta
+        # hand the parts to the writer
+        self.submit((self.steps, parts))
+        # and count the step
+        self.steps += 1
+        # all done
+        return self
+
+
+    def capture(self, block):
+        """
+        Copy the matrix or vector {block} into a new buffer
+        """
+        # if it's a matrix
+        if isinstance(block.shape, tuple):
+            # make room
+            buffer = bytearray(8 * block.rows * block.columns)
+            # and build a matrix that borrows it
+            alias = altar.matrix(
+                shape=block.shape,
+                data=altar.libaltar.buffer_matrix(buffer, 0, block.rows, block.columns))
+        # otherwise
+        else:
+            # make room
+            buffer = bytearray(8 * block.shape)
+            # and build a vector that borrows it
+            alias = altar.vector(
+                shape=block.shape, data=altar.libaltar.buffer_vector(buffer, 0, block.shape))
+        # copy
+        alias.copy(block)
+        # and return the buffer
+        return buffer
+
+
+    def submit(self, job):
+        """
+        Hand {job} to the writer
+        """
+        # if the writer hasn't started yet
+        if self.writer is None:
+            # make a queue that blocks me when the writer falls too far behind
+            self.jobs = queue.Queue(maxsize=max(1, self.depth))
+            # build the writer
+            self.writer = threading.Thread(target=self.write, daemon=True)
+            # and start it
+            self.writer.start()
+        # make sure the writer is still healthy
+        self.check()
+        # queue the job
+        self.jobs.put(job)
+        # all done
+        return self
+
+
+    def check(self):
+        """
+        Raise any exception encountered by the writer
+        """
+        # if there is one
+        if self.failure is not None:
+            # raise it here
+            raise self.failure
+        # all done
+        return self
+
+
+    def write(self):
+        """
+        The body of the writer: save the steps in my queue until told to stop
+        """
+        # attempt to
+        try:
+            # make sure the destination exists
+            if self.compression == 0: os.makedirs(str(self.path), exist_ok=True)
+            # process jobs
+            while True:
+                # get one
+                job = self.jobs.get()
+                # if it's time to stop
+                if job is None:
+                    # bail
+                    break
+                # otherwise, unpack it
+                index, parts = job
+                # and save it
+                if self.compression == 0:
+                    self.extend(parts=parts)
+                else:
+                    self.compress(index=index, parts=parts)
+        # if anything goes wrong
+        except Exception as error:
+            # save the exception so the simulation finds out
+            self.failure = error
+            # and drain the queue so it doesn't block
+            while self.jobs.get() is not None: pass
+        # in any case
+        finally:
+            # close the files
+            for stream in self.files.values(): stream.close()
+        # all done
+        return
+
+
+    def extend(self, parts):
+        """
+        Append {parts} to the {.npy} files, one entry per part
+        """
+        # go through the parts
+        for name, shape, payload in parts:
+            # get the file
+            stream = self.files.get(name)
+            # if it isn't open yet
+            if stream is None:
+                # open it
+                stream = open(os.path.join(str(self.path), f"{name}.npy"), "w+b")
+                # make room for the header
+                stream.write(self.header(shape=(0,) + shape))
+                # and remember it
+                self.files[name] = stream
+                self.entries[name] = 0
+            # append the payload
+            stream.seek(0, os.SEEK_END)
+            stream.write(payload)
+            # count it
+            self.entries[name] += 1
+            # update the header, so the file is always consistent with its contents
+            stream.seek(0)
+            stream.write(self.header(shape=(self.entries[name],) + shape))
+            # and push it out
+            stream.flush()
+        # all done
+        return
+
+
+    def compress(self, index, parts):
+        """
+        Add {parts} to the {.npz} archive as compressed members
+        """
+        # open the archive
+        archive = zipfile.ZipFile(
+            str(self.path), mode="a", compression=zipfile.ZIP_DEFLATED,
+            compresslevel=self.compression)
+        # closing it brings its directory up to date, so it can be read while the run is in
+        # progress
+        with archive:
+            # go through the parts
+            for name, shape, payload in parts:
+                # add each one as a separate member
+                archive.writestr(f"{name}_{index:05}.npy", self.header(shape=shape) + payload)
+        # all done
+        return
+
+
+    def header(self, shape):
+        """
+        Build a {.npy} header for an array of doubles with the given {shape}; it has room for
+        the shape to grow
+        """
+        # the model input loaders know how
+        return Inputs.header(shape=shape)
+
+
+    # private data
+    scheduler = None # the scheduler, for the COV of the weights
+    beta = None      # the temperature of the most recently archived step
+    writer = None    # the writer thread
+    jobs = None      # the queue of steps waiting to be written
+    failure = None   # the exception raised by the writer, if any
+
+
+# end of file
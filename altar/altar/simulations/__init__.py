@@ -50,6 +50,26 @@ def recorder():
     return recorder
 
 
+@altar.foundry(implements=archiver, tip="an archiver that checkpoints the simulation state")
+def checkpoint():
+    # grab the factory
+    from .Checkpoint import Checkpoint as checkpoint
+    # attach its docstring
+    __doc__ = checkpoint.__doc__
+    # and return it
+    return checkpoint
+
+
+@altar.foundry(implements=archiver, tip="an archiver that streams every β step to binary files")
+def stream():
+    # grab the factory
+    from .Stream import Stream as stream
+    # attach its docstring
+    __doc__ = stream.__doc__
+    # and return it
+    return stream
+
+
 @altar.foundry(implements=monitor, tip="simple monitor that uses journal channels")
 def reporter():
     # grab the factory
@@ -17,6 +17,13 @@
 #include "exceptions.h"
 #include "metadata.h"
 #include "dbeta.h"
+#include "scheduler.h"
+#include "covariance.h"
+#include "metropolis.h"
+#include "langevin.h"
+#include "distributions.h"
+#include "buffers.h"
+#include "rng.h"
 
 
 // put everything in my private namespace
@@ -34,8 +41,60 @@ namespace altar {
 
             // annealing schedule
             { cov__name__, cov, METH_VARARGS, cov__doc__},
+            { cov_state__name__, cov_state, METH_VARARGS, cov_state__doc__},
+            { cov_restore__name__, cov_restore, METH_VARARGS, cov_restore__doc__},
             { dbeta_grid__name__, dbeta_grid, METH_VARARGS, dbeta_grid__doc__},
             { dbeta_brent__name__, dbeta_brent, METH_VARARGS, dbeta_brent__doc__},
+            { dbeta_newton__name__, dbeta_newton, METH_VARARGS, dbeta_newton__doc__},
+            { covariance__name__, covariance, METH_VARARGS, covariance__doc__},
+            { comoment__name__, comoment, METH_VARARGS, comoment__doc__},
+            { median__name__, median, METH_VARARGS, median__doc__},
+            { ess__name__, ess, METH_VARARGS, ess__doc__},
+            { reweight__name__, reweight, METH_VARARGS, reweight__doc__},
+            { resample_systematic__name__, resample_systematic, METH_VARARGS,
+              resample_systematic__doc__},
+            { resample_stratified__name__, resample_stratified, METH_VARARGS,
+              resample_stratified__doc__},
+            { resample_residual__name__, resample_residual, METH_VARARGS,
+              resample_residual__doc__},
+            { expand__name__, expand, METH_VARARGS, expand__doc__},
+            { gather__name__, gather, METH_VARARGS, gather__doc__},
+            { gather_likelihoods__name__, gather_likelihoods, METH_VARARGS,
+              gather_likelihoods__doc__},
+
+            // structured parameter covariances
+            { covariance_diagonal__name__, covariance_diagonal, METH_VARARGS,
+              covariance_diagonal__doc__},
+            { displace_diagonal__name__, displace_diagonal, METH_VARARGS,
+              displace_diagonal__doc__},
+            { covariance_lowrank__name__, covariance_lowrank, METH_VARARGS,
+              covariance_lowrank__doc__},
+            { factor_lowrank__name__, factor_lowrank, METH_VARARGS, factor_lowrank__doc__},
+
+            // metropolis sampler kernels
+            { accept__name__, accept, METH_VARARGS, accept__doc__},
+            { restore__name__, restore, METH_VARARGS, restore__doc__},
+            { restore_columns__name__, restore_columns, METH_VARARGS,
+              restore_columns__doc__},
+            { compact__name__, compact, METH_VARARGS, compact__doc__},
+            { scatter__name__, scatter, METH_VARARGS, scatter__doc__},
+            { jumps__name__, jumps, METH_VARARGS, jumps__doc__},
+            { langevin_bias__name__, langevin_bias, METH_VARARGS, langevin_bias__doc__},
+
+            // distributions
+            { uniform_logpdf__name__, uniform_logpdf, METH_VARARGS, uniform_logpdf__doc__},
+            { uniform_verify__name__, uniform_verify, METH_VARARGS, uniform_verify__doc__},
+            { gaussian_logpdf__name__, gaussian_logpdf, METH_VARARGS, gaussian_logpdf__doc__},
+            { gaussian_gradient__name__, gaussian_gradient, METH_VARARGS,
+              gaussian_gradient__doc__},
+
+            // storage borrowed from python buffers
+            { buffer_matrix__name__, buffer_matrix, METH_VARARGS, buffer_matrix__doc__},
+            { buffer_vector__name__, buffer_vector, METH_VARARGS, buffer_vector__doc__},
+
+            // random number generator state
+            { rng_state__name__, rng_state, METH_VARARGS, rng_state__doc__},
+            { rng_restore__name__, rng_restore, METH_VARARGS, rng_restore__doc__},
 
             // sentinel
             {0, 0, 0, 0}
@@ -0,0 +1,185 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <cstdint>
+
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// local includes
+#include "buffers.h"
+#include "capsules.h"
+
+
+// the gsl objects hold on to the buffers that own their storage
+namespace {
+    // matrices
+    struct matrix_t {
+        gsl_matrix matrix; // must be first, so the capsule looks like a plain gsl matrix
+        Py_buffer buffer;  // the buffer that owns the storage
+    };
+
+    // vectors
+    struct vector_t {
+        gsl_vector vector; // must be first, so the capsule looks like a plain gsl vector
+        Py_buffer buffer;  // the buffer that owns the storage
+    };
+
+    // the capsule destructors
+    void freeMatrix(PyObject * capsule) {
+        // get the matrix
+        matrix_t * m = static_cast<matrix_t *>(
+            PyCapsule_GetPointer(capsule, altar::matrix::capsule_t));
+        // release the buffer
+        PyBuffer_Release(&m->buffer);
+        // and the matrix
+        delete m;
+        // all done
+        return;
+    }
+
+    void freeVector(PyObject * capsule) {
+        // get the vector
+        vector_t * v = static_cast<vector_t *>(
+            PyCapsule_GetPointer(capsule, altar::vector::capsule_t));
+        // release the buffer
+        PyBuffer_Release(&v->buffer);
+        // and the vector
+        delete v;
+        // all done
+        return;
+    }
+
+    // acquire a writable buffer and locate a block of {size} doubles at {offset} bytes in it
+    double * borrow(PyObject * object, Py_buffer & buffer, Py_ssize_t offset, size_t size) {
+        // get the buffer
+        if (PyObject_GetBuffer(object, &buffer, PyBUF_CONTIG) != 0) return 0;
+        // make sure the block fits
+        if (offset < 0 ||
+            static_cast<size_t>(buffer.len) < offset + size * sizeof(double)) {
+            // release the buffer
+            PyBuffer_Release(&buffer);
+            // complain
+            PyErr_SetString(PyExc_ValueError, "the buffer is too small");
+            return 0;
+        }
+        // find the start of the block
+        char * start = static_cast<char *>(buffer.buf) + offset;
+        // make sure it is suitably aligned
+        if (reinterpret_cast<std::uintptr_t>(start) % alignof(double) != 0) {
+            // release the buffer
+            PyBuffer_Release(&buffer);
+            // complain
+            PyErr_SetString(PyExc_ValueError, "the block is not aligned");
+            return 0;
+        }
+        // all done
+        return reinterpret_cast<double *>(start);
+    }
+}
+
+
+// buffer_matrix
+const char * const altar::extensions::buffer_matrix__name__ = "buffer_matrix";
+const char * const altar::extensions::buffer_matrix__doc__ =
+    "build a matrix whose storage is a block of a writable buffer, without copying";
+
+PyObject *
+altar::extensions::buffer_matrix(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * buffer;
+    Py_ssize_t offset, rows, columns;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(args, "Onnn:buffer_matrix", &buffer, &offset, &rows, &columns);
+    // if something went wrong
+    if (!status) return 0;
+    // check the shape
+    if (rows < 1 || columns < 1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "buffer_matrix: invalid shape");
+        return 0;
+    }
+
+    // make a matrix
+    matrix_t * m = new matrix_t;
+    // borrow its storage
+    double * data = borrow(buffer, m->buffer, offset, rows * columns);
+    // if that failed
+    if (!data) {
+        // clean up
+        delete m;
+        // and bail
+        return 0;
+    }
+    // describe the layout
+    m->matrix.size1 = rows;
+    m->matrix.size2 = columns;
+    m->matrix.tda = columns;
+    m->matrix.data = data;
+    // the buffer owns the storage
+    m->matrix.block = 0;
+    m->matrix.owner = 0;
+
+    // wrap it up and return it
+    return PyCapsule_New(&m->matrix, altar::matrix::capsule_t, freeMatrix);
+}
+
+
+// buffer_vector
+const char * const altar::extensions::buffer_vector__name__ = "buffer_vector";
+const char * const altar::extensions::buffer_vector__doc__ =
+    "build a vector whose storage is a block of a writable buffer, without copying";
+
+PyObject *
+altar::extensions::buffer_vector(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * buffer;
+    Py_ssize_t offset, size;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(args, "Onn:buffer_vector", &buffer, &offset, &size);
+    // if something went wrong
+    if (!status) return 0;
+    // check the shape
+    if (size < 1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "buffer_vector: invalid shape");
+        return 0;
+    }
+
+    // make a vector
+    vector_t * v = new vector_t;
+    // borrow its storage
+    double * data = borrow(buffer, v->buffer, offset, size);
+    // if that failed
+    if (!data) {
+        // clean up
+        delete v;
+        // and bail
+        return 0;
+    }
+    // describe the layout
+    v->vector.size = size;
+    v->vector.stride = 1;
+    v->vector.data = data;
+    // the buffer owns the storage
+    v->vector.block = 0;
+    v->vector.owner = 0;
+
+    // wrap it up and return it
+    return PyCapsule_New(&v->vector, altar::vector::capsule_t, freeVector);
+}
+
+
+// end of file
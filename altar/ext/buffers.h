@@ -0,0 +1,33 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_buffers_h)
+#define altar_extensions_buffers_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // a matrix whose storage is borrowed from a python buffer
+        extern const char * const buffer_matrix__name__;
+        extern const char * const buffer_matrix__doc__;
+        PyObject * buffer_matrix(PyObject *, PyObject *);
+
+        // a vector whose storage is borrowed from a python buffer
+        extern const char * const buffer_vector__name__;
+        extern const char * const buffer_vector__doc__;
+        PyObject * buffer_vector(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
@@ -10,6 +10,10 @@
 #if !defined(altar_extensions_capsules_h)
 #define altar_extensions_capsules_h
 
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
 // capsules
 namespace altar {
 
@@ -27,6 +31,35 @@ namespace altar {
     namespace matrix {
         const char * const capsule_t = "gsl.matrix";
     }
+
+    // helpers
+    namespace extensions {
+        // extract the gsl vector from a capsule; raise a {TypeError} that mentions {name} if the
+        // capsule is not valid
+        inline gsl_vector * asVector(PyObject * capsule, const char * name) {
+            // bail out if the capsule is not valid
+            if (!PyCapsule_IsValid(capsule, vector::capsule_t)) {
+                // build an error message
+                PyErr_Format(PyExc_TypeError, "invalid vector capsule for %s", name);
+                return 0;
+            }
+            // otherwise, unwrap it
+            return static_cast<gsl_vector *>(PyCapsule_GetPointer(capsule, vector::capsule_t));
+        }
+
+        // extract the gsl matrix from a capsule; raise a {TypeError} that mentions {name} if the
+        // capsule is not valid
+        inline gsl_matrix * asMatrix(PyObject * capsule, const char * name) {
+            // bail out if the capsule is not valid
+            if (!PyCapsule_IsValid(capsule, matrix::capsule_t)) {
+                // build an error message
+                PyErr_Format(PyExc_TypeError, "invalid matrix capsule for %s", name);
+                return 0;
+            }
+            // otherwise, unwrap it
+            return static_cast<gsl_matrix *>(PyCapsule_GetPointer(capsule, matrix::capsule_t));
+        }
+    }
 }
 // local
 
@@ -0,0 +1,249 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <altar/bayesian/covariance.h>
+
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// local includes
+#include "covariance.h"
+#include "capsules.h"
+
+// local names for the capsule helpers
+using altar::extensions::asVector;
+using altar::extensions::asMatrix;
+
+
+// covariance_diagonal
+const char * const altar::extensions::covariance_diagonal__name__ = "covariance_diagonal";
+const char * const altar::extensions::covariance_diagonal__doc__ =
+    "compute the weighted variances of a sample set on the diagonal of the covariance";
+
+PyObject *
+altar::extensions::covariance_diagonal(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * wCapsule;
+    PyObject * thetaCapsule;
+    PyObject * sigmaCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:covariance_diagonal",
+                                  &PyCapsule_Type, &wCapsule,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &sigmaCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_matrix * sigma = asMatrix(sigmaCapsule, "sigma");
+    if (!sigma) return 0;
+
+    // check the geometry
+    const size_t parameters = theta->size2;
+    if (w->size != theta->size1 || sigma->size1 != parameters || sigma->size2 != parameters) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "covariance_diagonal: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    altar::bayesian::covariance::diagonal(w, theta, sigma);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// displace_diagonal
+const char * const altar::extensions::displace_diagonal__name__ = "displace_diagonal";
+const char * const altar::extensions::displace_diagonal__doc__ =
+    "displace a sample set by unit gaussian variates scaled per parameter";
+
+PyObject *
+altar::extensions::displace_diagonal(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * thetaCapsule;
+    PyObject * scaleCapsule;
+    PyObject * candidateCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:displace_diagonal",
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &scaleCapsule,
+                                  &PyCapsule_Type, &candidateCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * scale = asVector(scaleCapsule, "scale");
+    if (!scale) return 0;
+    gsl_matrix * candidate = asMatrix(candidateCapsule, "candidate");
+    if (!candidate) return 0;
+
+    // check the geometry
+    if (scale->size != theta->size2 ||
+        candidate->size1 != theta->size1 || candidate->size2 != theta->size2) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "displace_diagonal: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // displace
+    altar::bayesian::covariance::displace(theta, scale, candidate);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// covariance_lowrank
+const char * const altar::extensions::covariance_lowrank__name__ = "covariance_lowrank";
+const char * const altar::extensions::covariance_lowrank__doc__ =
+    "approximate the weighted covariance of a sample set by a low rank plus diagonal matrix";
+
+PyObject *
+altar::extensions::covariance_lowrank(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * wCapsule;
+    PyObject * thetaCapsule;
+    PyObject * omegaCapsule;
+    PyObject * dCapsule;
+    PyObject * VCapsule;
+    PyObject * sigmaCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!O!O!:covariance_lowrank",
+                                  &PyCapsule_Type, &wCapsule,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &omegaCapsule,
+                                  &PyCapsule_Type, &dCapsule,
+                                  &PyCapsule_Type, &VCapsule,
+                                  &PyCapsule_Type, &sigmaCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_matrix * omega = asMatrix(omegaCapsule, "omega");
+    if (!omega) return 0;
+    gsl_vector * d = asVector(dCapsule, "d");
+    if (!d) return 0;
+    gsl_matrix * V = asMatrix(VCapsule, "V");
+    if (!V) return 0;
+    gsl_matrix * sigma = asMatrix(sigmaCapsule, "sigma");
+    if (!sigma) return 0;
+
+    // check the geometry
+    const size_t parameters = theta->size2;
+    const size_t rank = omega->size2;
+    if (w->size != theta->size1 || omega->size1 != parameters || d->size != parameters ||
+        V->size1 != parameters || V->size2 != rank ||
+        sigma->size1 != parameters || sigma->size2 != parameters) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "covariance_lowrank: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    altar::bayesian::covariance::lowrank(w, theta, omega, d, V, sigma);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// factor_lowrank
+const char * const altar::extensions::factor_lowrank__name__ = "factor_lowrank";
+const char * const altar::extensions::factor_lowrank__doc__ =
+    "recover the low rank plus diagonal factors of an assembled covariance matrix";
+
+PyObject *
+altar::extensions::factor_lowrank(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * sigmaCapsule;
+    PyObject * omegaCapsule;
+    PyObject * dCapsule;
+    PyObject * VCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!:factor_lowrank",
+                                  &PyCapsule_Type, &sigmaCapsule,
+                                  &PyCapsule_Type, &omegaCapsule,
+                                  &PyCapsule_Type, &dCapsule,
+                                  &PyCapsule_Type, &VCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * sigma = asMatrix(sigmaCapsule, "sigma");
+    if (!sigma) return 0;
+    gsl_matrix * omega = asMatrix(omegaCapsule, "omega");
+    if (!omega) return 0;
+    gsl_vector * d = asVector(dCapsule, "d");
+    if (!d) return 0;
+    gsl_matrix * V = asMatrix(VCapsule, "V");
+    if (!V) return 0;
+
+    // check the geometry
+    const size_t parameters = sigma->size1;
+    if (sigma->size2 != parameters || d->size != parameters ||
+        omega->size1 != parameters || omega->size2 > parameters ||
+        V->size1 != parameters || V->size2 != omega->size2) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "factor_lowrank: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // factor
+    altar::bayesian::covariance::lowrank(sigma, omega, d, V);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// end of file
@@ -0,0 +1,43 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_covariance_h)
+#define altar_extensions_covariance_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // the diagonal representation of the parameter covariance
+        extern const char * const covariance_diagonal__name__;
+        extern const char * const covariance_diagonal__doc__;
+        PyObject * covariance_diagonal(PyObject *, PyObject *);
+
+        // displacements with a diagonal covariance
+        extern const char * const displace_diagonal__name__;
+        extern const char * const displace_diagonal__doc__;
+        PyObject * displace_diagonal(PyObject *, PyObject *);
+
+        // the low rank plus diagonal representation, from the samples
+        extern const char * const covariance_lowrank__name__;
+        extern const char * const covariance_lowrank__doc__;
+        PyObject * covariance_lowrank(PyObject *, PyObject *);
+
+        // the low rank plus diagonal representation, from an assembled covariance
+        extern const char * const factor_lowrank__name__;
+        extern const char * const factor_lowrank__doc__;
+        PyObject * factor_lowrank(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
@@ -158,6 +158,66 @@ altar::extensions::dbeta_grid(PyObject *, PyObject * args) {
     return answer;
 }
 
+const char * const altar::extensions::dbeta_newton__name__ = "dbeta_newton";
+const char * const altar::extensions::dbeta_newton__doc__ =
+    "compute the next increment to the annealing temperature by solving for the target COV "
+    "with a safeguarded Newton method";
+
+PyObject *
+altar::extensions::dbeta_newton(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * covCapsule;
+    PyObject * llkCapsule;
+    PyObject * wCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:dbeta_newton",
+                                  &PyCapsule_Type, &covCapsule,
+                                  &PyCapsule_Type, &llkCapsule,
+                                  &PyCapsule_Type, &wCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+    // bail out if the {cov} capsule is not valid
+    if (!PyCapsule_IsValid(covCapsule, altar::extensions::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid vector capsule for cov");
+        return 0;
+    }
+    // bail out if the {llk} capsule is not valid
+    if (!PyCapsule_IsValid(llkCapsule, altar::vector::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid vector capsule for llk");
+        return 0;
+    }
+    // bail out if the {w} capsule is not valid
+    if (!PyCapsule_IsValid(wCapsule, altar::vector::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid vector capsule for w");
+        return 0;
+    }
+
+    // get the {cov}
+    altar::bayesian::COV * cov =
+        static_cast<altar::bayesian::COV *>
+        (PyCapsule_GetPointer(covCapsule, altar::extensions::capsule_t));
+    // get the {w} vector
+    gsl_vector * w =
+        static_cast<gsl_vector *>(PyCapsule_GetPointer(wCapsule, altar::vector::capsule_t));
+    // get the {llk} vector
+    gsl_vector * llk =
+        static_cast<gsl_vector *>(PyCapsule_GetPointer(llkCapsule, altar::vector::capsule_t));
+
+    // update
+    cov->dbeta_newton(llk, w);
+
+    // build a tuple for the result
+    PyObject * answer = PyTuple_New(3);
+    PyTuple_SET_ITEM(answer, 0, PyFloat_FromDouble(cov->beta()));
+    PyTuple_SET_ITEM(answer, 1, PyFloat_FromDouble(cov->cov()));
+    PyTuple_SET_ITEM(answer, 2, PyLong_FromSize_t(cov->iterations()));
+    // all done
+    return answer;
+}
+
 // COV
 const char * const altar::extensions::cov__name__ = "cov";
 const char * const altar::extensions::cov__doc__ =
@@ -199,6 +259,78 @@ altar::extensions::cov(PyObject *, PyObject * args) {
 }
 
 
+// the state of the schedule
+const char * const altar::extensions::cov_state__name__ = "cov_state";
+const char * const altar::extensions::cov_state__doc__ =
+    "get the temperature and the last temperature increment of a COV instance";
+
+PyObject *
+altar::extensions::cov_state(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * covCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(args, "O!:cov_state", &PyCapsule_Type, &covCapsule);
+    // if something went wrong
+    if (!status) return 0;
+    // bail out if the {cov} capsule is not valid
+    if (!PyCapsule_IsValid(covCapsule, altar::extensions::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid capsule for cov");
+        return 0;
+    }
+
+    // get the {cov}
+    altar::bayesian::COV * cov =
+        static_cast<altar::bayesian::COV *>
+        (PyCapsule_GetPointer(covCapsule, altar::extensions::capsule_t));
+
+    // build a tuple for the result
+    PyObject * answer = PyTuple_New(2);
+    PyTuple_SET_ITEM(answer, 0, PyFloat_FromDouble(cov->beta()));
+    PyTuple_SET_ITEM(answer, 1, PyFloat_FromDouble(cov->dbeta()));
+    // all done
+    return answer;
+}
+
+
+const char * const altar::extensions::cov_restore__name__ = "cov_restore";
+const char * const altar::extensions::cov_restore__doc__ =
+    "set the temperature and the last temperature increment of a COV instance";
+
+PyObject *
+altar::extensions::cov_restore(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * covCapsule;
+    double beta;
+    double dbeta;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!dd:cov_restore",
+                                  &PyCapsule_Type, &covCapsule,
+                                  &beta, &dbeta
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+    // bail out if the {cov} capsule is not valid
+    if (!PyCapsule_IsValid(covCapsule, altar::extensions::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid capsule for cov");
+        return 0;
+    }
+
+    // get the {cov}
+    altar::bayesian::COV * cov =
+        static_cast<altar::bayesian::COV *>
+        (PyCapsule_GetPointer(covCapsule, altar::extensions::capsule_t));
+    // restore its state
+    cov->restore(beta, dbeta);
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
 // destructors
 void
 altar::extensions::free(PyObject * capsule)
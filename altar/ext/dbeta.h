@@ -20,6 +20,15 @@ namespace altar {
         extern const char * const cov__doc__;
         PyObject * cov(PyObject *, PyObject *);
 
+        // the state of the schedule
+        extern const char * const cov_state__name__;
+        extern const char * const cov_state__doc__;
+        PyObject * cov_state(PyObject *, PyObject *);
+
+        extern const char * const cov_restore__name__;
+        extern const char * const cov_restore__doc__;
+        PyObject * cov_restore(PyObject *, PyObject *);
+
         // dbeta
         extern const char * const dbeta_brent__name__;
         extern const char * const dbeta_brent__doc__;
@@ -29,6 +38,10 @@ namespace altar {
         extern const char * const dbeta_grid__doc__;
         PyObject * dbeta_grid(PyObject *, PyObject *);
 
+        extern const char * const dbeta_newton__name__;
+        extern const char * const dbeta_newton__doc__;
+        PyObject * dbeta_newton(PyObject *, PyObject *);
+
     } // of namespace extensions
 } // of namespace altar
 
@@ -0,0 +1,207 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <altar/distributions/uniform.h>
+#include <altar/distributions/gaussian.h>
+
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// local includes
+#include "distributions.h"
+#include "capsules.h"
+
+// local names for the capsule helpers
+using altar::extensions::asVector;
+using altar::extensions::asMatrix;
+
+
+// helpers
+namespace altar {
+    namespace extensions {
+        // the signature of the log density kernels
+        typedef void (*logpdf_t)(double, double, const gsl_matrix *, gsl_vector *);
+        // unpack the arguments of a log density kernel and invoke it
+        static PyObject * logpdf(PyObject * args, const char * format, logpdf_t kernel);
+    }
+}
+
+
+// uniform_logpdf
+const char * const altar::extensions::uniform_logpdf__name__ = "uniform_logpdf";
+const char * const altar::extensions::uniform_logpdf__doc__ =
+    "add the log density of each row of a matrix in a uniform distribution to a vector";
+
+PyObject *
+altar::extensions::uniform_logpdf(PyObject *, PyObject * args) {
+    // delegate
+    return logpdf(args, "ddO!O!:uniform_logpdf", altar::distributions::uniform::logpdf);
+}
+
+
+// uniform_verify
+const char * const altar::extensions::uniform_verify__name__ = "uniform_verify";
+const char * const altar::extensions::uniform_verify__doc__ =
+    "flag the rows of a matrix with entries outside of their per-column support";
+
+PyObject *
+altar::extensions::uniform_verify(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * lowCapsule;
+    PyObject * highCapsule;
+    PyObject * thetaCapsule;
+    PyObject * maskCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!:uniform_verify",
+                                  &PyCapsule_Type, &lowCapsule,
+                                  &PyCapsule_Type, &highCapsule,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &maskCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * low = asVector(lowCapsule, "low");
+    if (!low) return 0;
+    gsl_vector * high = asVector(highCapsule, "high");
+    if (!high) return 0;
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * mask = asVector(maskCapsule, "mask");
+    if (!mask) return 0;
+
+    // check the geometry
+    if (low->size != theta->size2 || high->size != theta->size2 || mask->size != theta->size1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "uniform_verify: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // check
+    altar::distributions::uniform::verify(low, high, theta, mask);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// gaussian_logpdf
+const char * const altar::extensions::gaussian_logpdf__name__ = "gaussian_logpdf";
+const char * const altar::extensions::gaussian_logpdf__doc__ =
+    "add the log density of each row of a matrix in a gaussian distribution to a vector";
+
+PyObject *
+altar::extensions::gaussian_logpdf(PyObject *, PyObject * args) {
+    // delegate
+    return logpdf(args, "ddO!O!:gaussian_logpdf", altar::distributions::gaussian::logpdf);
+}
+
+
+// gaussian_gradient
+const char * const altar::extensions::gaussian_gradient__name__ = "gaussian_gradient";
+const char * const altar::extensions::gaussian_gradient__doc__ =
+    "add the gradient of the log density of a gaussian to each row of a matrix";
+
+PyObject *
+altar::extensions::gaussian_gradient(PyObject *, PyObject * args) {
+    // the arguments
+    double mean, sigma;
+    PyObject * thetaCapsule;
+    PyObject * gradientCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "ddO!O!:gaussian_gradient",
+                                  &mean, &sigma,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &gradientCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_matrix * gradient = asMatrix(gradientCapsule, "gradient");
+    if (!gradient) return 0;
+
+    // check the geometry
+    if (gradient->size1 != theta->size1 || gradient->size2 != theta->size2) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "gaussian_gradient: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    altar::distributions::gaussian::gradient(mean, sigma, theta, gradient);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// the shared implementation of the log density bindings
+PyObject *
+altar::extensions::logpdf(PyObject * args, const char * format, logpdf_t kernel) {
+    // the arguments
+    double p0, p1;
+    PyObject * thetaCapsule;
+    PyObject * likelihoodCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, format,
+                                  &p0, &p1,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &likelihoodCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * likelihood = asVector(likelihoodCapsule, "likelihood");
+    if (!likelihood) return 0;
+
+    // check the geometry
+    if (likelihood->size != theta->size1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "logpdf: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    kernel(p0, p1, theta, likelihood);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// end of file
@@ -0,0 +1,43 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_distributions_h)
+#define altar_extensions_distributions_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // the log density of samples of a uniform distribution
+        extern const char * const uniform_logpdf__name__;
+        extern const char * const uniform_logpdf__doc__;
+        PyObject * uniform_logpdf(PyObject *, PyObject *);
+
+        // the bounds check for samples of uniform distributions
+        extern const char * const uniform_verify__name__;
+        extern const char * const uniform_verify__doc__;
+        PyObject * uniform_verify(PyObject *, PyObject *);
+
+        // the log density of samples of a gaussian
+        extern const char * const gaussian_logpdf__name__;
+        extern const char * const gaussian_logpdf__doc__;
+        PyObject * gaussian_logpdf(PyObject *, PyObject *);
+
+        // the gradient of the log density of a gaussian
+        extern const char * const gaussian_gradient__name__;
+        extern const char * const gaussian_gradient__doc__;
+        PyObject * gaussian_gradient(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
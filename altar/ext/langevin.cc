@@ -0,0 +1,95 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <altar/bayesian/langevin.h>
+
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// local includes
+#include "langevin.h"
+#include "capsules.h"
+
+// local names for the capsule helpers
+using altar::extensions::asVector;
+using altar::extensions::asMatrix;
+
+
+// langevin_bias
+const char * const altar::extensions::langevin_bias__name__ = "langevin_bias";
+const char * const altar::extensions::langevin_bias__doc__ =
+    "compute the log of the ratio of the reverse and forward Langevin proposal densities";
+
+PyObject *
+altar::extensions::langevin_bias(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * thetaCapsule;
+    PyObject * gradientCapsule;
+    PyObject * cthetaCapsule;
+    PyObject * cgradientCapsule;
+    PyObject * sigmaCapsule;
+    PyObject * biasCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!O!O!:langevin_bias",
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &gradientCapsule,
+                                  &PyCapsule_Type, &cthetaCapsule,
+                                  &PyCapsule_Type, &cgradientCapsule,
+                                  &PyCapsule_Type, &sigmaCapsule,
+                                  &PyCapsule_Type, &biasCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_matrix * gradient = asMatrix(gradientCapsule, "gradient");
+    if (!gradient) return 0;
+    gsl_matrix * ctheta = asMatrix(cthetaCapsule, "ctheta");
+    if (!ctheta) return 0;
+    gsl_matrix * cgradient = asMatrix(cgradientCapsule, "cgradient");
+    if (!cgradient) return 0;
+    gsl_matrix * sigma_chol = asMatrix(sigmaCapsule, "sigma_chol");
+    if (!sigma_chol) return 0;
+    gsl_vector * bias = asVector(biasCapsule, "bias");
+    if (!bias) return 0;
+
+    // check the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+    if (gradient->size1 != samples || gradient->size2 != parameters ||
+        ctheta->size1 != samples || ctheta->size2 != parameters ||
+        cgradient->size1 != samples || cgradient->size2 != parameters ||
+        sigma_chol->size1 != parameters || sigma_chol->size2 != parameters ||
+        bias->size != samples) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "langevin_bias: incompatible shapes");
+        return 0;
+    }
+
+    // the kernel touches no python state, so let other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    altar::bayesian::langevin::bias(theta, gradient, ctheta, cgradient, sigma_chol, bias);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// end of file
@@ -0,0 +1,28 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_langevin_h)
+#define altar_extensions_langevin_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // the correction to the acceptance ratio of the Langevin proposals
+        extern const char * const langevin_bias__name__;
+        extern const char * const langevin_bias__doc__;
+        PyObject * langevin_bias(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
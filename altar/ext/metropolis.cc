@@ -0,0 +1,394 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <altar/bayesian/metropolis.h>
+
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+#include <pyre/journal.h>
+
+// local includes
+#include "metropolis.h"
+#include "capsules.h"
+
+// local names for the capsule helpers
+using altar::extensions::asVector;
+using altar::extensions::asMatrix;
+
+
+// accept
+const char * const altar::extensions::accept__name__ = "accept";
+const char * const altar::extensions::accept__doc__ =
+    "merge the candidate samples that pass the Metropolis test into the current sample set";
+
+PyObject *
+altar::extensions::accept(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * cthetaCapsule;
+    PyObject * cpriorCapsule;
+    PyObject * cdataCapsule;
+    PyObject * cpostCapsule;
+    PyObject * thetaCapsule;
+    PyObject * priorCapsule;
+    PyObject * dataCapsule;
+    PyObject * postCapsule;
+    PyObject * diceCapsule;
+    PyObject * rejectsCapsule;
+    PyObject * biasCapsule = Py_None;
+    PyObject * movesCapsule = Py_None;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!O!O!O!O!O!O!|OO:accept",
+                                  &PyCapsule_Type, &cthetaCapsule,
+                                  &PyCapsule_Type, &cpriorCapsule,
+                                  &PyCapsule_Type, &cdataCapsule,
+                                  &PyCapsule_Type, &cpostCapsule,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &priorCapsule,
+                                  &PyCapsule_Type, &dataCapsule,
+                                  &PyCapsule_Type, &postCapsule,
+                                  &PyCapsule_Type, &diceCapsule,
+                                  &PyCapsule_Type, &rejectsCapsule,
+                                  &biasCapsule, &movesCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the candidate state
+    gsl_matrix * ctheta = asMatrix(cthetaCapsule, "ctheta");
+    if (!ctheta) return 0;
+    gsl_vector * cprior = asVector(cpriorCapsule, "cprior");
+    if (!cprior) return 0;
+    gsl_vector * cdata = asVector(cdataCapsule, "cdata");
+    if (!cdata) return 0;
+    gsl_vector * cpost = asVector(cpostCapsule, "cpost");
+    if (!cpost) return 0;
+    // the current state
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * prior = asVector(priorCapsule, "prior");
+    if (!prior) return 0;
+    gsl_vector * data = asVector(dataCapsule, "data");
+    if (!data) return 0;
+    gsl_vector * posterior = asVector(postCapsule, "posterior");
+    if (!posterior) return 0;
+    // and the acceptance inputs
+    gsl_vector * dice = asVector(diceCapsule, "dice");
+    if (!dice) return 0;
+    gsl_vector * rejects = asVector(rejectsCapsule, "rejects");
+    if (!rejects) return 0;
+    // the optional correction for asymmetric proposals
+    gsl_vector * bias = 0;
+    if (biasCapsule != Py_None) {
+        bias = asVector(biasCapsule, "bias");
+        if (!bias) return 0;
+    }
+    // and the optional record of the accepted samples
+    gsl_vector * moves = 0;
+    if (movesCapsule != Py_None) {
+        moves = asVector(movesCapsule, "moves");
+        if (!moves) return 0;
+    }
+
+    // check the geometry
+    const size_t samples = theta->size1;
+    if (ctheta->size1 != samples || ctheta->size2 != theta->size2 ||
+        cprior->size != samples || cdata->size != samples || cpost->size != samples ||
+        prior->size != samples || data->size != samples || posterior->size != samples ||
+        dice->size != samples || rejects->size != samples ||
+        (bias && bias->size != samples) || (moves && moves->size != samples)) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "accept: incompatible sample set shapes");
+        return 0;
+    }
+
+    // the counters
+    size_t accepted, rejected, unlikely;
+    // the kernel touches no python state, so let other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
+    // merge
+    altar::bayesian::metropolis::accept(ctheta, cprior, cdata, cpost,
+                                        theta, prior, data, posterior,
+                                        dice, rejects,
+                                        accepted, rejected, unlikely,
+                                        bias, moves);
+    Py_END_ALLOW_THREADS
+
+    // build a tuple for the result
+    PyObject * answer = PyTuple_New(3);
+    PyTuple_SET_ITEM(answer, 0, PyLong_FromSize_t(accepted));
+    PyTuple_SET_ITEM(answer, 1, PyLong_FromSize_t(rejected));
+    PyTuple_SET_ITEM(answer, 2, PyLong_FromSize_t(unlikely));
+    // all done
+    return answer;
+}
+
+
+// restore
+const char * const altar::extensions::restore__name__ = "restore";
+const char * const altar::extensions::restore__doc__ =
+    "overwrite the masked candidate samples with copies of the originals";
+
+PyObject *
+altar::extensions::restore(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * thetaCapsule;
+    PyObject * cthetaCapsule;
+    PyObject * maskCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:restore",
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &cthetaCapsule,
+                                  &PyCapsule_Type, &maskCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_matrix * ctheta = asMatrix(cthetaCapsule, "ctheta");
+    if (!ctheta) return 0;
+    gsl_vector * mask = asVector(maskCapsule, "mask");
+    if (!mask) return 0;
+
+    // check the geometry
+    if (ctheta->size1 != theta->size1 || ctheta->size2 != theta->size2 ||
+        mask->size != theta->size1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "restore: incompatible sample set shapes");
+        return 0;
+    }
+
+    // the number of restored samples
+    size_t restored;
+    // the kernel touches no python state, so let other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
+    // copy
+    restored = altar::bayesian::metropolis::restore(theta, ctheta, mask);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    return PyLong_FromSize_t(restored);
+}
+
+
+// restore_columns
+const char * const altar::extensions::restore_columns__name__ = "restore_columns";
+const char * const altar::extensions::restore_columns__doc__ =
+    "overwrite the masked columns of the destination with copies of the source columns";
+
+PyObject *
+altar::extensions::restore_columns(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * sourceCapsule;
+    PyObject * destCapsule;
+    PyObject * maskCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:restore_columns",
+                                  &PyCapsule_Type, &sourceCapsule,
+                                  &PyCapsule_Type, &destCapsule,
+                                  &PyCapsule_Type, &maskCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * source = asMatrix(sourceCapsule, "source");
+    if (!source) return 0;
+    gsl_matrix * dest = asMatrix(destCapsule, "dest");
+    if (!dest) return 0;
+    gsl_vector * mask = asVector(maskCapsule, "mask");
+    if (!mask) return 0;
+
+    // check the geometry
+    if (dest->size1 != source->size1 || dest->size2 != source->size2 ||
+        mask->size != source->size2) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "restore_columns: incompatible matrix shapes");
+        return 0;
+    }
+
+    // let other threads run while we copy
+    Py_BEGIN_ALLOW_THREADS
+    // copy
+    altar::bayesian::metropolis::restoreColumns(source, dest, mask);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// compact
+const char * const altar::extensions::compact__name__ = "compact";
+const char * const altar::extensions::compact__doc__ =
+    "gather the samples that are not flagged in the mask into a dense sample set";
+
+PyObject *
+altar::extensions::compact(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * thetaCapsule;
+    PyObject * maskCapsule;
+    PyObject * destCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:compact",
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &maskCapsule,
+                                  &PyCapsule_Type, &destCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * mask = asVector(maskCapsule, "mask");
+    if (!mask) return 0;
+    gsl_matrix * dest = asMatrix(destCapsule, "dest");
+    if (!dest) return 0;
+
+    // check the geometry
+    if (mask->size != theta->size1 || dest->size2 != theta->size2 ||
+        dest->size1 != altar::bayesian::metropolis::survivors(mask)) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "compact: incompatible sample set shapes");
+        return 0;
+    }
+
+    // let other threads run while we copy
+    Py_BEGIN_ALLOW_THREADS
+    // gather
+    altar::bayesian::metropolis::compact(theta, mask, dest);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// scatter
+const char * const altar::extensions::scatter__name__ = "scatter";
+const char * const altar::extensions::scatter__doc__ =
+    "spread a dense vector over the slots that are not flagged in the mask";
+
+PyObject *
+altar::extensions::scatter(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * sourceCapsule;
+    PyObject * maskCapsule;
+    PyObject * destCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:scatter",
+                                  &PyCapsule_Type, &sourceCapsule,
+                                  &PyCapsule_Type, &maskCapsule,
+                                  &PyCapsule_Type, &destCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * source = asVector(sourceCapsule, "source");
+    if (!source) return 0;
+    gsl_vector * mask = asVector(maskCapsule, "mask");
+    if (!mask) return 0;
+    gsl_vector * dest = asVector(destCapsule, "dest");
+    if (!dest) return 0;
+
+    // check the geometry
+    if (mask->size != dest->size ||
+        source->size != altar::bayesian::metropolis::survivors(mask)) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "scatter: incompatible vector shapes");
+        return 0;
+    }
+
+    // let other threads run while we copy
+    Py_BEGIN_ALLOW_THREADS
+    // spread
+    altar::bayesian::metropolis::scatter(source, mask, dest);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// jumps
+const char * const altar::extensions::jumps__name__ = "jumps";
+const char * const altar::extensions::jumps__doc__ =
+    "compute the weighted squared distances of the candidates from the current samples";
+
+PyObject *
+altar::extensions::jumps(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * thetaCapsule;
+    PyObject * cthetaCapsule;
+    PyObject * weightsCapsule;
+    PyObject * distancesCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!:jumps",
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &cthetaCapsule,
+                                  &PyCapsule_Type, &weightsCapsule,
+                                  &PyCapsule_Type, &distancesCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_matrix * ctheta = asMatrix(cthetaCapsule, "ctheta");
+    if (!ctheta) return 0;
+    gsl_vector * weights = asVector(weightsCapsule, "weights");
+    if (!weights) return 0;
+    gsl_vector * distances = asVector(distancesCapsule, "distances");
+    if (!distances) return 0;
+
+    // check the geometry
+    if (ctheta->size1 != theta->size1 || ctheta->size2 != theta->size2 ||
+        weights->size != theta->size2 || distances->size != theta->size1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "jumps: incompatible sample set shapes");
+        return 0;
+    }
+
+    // let other threads run while we compute
+    Py_BEGIN_ALLOW_THREADS
+    // measure
+    altar::bayesian::metropolis::jumps(theta, ctheta, weights, distances);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// end of file
@@ -0,0 +1,53 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_metropolis_h)
+#define altar_extensions_metropolis_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // the accept/reject phase of the Metropolis update
+        extern const char * const accept__name__;
+        extern const char * const accept__doc__;
+        PyObject * accept(PyObject *, PyObject *);
+
+        // restore the candidates rejected by the model
+        extern const char * const restore__name__;
+        extern const char * const restore__doc__;
+        PyObject * restore(PyObject *, PyObject *);
+
+        // the same for sample sets stored as columns
+        extern const char * const restore_columns__name__;
+        extern const char * const restore_columns__doc__;
+        PyObject * restore_columns(PyObject *, PyObject *);
+
+        // gather the candidates that survived verification into a dense sample set
+        extern const char * const compact__name__;
+        extern const char * const compact__doc__;
+        PyObject * compact(PyObject *, PyObject *);
+
+        // spread the dense results back over the slots of the survivors
+        extern const char * const scatter__name__;
+        extern const char * const scatter__doc__;
+        PyObject * scatter(PyObject *, PyObject *);
+
+        // the weighted squared distances of the candidates from the current samples
+        extern const char * const jumps__name__;
+        extern const char * const jumps__doc__;
+        PyObject * jumps(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
@@ -0,0 +1,95 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <cstring>
+
+#include <gsl/gsl_rng.h>
+
+#include <pyre/gsl/capsules.h>
+
+// local includes
+#include "rng.h"
+
+
+// rng_state
+const char * const altar::extensions::rng_state__name__ = "rng_state";
+const char * const altar::extensions::rng_state__doc__ =
+    "return the state of a random number generator as raw bytes";
+
+PyObject *
+altar::extensions::rng_state(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * rngCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(args, "O!:rng_state", &PyCapsule_Type, &rngCapsule);
+    // if something went wrong
+    if (!status) return 0;
+
+    // bail out if the rng capsule is not valid
+    if (!PyCapsule_IsValid(rngCapsule, gsl::rng::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid rng capsule");
+        return 0;
+    }
+    // get the rng
+    gsl_rng * rng = static_cast<gsl_rng *>(PyCapsule_GetPointer(rngCapsule, gsl::rng::capsule_t));
+
+    // copy its state into a bytes object and return it
+    return PyBytes_FromStringAndSize(
+        static_cast<const char *>(gsl_rng_state(rng)), gsl_rng_size(rng));
+}
+
+
+// rng_restore
+const char * const altar::extensions::rng_restore__name__ = "rng_restore";
+const char * const altar::extensions::rng_restore__doc__ =
+    "restore the state of a random number generator from raw bytes";
+
+PyObject *
+altar::extensions::rng_restore(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * rngCapsule;
+    const char * state;
+    Py_ssize_t size;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!y#:rng_restore",
+                                  &PyCapsule_Type, &rngCapsule, &state, &size);
+    // if something went wrong
+    if (!status) return 0;
+
+    // bail out if the rng capsule is not valid
+    if (!PyCapsule_IsValid(rngCapsule, gsl::rng::capsule_t)) {
+        PyErr_SetString(PyExc_TypeError, "invalid rng capsule");
+        return 0;
+    }
+    // get the rng
+    gsl_rng * rng = static_cast<gsl_rng *>(PyCapsule_GetPointer(rngCapsule, gsl::rng::capsule_t));
+
+    // the state must come from a generator that uses the same algorithm
+    if (static_cast<size_t>(size) != gsl_rng_size(rng)) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "rng_restore: the state has the wrong size");
+        return 0;
+    }
+    // copy it
+    std::memcpy(gsl_rng_state(rng), state, size);
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// end of file
@@ -0,0 +1,33 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_rng_h)
+#define altar_extensions_rng_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // the state of a random number generator, as raw bytes
+        extern const char * const rng_state__name__;
+        extern const char * const rng_state__doc__;
+        PyObject * rng_state(PyObject *, PyObject *);
+
+        // restore the state of a random number generator from raw bytes
+        extern const char * const rng_restore__name__;
+        extern const char * const rng_restore__doc__;
+        PyObject * rng_restore(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
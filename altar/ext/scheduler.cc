@@ -0,0 +1,545 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+#include <portinfo>
+#include <Python.h>
+
+#include <altar/bayesian/scheduler.h>
+
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// local includes
+#include "scheduler.h"
+#include "capsules.h"
+
+// local names for the capsule helpers
+using altar::extensions::asVector;
+using altar::extensions::asMatrix;
+
+
+// helpers
+// check that every entry of {index} names a valid slot in a container with {size} of them
+static bool
+validIndex(const gsl_vector * index, size_t size) {
+    // go through the entries
+    for (size_t i = 0; i < index->size; ++i) {
+        // get the value
+        double slot = gsl_vector_get(index, i);
+        // check it
+        if (slot < 0 || slot >= size) {
+            // complain
+            return false;
+        }
+    }
+    // all good
+    return true;
+}
+
+
+// covariance
+const char * const altar::extensions::covariance__name__ = "covariance";
+const char * const altar::extensions::covariance__doc__ =
+    "compute the weighted mean and covariance of a sample set";
+
+PyObject *
+altar::extensions::covariance(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * wCapsule;
+    PyObject * thetaCapsule;
+    PyObject * meanCapsule;
+    PyObject * sigmaCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!:covariance",
+                                  &PyCapsule_Type, &wCapsule,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &meanCapsule,
+                                  &PyCapsule_Type, &sigmaCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * mean = asVector(meanCapsule, "mean");
+    if (!mean) return 0;
+    gsl_matrix * sigma = asMatrix(sigmaCapsule, "sigma");
+    if (!sigma) return 0;
+
+    // check the geometry
+    const size_t parameters = theta->size2;
+    if (w->size != theta->size1 || mean->size != parameters ||
+        sigma->size1 != parameters || sigma->size2 != parameters) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "covariance: incompatible shapes");
+        return 0;
+    }
+
+    // the kernel touches no python state, so let other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    altar::bayesian::scheduler::covariance(w, theta, mean, sigma);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// comoment
+const char * const altar::extensions::comoment__name__ = "comoment";
+const char * const altar::extensions::comoment__doc__ =
+    "compute the weighted second moment of a sample set about a given mean";
+
+PyObject *
+altar::extensions::comoment(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * wCapsule;
+    PyObject * thetaCapsule;
+    PyObject * meanCapsule;
+    PyObject * sigmaCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!:comoment",
+                                  &PyCapsule_Type, &wCapsule,
+                                  &PyCapsule_Type, &thetaCapsule,
+                                  &PyCapsule_Type, &meanCapsule,
+                                  &PyCapsule_Type, &sigmaCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+    gsl_matrix * theta = asMatrix(thetaCapsule, "theta");
+    if (!theta) return 0;
+    gsl_vector * mean = asVector(meanCapsule, "mean");
+    if (!mean) return 0;
+    gsl_matrix * sigma = asMatrix(sigmaCapsule, "sigma");
+    if (!sigma) return 0;
+
+    // check the geometry
+    const size_t parameters = theta->size2;
+    if (w->size != theta->size1 || mean->size != parameters ||
+        sigma->size1 != parameters || sigma->size2 != parameters) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "comoment: incompatible shapes");
+        return 0;
+    }
+
+    // the kernel touches no python state, so let other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    altar::bayesian::scheduler::comoment(w, theta, mean, sigma);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// median
+const char * const altar::extensions::median__name__ = "median";
+const char * const altar::extensions::median__doc__ =
+    "compute the median of a vector in linear time, without modifying it";
+
+PyObject *
+altar::extensions::median(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * vCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(args, "O!:median", &PyCapsule_Type, &vCapsule);
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsule
+    gsl_vector * v = asVector(vCapsule, "v");
+    if (!v) return 0;
+
+    // the answer
+    double value;
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // compute
+    value = altar::bayesian::scheduler::median(v);
+    Py_END_ALLOW_THREADS
+
+    // and return it
+    return PyFloat_FromDouble(value);
+}
+
+
+// ess
+const char * const altar::extensions::ess__name__ = "ess";
+const char * const altar::extensions::ess__doc__ =
+    "compute the effective sample size of a vector of normalized weights";
+
+PyObject *
+altar::extensions::ess(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * wCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(args, "O!:ess", &PyCapsule_Type, &wCapsule);
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsule
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+
+    // compute and return
+    return PyFloat_FromDouble(altar::bayesian::scheduler::ess(w));
+}
+
+
+// reweight
+const char * const altar::extensions::reweight__name__ = "reweight";
+const char * const altar::extensions::reweight__doc__ =
+    "scale a vector of weights by the carried weights of the samples, and normalize it";
+
+PyObject *
+altar::extensions::reweight(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * carriedCapsule;
+    PyObject * wCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!:reweight",
+                                  &PyCapsule_Type, &carriedCapsule,
+                                  &PyCapsule_Type, &wCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * carried = asVector(carriedCapsule, "carried");
+    if (!carried) return 0;
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+
+    // check the geometry
+    if (carried->size != w->size) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "reweight: incompatible shapes");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // scale and normalize
+    altar::bayesian::scheduler::reweight(carried, w);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// resample_systematic
+const char * const altar::extensions::resample_systematic__name__ = "resample_systematic";
+const char * const altar::extensions::resample_systematic__doc__ =
+    "compute the sample multiplicities by systematic resampling of the weights";
+
+PyObject *
+altar::extensions::resample_systematic(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * wCapsule;
+    double u;
+    PyObject * multiplicitiesCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!dO!:resample_systematic",
+                                  &PyCapsule_Type, &wCapsule,
+                                  &u,
+                                  &PyCapsule_Type, &multiplicitiesCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+    gsl_vector * multiplicities = asVector(multiplicitiesCapsule, "multiplicities");
+    if (!multiplicities) return 0;
+
+    // check the geometry
+    if (multiplicities->size != w->size) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "resample_systematic: incompatible shapes");
+        return 0;
+    }
+    // and the offset
+    if (u < 0 || u >= 1) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "resample_systematic: the offset must be in [0,1)");
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // resample
+    altar::bayesian::scheduler::systematic(w, u, multiplicities);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// the stratified and residual schemes share a signature
+typedef void (*resampler_t)(const gsl_vector *, const gsl_vector *, gsl_vector *);
+
+static PyObject *
+resample(PyObject * args, const char * format, const char * name, resampler_t resampler) {
+    // the arguments
+    PyObject * wCapsule;
+    PyObject * uCapsule;
+    PyObject * multiplicitiesCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, format,
+                                  &PyCapsule_Type, &wCapsule,
+                                  &PyCapsule_Type, &uCapsule,
+                                  &PyCapsule_Type, &multiplicitiesCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * w = asVector(wCapsule, "w");
+    if (!w) return 0;
+    gsl_vector * u = asVector(uCapsule, "u");
+    if (!u) return 0;
+    gsl_vector * multiplicities = asVector(multiplicitiesCapsule, "multiplicities");
+    if (!multiplicities) return 0;
+
+    // check the geometry
+    if (multiplicities->size != w->size || u->size < w->size) {
+        // complain
+        PyErr_Format(PyExc_ValueError, "%s: incompatible shapes", name);
+        return 0;
+    }
+
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // resample
+    resampler(w, u, multiplicities);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// resample_stratified
+const char * const altar::extensions::resample_stratified__name__ = "resample_stratified";
+const char * const altar::extensions::resample_stratified__doc__ =
+    "compute the sample multiplicities by stratified resampling of the weights";
+
+PyObject *
+altar::extensions::resample_stratified(PyObject *, PyObject * args) {
+    // delegate
+    return resample(args, "O!O!O!:resample_stratified", resample_stratified__name__,
+                    altar::bayesian::scheduler::stratified);
+}
+
+
+// resample_residual
+const char * const altar::extensions::resample_residual__name__ = "resample_residual";
+const char * const altar::extensions::resample_residual__doc__ =
+    "compute the sample multiplicities by residual resampling of the weights";
+
+PyObject *
+altar::extensions::resample_residual(PyObject *, PyObject * args) {
+    // delegate
+    return resample(args, "O!O!O!:resample_residual", resample_residual__name__,
+                    altar::bayesian::scheduler::residual);
+}
+
+
+// expand
+const char * const altar::extensions::expand__name__ = "expand";
+const char * const altar::extensions::expand__doc__ =
+    "convert a vector of sample multiplicities into an index of source samples";
+
+PyObject *
+altar::extensions::expand(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * multiplicitiesCapsule;
+    PyObject * indexCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!:expand",
+                                  &PyCapsule_Type, &multiplicitiesCapsule,
+                                  &PyCapsule_Type, &indexCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * multiplicities = asVector(multiplicitiesCapsule, "multiplicities");
+    if (!multiplicities) return 0;
+    gsl_vector * index = asVector(indexCapsule, "index");
+    if (!index) return 0;
+
+    // the number of slots filled
+    size_t filled;
+    // let other threads run while we work
+    Py_BEGIN_ALLOW_THREADS
+    // expand
+    filled = altar::bayesian::scheduler::expand(multiplicities, index);
+    Py_END_ALLOW_THREADS
+
+    // return the number of slots filled
+    return PyLong_FromSize_t(filled);
+}
+
+
+// gather
+const char * const altar::extensions::gather__name__ = "gather";
+const char * const altar::extensions::gather__doc__ =
+    "fill the rows of a sample set with the source rows listed in an index vector";
+
+PyObject *
+altar::extensions::gather(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * indexCapsule;
+    PyObject * sourceCapsule;
+    PyObject * destCapsule;
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!:gather",
+                                  &PyCapsule_Type, &indexCapsule,
+                                  &PyCapsule_Type, &sourceCapsule,
+                                  &PyCapsule_Type, &destCapsule
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the capsules
+    gsl_vector * index = asVector(indexCapsule, "index");
+    if (!index) return 0;
+    gsl_matrix * source = asMatrix(sourceCapsule, "source");
+    if (!source) return 0;
+    gsl_matrix * dest = asMatrix(destCapsule, "dest");
+    if (!dest) return 0;
+
+    // check the geometry
+    if (dest->size1 != index->size || dest->size2 != source->size2) {
+        // complain
+        PyErr_SetString(PyExc_ValueError, "gather: incompatible sample set shapes");
+        return 0;
+    }
+    // and the index
+    if (!validIndex(index, source->size1)) {
+        // complain
+        PyErr_SetString(PyExc_IndexError, "gather: sample index out of range");
+        return 0;
+    }
+
+    // let other threads run while we copy
+    Py_BEGIN_ALLOW_THREADS
+    // gather
+    altar::bayesian::scheduler::gather(index, source, dest);
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// gather_likelihoods
+const char * const altar::extensions::gather_likelihoods__name__ = "gather_likelihoods";
+const char * const altar::extensions::gather_likelihoods__doc__ =
+    "fill the prior, data and posterior likelihoods with the source slots listed in an index";
+
+PyObject *
+altar::extensions::gather_likelihoods(PyObject *, PyObject * args) {
+    // the arguments
+    PyObject * indexCapsule;
+    PyObject * sourceCapsules[3];
+    PyObject * destCapsules[3];
+
+    // unpack the argument tuple
+    int status = PyArg_ParseTuple(
+                                  args, "O!O!O!O!O!O!O!:gather_likelihoods",
+                                  &PyCapsule_Type, &indexCapsule,
+                                  &PyCapsule_Type, &sourceCapsules[0],
+                                  &PyCapsule_Type, &sourceCapsules[1],
+                                  &PyCapsule_Type, &sourceCapsules[2],
+                                  &PyCapsule_Type, &destCapsules[0],
+                                  &PyCapsule_Type, &destCapsules[1],
+                                  &PyCapsule_Type, &destCapsules[2]
+                                  );
+    // if something went wrong
+    if (!status) return 0;
+
+    // unpack the index
+    gsl_vector * index = asVector(indexCapsule, "index");
+    if (!index) return 0;
+    // and the likelihoods
+    gsl_vector * sources[3];
+    gsl_vector * dests[3];
+    for (int i = 0; i < 3; ++i) {
+        // the source
+        sources[i] = asVector(sourceCapsules[i], "source");
+        if (!sources[i]) return 0;
+        // the destination
+        dests[i] = asVector(destCapsules[i], "dest");
+        if (!dests[i]) return 0;
+        // check the geometry
+        if (dests[i]->size != index->size) {
+            // complain
+            PyErr_SetString(PyExc_ValueError, "gather_likelihoods: incompatible shapes");
+            return 0;
+        }
+        // and the index
+        if (!validIndex(index, sources[i]->size)) {
+            // complain
+            PyErr_SetString(PyExc_IndexError, "gather_likelihoods: sample index out of range");
+            return 0;
+        }
+    }
+
+    // let other threads run while we copy
+    Py_BEGIN_ALLOW_THREADS
+    // gather
+    for (int i = 0; i < 3; ++i) {
+        altar::bayesian::scheduler::gather(index, sources[i], dests[i]);
+    }
+    Py_END_ALLOW_THREADS
+
+    // all done
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+// end of file
@@ -0,0 +1,76 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+#if !defined(altar_extensions_scheduler_h)
+#define altar_extensions_scheduler_h
+
+
+// place everything in my private namespace
+namespace altar {
+    namespace extensions {
+
+        // the weighted covariance of a sample set
+        extern const char * const covariance__name__;
+        extern const char * const covariance__doc__;
+        PyObject * covariance(PyObject *, PyObject *);
+
+        // the weighted second moment of a sample set about a given mean
+        extern const char * const comoment__name__;
+        extern const char * const comoment__doc__;
+        PyObject * comoment(PyObject *, PyObject *);
+
+        // the median of a vector
+        extern const char * const median__name__;
+        extern const char * const median__doc__;
+        PyObject * median(PyObject *, PyObject *);
+
+        // the effective sample size
+        extern const char * const ess__name__;
+        extern const char * const ess__doc__;
+        PyObject * ess(PyObject *, PyObject *);
+
+        // weight accumulation
+        extern const char * const reweight__name__;
+        extern const char * const reweight__doc__;
+        PyObject * reweight(PyObject *, PyObject *);
+
+        // resampling
+        extern const char * const resample_systematic__name__;
+        extern const char * const resample_systematic__doc__;
+        PyObject * resample_systematic(PyObject *, PyObject *);
+
+        extern const char * const resample_stratified__name__;
+        extern const char * const resample_stratified__doc__;
+        PyObject * resample_stratified(PyObject *, PyObject *);
+
+        extern const char * const resample_residual__name__;
+        extern const char * const resample_residual__doc__;
+        PyObject * resample_residual(PyObject *, PyObject *);
+
+        // convert sample multiplicities into an index
+        extern const char * const expand__name__;
+        extern const char * const expand__doc__;
+        PyObject * expand(PyObject *, PyObject *);
+
+        // gather sample rows by index
+        extern const char * const gather__name__;
+        extern const char * const gather__doc__;
+        PyObject * gather(PyObject *, PyObject *);
+
+        // gather sample likelihoods by index
+        extern const char * const gather_likelihoods__name__;
+        extern const char * const gather_likelihoods__doc__;
+        PyObject * gather_likelihoods(PyObject *, PyObject *);
+
+    } // of namespace extensions
+} // of namespace altar
+
+#endif
+
+// end of file
@@ -16,6 +16,8 @@
 
 // externals
 #include <cmath>
+#include <algorithm>
+#include <limits>
 #include <iostream>
 #include <iomanip>
 #include <gsl/gsl_sys.h>
@@ -51,6 +53,15 @@ namespace cov {
         double llkMedian; // the median value of the log-likelihoods
         double target; // the COV value we are aiming for; should be 1
     };
+
+    // the moments of the weights needed by the root finder
+    struct moments {
+        double cov;   // the COV of the normalized weights
+        double g;     // log(n Σw^2 / (Σw)^2), a monotone function of the COV
+        double dg;    // its derivative with respect to dbeta
+    };
+    // compute them at {dbeta}; {shift} is the maximum log-likelihood
+    static moments evaluate(double dbeta, const gsl_vector * llk, double shift, gsl_vector * w);
 }
 
 // interface
@@ -325,6 +336,95 @@ dbeta_grid(vector_t *llk, double llkMedian, vector_t *w)
     return dbeta;
 }
 
+// calculate the beta increment by solving COV(dbeta) = target with a safeguarded Newton method
+double
+altar::bayesian::COV::
+dbeta_newton(vector_t * llk, vector_t * w)
+{
+    // build my debugging channel
+    pyre::journal::debug_t debug("altar.beta");
+
+    // the number of samples
+    const double n = llk->size;
+    // shift the log-likelihoods by their maximum, so that the weights never overflow
+    const double shift = gsl_vector_max(llk);
+    // the COV target, in terms of g = log(1 + (n-1)/n cov^2)
+    const double goal = std::log1p((n - 1) / n * _target * _target);
+
+    // reset the evaluation counter
+    _iterations = 0;
+
+    // the bracket
+    double lo = 0;
+    double hi = _betaMax - _beta;
+
+    // check whether we can skip straight to beta = 1
+    cov::moments m = cov::evaluate(hi, llk, shift, w);
+    ++_iterations;
+    if (m.cov < _target || std::abs(m.cov - _target) < _tolerance) {
+        debug
+            << pyre::journal::at(__HERE__)
+            << " ** skipping to beta = " << _betaMax << " **"
+            << pyre::journal::endl;
+        // save my state
+        _beta = _betaMax;
+        _cov = m.cov;
+        _dbeta = hi;
+        // all done
+        return hi;
+    }
+
+    // start from the increment we took last time, as long as it is inside the bracket
+    double dbeta = (_dbeta > lo && _dbeta < hi) ? _dbeta : .5 * (lo + hi);
+    // iterate
+    while (_iterations < _maxIterations) {
+        // evaluate
+        m = cov::evaluate(dbeta, llk, shift, w);
+        ++_iterations;
+        // check for convergence
+        if (std::abs(m.cov - _target) < _tolerance) {
+            break;
+        }
+        // g is increasing in dbeta, so use the residual to tighten the bracket
+        const double residual = m.g - goal;
+        if (residual < 0) {
+            lo = dbeta;
+        } else {
+            hi = dbeta;
+        }
+        // take a newton step
+        double next = dbeta - residual / m.dg;
+        // if it is not well defined or it leaves the bracket
+        if (!std::isfinite(next) || next <= lo || next >= hi) {
+            // bisect instead
+            next = .5 * (lo + hi);
+        }
+        // if the bracket has collapsed
+        if (hi - lo <= std::numeric_limits<double>::epsilon() * hi) {
+            // we can't do any better
+            break;
+        }
+        // move on
+        dbeta = next;
+    }
+
+    if (debug) {
+        debug
+            << pyre::journal::at(__HERE__)
+            << "dbeta: " << dbeta << ", cov: " << m.cov
+            << ", after " << _iterations << " evaluations"
+            << pyre::journal::endl;
+    }
+
+    // adjust my state; {w} already holds the weights at {dbeta}
+    _cov = m.cov;
+    _beta += dbeta;
+    _dbeta = dbeta;
+    // return the beta update
+    return dbeta;
+}
+
+
 // meta-methods
 altar::bayesian::COV::
 ~COV()
@@ -339,18 +439,40 @@ double cov::cov(double dbeta, void * parameters)
     // store dbeta
     p.dbeta = dbeta;
 
-    // initialize {w}
-    for (size_t i = 0; i < p.w->size; i++) {
-        gsl_vector_set(p.w, i, std::exp(dbeta * (gsl_vector_get(p.llk, i)  - p.llkMedian)));
+    // get the number of samples
+    const long n = p.w->size;
+    // unpack the vectors
+    double * w = p.w->data;
+    const size_t wStride = p.w->stride;
+    const double * llk = p.llk->data;
+    const size_t llkStride = p.llk->stride;
+    const double median = p.llkMedian;
+
+    // compute the weights, along with their sum and the sum of their squares, in one pass
+    double s1 = 0;
+    double s2 = 0;
+#pragma omp parallel for simd reduction(+:s1, s2)
+    for (long i = 0; i < n; i++) {
+        // the un-normalized weight
+        const double wi = std::exp(dbeta * (llk[i*llkStride] - median));
+        // store it
+        w[i*wStride] = wi;
+        // and accumulate
+        s1 += wi;
+        s2 += wi * wi;
     }
     // normalize
-    double wsum = p.w->size * gsl_stats_mean(p.w->data, p.w->stride, p.w->size);
-    gsl_vector_scale(p.w, 1/wsum);
+    const double norm = 1 / s1;
+#pragma omp parallel for simd
+    for (long i = 0; i < n; i++) {
+        w[i*wStride] *= norm;
+    }
 
-    // compute the COV
-    double mean = gsl_stats_mean(p.w->data, p.w->stride, p.w->size);
-    double sdev = gsl_stats_sd_m(p.w->data, p.w->stride, p.w->size, mean);
-    double cov = sdev / mean;
+    // compute the COV; the normalized weights have mean 1/n, and their sample variance is
+    //   (Σ w_i^2 - 1/n) / (n-1)
+    const double mean = 1.0 / n;
+    const double variance = std::max(0.0, s2 * norm * norm - mean) / (n - 1);
+    const double cov = std::sqrt(variance) / mean;
 
     // if the COV is not well defined
     if (gsl_isinf(cov) || gsl_isnan(cov)) {
@@ -367,4 +489,51 @@ double cov::cov(double dbeta, void * parameters)
     return p.metric;
 }
 
+// compute the weights at {dbeta} and the moments the root finder needs
+cov::moments cov::evaluate(double dbeta, const gsl_vector * llk, double shift, gsl_vector * w)
+{
+    // get the number of samples
+    const long n = w->size;
+    // unpack the vectors
+    double * wData = w->data;
+    const size_t wStride = w->stride;
+    const double * llkData = llk->data;
+    const size_t llkStride = llk->stride;
+
+    // with x_i = llk_i - max(llk) and e_i = exp(dbeta x_i), accumulate the sums
+    //   s0 = Σ e_i, s1 = Σ x_i e_i, t0 = Σ e_i^2, t1 = Σ x_i e_i^2
+    double s0 = 0, s1 = 0, t0 = 0, t1 = 0;
+#pragma omp parallel for simd reduction(+:s0, s1, t0, t1)
+    for (long i = 0; i < n; i++) {
+        // the shifted log-likelihood
+        const double x = llkData[i*llkStride] - shift;
+        // the un-normalized weight; it is at most 1, so it never overflows
+        const double e = std::exp(dbeta * x);
+        // store it
+        wData[i*wStride] = e;
+        // and accumulate
+        s0 += e;
+        s1 += x * e;
+        t0 += e * e;
+        t1 += x * e * e;
+    }
+    // normalize
+    const double norm = 1 / s0;
+#pragma omp parallel for simd
+    for (long i = 0; i < n; i++) {
+        wData[i*wStride] *= norm;
+    }
+
+    // g = log(n t0 / s0^2), whose derivative is 2 (t1/t0 - s1/s0)
+    moments m;
+    m.g = std::log(n * t0 * norm * norm);
+    m.dg = 2 * (t1 / t0 - s1 * norm);
+    // and the COV of the normalized weights, with mean 1/n and sample variance
+    //   (Σ w_i^2 - 1/n) / (n-1)
+    m.cov = n * std::sqrt(std::max(0.0, t0 * norm * norm - 1.0 / n) / (n - 1));
+
+    // all done
+    return m;
+}
+
 // end of file
@@ -42,11 +42,19 @@ public:
 public:
     inline auto cov() const;
     inline auto beta() const;
+    inline auto iterations() const;
+    inline auto dbeta() const;
+
+    // mutators
+public:
+    // pick up the schedule from a checkpoint
+    inline void restore(double beta, double dbeta);
 
     // interface
 public:
     virtual double dbeta_brent(vector_t * llk, double llkMedian, vector_t * w);
     virtual double dbeta_grid(vector_t * llk, double llkMedian, vector_t * w);
+    virtual double dbeta_newton(vector_t * llk, vector_t * w);
 
     // meta-methods
 public:
@@ -63,6 +71,8 @@ private:
     size_t _maxIterations;
     double  _target;
     double _beta, _cov;
+    double _dbeta;
+    size_t _iterations;
 
     // disallow
 private:
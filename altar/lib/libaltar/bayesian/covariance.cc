@@ -0,0 +1,339 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+// for the build system
+#include <portinfo>
+
+// for debugging
+#include <cassert>
+
+// externals
+#include <cmath>
+#include <algorithm>
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+#include <gsl/gsl_blas.h>
+#include <gsl/gsl_math.h>
+#include <gsl/gsl_eigen.h>
+
+// get my declarations
+#include "covariance.h"
+
+
+// helpers
+namespace {
+    // the smallest fraction of the variance of a parameter that the diagonal part of a
+    // low rank representation is allowed to keep; it keeps the representation positive definite
+    const double floor = 1.0e-8;
+
+    // build the centered samples, scaled by the square root of their weights
+    gsl_matrix * center(const gsl_vector * w, const gsl_matrix * theta) {
+        // get the geometry
+        const size_t samples = theta->size1;
+        const size_t parameters = theta->size2;
+        // the weighted mean
+        gsl_vector * mean = gsl_vector_alloc(parameters);
+        gsl_blas_dgemv(CblasTrans, 1.0, theta, w, 0.0, mean);
+        // the centered samples
+        gsl_matrix * centered = gsl_matrix_alloc(samples, parameters);
+        // go through the samples
+        for (size_t sample = 0; sample < samples; ++sample) {
+            // get the scale
+            const double scale = std::sqrt(gsl_vector_get(w, sample));
+            // the source row
+            const double * src = gsl_matrix_const_ptr(theta, sample, 0);
+            // and the destination row
+            double * dst = gsl_matrix_ptr(centered, sample, 0);
+            // fill
+            for (size_t parameter = 0; parameter < parameters; ++parameter) {
+                dst[parameter] = scale * (src[parameter] - gsl_vector_get(mean, parameter));
+            }
+        }
+        // clean up
+        gsl_vector_free(mean);
+        // and return the centered samples
+        return centered;
+    }
+
+    // the variance that is not captured by the low rank part
+    void residual(const gsl_vector * variance, const gsl_matrix * V, gsl_vector * d) {
+        // go through the parameters
+        for (size_t i = 0; i < V->size1; ++i) {
+            // the part of the variance captured by {V}
+            double captured = 0;
+            for (size_t j = 0; j < V->size2; ++j) {
+                captured += gsl_pow_2(gsl_matrix_get(V, i, j));
+            }
+            // the total
+            const double total = gsl_vector_get(variance, i);
+            // what's left, kept positive
+            gsl_vector_set(d, i, std::max(total - captured, floor * total));
+        }
+        // all done
+        return;
+    }
+
+    // assemble Σ = diag(d) + V V^T
+    void assemble(const gsl_vector * d, const gsl_matrix * V, gsl_matrix * sigma) {
+        // the low rank part, in the lower triangle
+        gsl_blas_dsyrk(CblasLower, CblasNoTrans, 1.0, V, 0.0, sigma);
+        // go through the rows
+        for (size_t i = 0; i < sigma->size1; ++i) {
+            // add the diagonal part
+            *gsl_matrix_ptr(sigma, i, i) += gsl_vector_get(d, i);
+            // and mirror the lower triangle
+            for (size_t j = 0; j < i; ++j) {
+                gsl_matrix_set(sigma, j, i, gsl_matrix_get(sigma, i, j));
+            }
+        }
+        // all done
+        return;
+    }
+
+    // scale the columns of {V} by the square roots of the eigenvalues in {lambda}
+    void scaleColumns(const gsl_vector * lambda, gsl_matrix * V) {
+        // go through the columns
+        for (size_t j = 0; j < V->size2; ++j) {
+            // get the scale; roundoff may have made small eigenvalues negative
+            const double scale = std::sqrt(std::max(0.0, gsl_vector_get(lambda, j)));
+            // apply it
+            for (size_t i = 0; i < V->size1; ++i) {
+                *gsl_matrix_ptr(V, i, j) *= scale;
+            }
+        }
+        // all done
+        return;
+    }
+
+    // orthonormalize the columns of {q} with modified Gram-Schmidt
+    void orthonormalize(gsl_matrix * q) {
+        // go through the columns
+        for (size_t j = 0; j < q->size2; ++j) {
+            gsl_vector_view qj = gsl_matrix_column(q, j);
+            // remove the projections on the previous columns
+            for (size_t k = 0; k < j; ++k) {
+                gsl_vector_view qk = gsl_matrix_column(q, k);
+                double projection;
+                gsl_blas_ddot(&qk.vector, &qj.vector, &projection);
+                gsl_blas_daxpy(-projection, &qk.vector, &qj.vector);
+            }
+            // normalize; a degenerate direction gets dropped
+            const double norm = gsl_blas_dnrm2(&qj.vector);
+            gsl_vector_scale(&qj.vector, norm > 0 ? 1 / norm : 0);
+        }
+        // all done
+        return;
+    }
+
+    // given the projection {s} of the covariance on the orthonormal basis {q}, build the low
+    // rank factor V = q u Λ^{1/2} out of the eigenpairs of {s}; destroys {s}
+    void project(gsl_matrix * s, const gsl_matrix * q, gsl_matrix * V) {
+        // get the rank
+        const size_t rank = s->size1;
+        // diagonalize
+        gsl_vector * lambda = gsl_vector_alloc(rank);
+        gsl_matrix * u = gsl_matrix_alloc(rank, rank);
+        gsl_eigen_symmv_workspace * workspace = gsl_eigen_symmv_alloc(rank);
+        gsl_eigen_symmv(s, lambda, u, workspace);
+        gsl_eigen_symmv_free(workspace);
+        gsl_eigen_symmv_sort(lambda, u, GSL_EIGEN_SORT_VAL_DESC);
+        // rotate the basis
+        gsl_blas_dgemm(CblasNoTrans, CblasNoTrans, 1.0, q, u, 0.0, V);
+        // and scale it
+        scaleColumns(lambda, V);
+        // clean up
+        gsl_matrix_free(u);
+        gsl_vector_free(lambda);
+        // all done
+        return;
+    }
+}
+
+
+// the diagonal representation
+void
+altar::bayesian::covariance::
+diagonal(const vector_t * w, const matrix_t * theta, matrix_t * sigma)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(w->size == samples);
+    assert(sigma->size1 == parameters && sigma->size2 == parameters);
+
+    // the weighted mean
+    gsl_vector * mean = gsl_vector_alloc(parameters);
+    gsl_blas_dgemv(CblasTrans, 1.0, theta, w, 0.0, mean);
+
+    // clear out the covariance
+    gsl_matrix_set_zero(sigma);
+    // accumulate the weighted squared deviations on its diagonal
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // get the weight
+        const double weight = gsl_vector_get(w, sample);
+        // and the sample
+        const double * row = gsl_matrix_const_ptr(theta, sample, 0);
+        // go through its parameters
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            // the deviation
+            const double delta = row[parameter] - gsl_vector_get(mean, parameter);
+            // accumulate
+            *gsl_matrix_ptr(sigma, parameter, parameter) += weight * delta * delta;
+        }
+    }
+
+    // clean up
+    gsl_vector_free(mean);
+    // all done
+    return;
+}
+
+
+// displacement with a diagonal covariance
+void
+altar::bayesian::covariance::
+displace(const matrix_t * theta, const vector_t * scale, matrix_t * candidate)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(scale->size == parameters);
+    assert(candidate->size1 == samples && candidate->size2 == parameters);
+
+    // go through the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // the origin
+        const double * src = gsl_matrix_const_ptr(theta, sample, 0);
+        // and the candidate
+        double * dst = gsl_matrix_ptr(candidate, sample, 0);
+        // displace
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            dst[parameter] = src[parameter] + gsl_vector_get(scale, parameter) * dst[parameter];
+        }
+    }
+
+    // all done
+    return;
+}
+
+
+// the low rank plus diagonal representation, from the samples
+void
+altar::bayesian::covariance::
+lowrank(const vector_t * w, const matrix_t * theta, const matrix_t * omega,
+        vector_t * d, matrix_t * V, matrix_t * sigma)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+    const size_t rank = omega->size2;
+
+    // check it
+    assert(w->size == samples);
+    assert(omega->size1 == parameters);
+    assert(d->size == parameters);
+    assert(V->size1 == parameters && V->size2 == rank);
+    assert(sigma->size1 == parameters && sigma->size2 == parameters);
+
+    // the weighted, centered samples c, so that the full covariance is c^T c
+    gsl_matrix * c = center(w, theta);
+
+    // the variance of each parameter is the squared norm of its column
+    gsl_vector * variance = gsl_vector_calloc(parameters);
+    for (size_t sample = 0; sample < samples; ++sample) {
+        const double * row = gsl_matrix_const_ptr(c, sample, 0);
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            *gsl_vector_ptr(variance, parameter) += row[parameter] * row[parameter];
+        }
+    }
+
+    // sample the range of c^T c by applying it to the random directions: q = c^T (c Ω)
+    gsl_matrix * y = gsl_matrix_alloc(samples, rank);
+    gsl_blas_dgemm(CblasNoTrans, CblasNoTrans, 1.0, c, omega, 0.0, y);
+    gsl_matrix * q = gsl_matrix_alloc(parameters, rank);
+    gsl_blas_dgemm(CblasTrans, CblasNoTrans, 1.0, c, y, 0.0, q);
+    gsl_matrix_free(y);
+
+    // orthonormalize its columns
+    orthonormalize(q);
+
+    // project the samples on the subspace, b = c q, and form the small matrix b^T b
+    gsl_matrix * b = gsl_matrix_alloc(samples, rank);
+    gsl_blas_dgemm(CblasNoTrans, CblasNoTrans, 1.0, c, q, 0.0, b);
+    gsl_matrix * s = gsl_matrix_alloc(rank, rank);
+    gsl_blas_dgemm(CblasTrans, CblasNoTrans, 1.0, b, b, 0.0, s);
+    gsl_matrix_free(b);
+    gsl_matrix_free(c);
+
+    // the low rank factor, out of the eigenpairs of the small matrix
+    project(s, q, V);
+    gsl_matrix_free(s);
+    gsl_matrix_free(q);
+
+    // the diagonal part picks up the variance that {V} misses
+    residual(variance, V, d);
+    gsl_vector_free(variance);
+
+    // assemble the covariance
+    assemble(d, V, sigma);
+
+    // all done
+    return;
+}
+
+
+// the low rank plus diagonal representation, from an assembled covariance
+void
+altar::bayesian::covariance::
+lowrank(const matrix_t * sigma, const matrix_t * omega, vector_t * d, matrix_t * V)
+{
+    // get the geometry
+    const size_t parameters = sigma->size1;
+    const size_t rank = omega->size2;
+
+    // check it
+    assert(sigma->size2 == parameters);
+    assert(omega->size1 == parameters);
+    assert(d->size == parameters);
+    assert(V->size1 == parameters && V->size2 == rank);
+
+    // sample the range of {sigma} by applying it to the random directions, q = Σ Ω, so the cost
+    // is O(P^2 r) rather than the O(P^3) of a full eigendecomposition
+    gsl_matrix * q = gsl_matrix_alloc(parameters, rank);
+    gsl_blas_dgemm(CblasNoTrans, CblasNoTrans, 1.0, sigma, omega, 0.0, q);
+    // orthonormalize it
+    orthonormalize(q);
+
+    // project {sigma} on the subspace: s = q^T Σ q
+    gsl_matrix * y = gsl_matrix_alloc(parameters, rank);
+    gsl_blas_dgemm(CblasNoTrans, CblasNoTrans, 1.0, sigma, q, 0.0, y);
+    gsl_matrix * s = gsl_matrix_alloc(rank, rank);
+    gsl_blas_dgemm(CblasTrans, CblasNoTrans, 1.0, q, y, 0.0, s);
+    gsl_matrix_free(y);
+
+    // the low rank factor, out of the eigenpairs of the small matrix
+    project(s, q, V);
+    gsl_matrix_free(s);
+    gsl_matrix_free(q);
+
+    // the diagonal part picks up the rest of the variance
+    gsl_vector_const_view variance = gsl_matrix_const_diagonal(sigma);
+    residual(&variance.vector, V, d);
+
+    // all done
+    return;
+}
+
+
+// end of file
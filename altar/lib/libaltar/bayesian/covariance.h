@@ -0,0 +1,50 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+// code guard
+#if !defined(altar_bayesian_covariance_h)
+#define altar_bayesian_covariance_h
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// the kernels of the structured representations of the parameter covariance
+namespace altar {
+    namespace bayesian {
+        namespace covariance {
+
+            // types
+            typedef gsl_vector vector_t;
+            typedef gsl_matrix matrix_t;
+
+            // diagonal: fill {sigma} with the weighted variances of the samples in {theta},
+            // given the normalized weights {w}, and zero everywhere else
+            void diagonal(const vector_t * w, const matrix_t * theta, matrix_t * sigma);
+            // displace the samples in {theta} by the unit gaussian variates in {candidate},
+            // scaled per parameter by {scale}, and leave the result in {candidate}
+            void displace(const matrix_t * theta, const vector_t * scale, matrix_t * candidate);
+
+            // low rank plus diagonal: approximate the weighted covariance of the samples by
+            //   Σ = diag(d) + V V^T
+            // where the columns of V span the dominant subspace, found by projecting the
+            // samples on the random directions in {omega}; {sigma} gets the assembled matrix
+            void lowrank(const vector_t * w, const matrix_t * theta, const matrix_t * omega,
+                         vector_t * d, matrix_t * V, matrix_t * sigma);
+            // recover {d} and {V} from an assembled {sigma}, using its dominant subspace as
+            // sampled by the random directions in {omega}
+            void lowrank(const matrix_t * sigma, const matrix_t * omega,
+                         vector_t * d, matrix_t * V);
+
+        } // of namespace covariance
+    } // of namespace bayesian
+} // of namespace altar
+
+# endif
+// end of file
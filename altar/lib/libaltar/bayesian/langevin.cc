@@ -0,0 +1,102 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+// for the build system
+#include <portinfo>
+
+// for debugging
+#include <cassert>
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+#include <gsl/gsl_blas.h>
+
+// get my declarations
+#include "langevin.h"
+
+
+// the correction to the acceptance ratio for the Langevin proposals
+void
+altar::bayesian::langevin::
+bias(
+     const matrix_t * theta, const matrix_t * gradient,
+     const matrix_t * ctheta, const matrix_t * cgradient,
+     const matrix_t * sigma_chol,
+     vector_t * bias)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(gradient->size1 == samples && gradient->size2 == parameters);
+    assert(ctheta->size1 == samples && ctheta->size2 == parameters);
+    assert(cgradient->size1 == samples && cgradient->size2 == parameters);
+    assert(sigma_chol->size1 == parameters && sigma_chol->size2 == parameters);
+    assert(bias->size == samples);
+
+    // with A = L L^T the proposal covariance, a candidate y is drawn from x around
+    //     x + A g(x) / 2
+    // where g is the gradient of the log posterior; expanding the two gaussian exponents, the
+    // log of q(x|y)/q(y|x) reduces to
+    //     - (y-x) . (g(x) + g(y)) / 2 - (|L^T g(y)|^2 - |L^T g(x)|^2) / 8
+    // which requires no inverses
+
+    // scratch space for the displacement
+    gsl_vector * delta = gsl_vector_alloc(parameters);
+    // and the two sums of the gradients
+    gsl_vector * sum = gsl_vector_alloc(parameters);
+    // and for the scaled gradients
+    gsl_vector * scaled = gsl_vector_alloc(parameters);
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // get the rows of the inputs
+        gsl_vector_const_view x = gsl_matrix_const_row(theta, sample);
+        gsl_vector_const_view gx = gsl_matrix_const_row(gradient, sample);
+        gsl_vector_const_view y = gsl_matrix_const_row(ctheta, sample);
+        gsl_vector_const_view gy = gsl_matrix_const_row(cgradient, sample);
+
+        // form the displacement
+        gsl_vector_memcpy(delta, &y.vector);
+        gsl_blas_daxpy(-1, &x.vector, delta);
+        // and the sum of the gradients
+        gsl_vector_memcpy(sum, &gx.vector);
+        gsl_blas_daxpy(1, &gy.vector, sum);
+        // project
+        double drift;
+        gsl_blas_ddot(delta, sum, &drift);
+
+        // scale the candidate gradient
+        gsl_vector_memcpy(scaled, &gy.vector);
+        gsl_blas_dtrmv(CblasLower, CblasTrans, CblasNonUnit, sigma_chol, scaled);
+        // compute its norm
+        double ny = gsl_blas_dnrm2(scaled);
+        // repeat with the original gradient
+        gsl_vector_memcpy(scaled, &gx.vector);
+        gsl_blas_dtrmv(CblasLower, CblasTrans, CblasNonUnit, sigma_chol, scaled);
+        double nx = gsl_blas_dnrm2(scaled);
+
+        // assemble the correction and store it
+        gsl_vector_set(bias, sample, - drift/2 - (ny*ny - nx*nx)/8);
+    }
+
+    // clean up
+    gsl_vector_free(scaled);
+    gsl_vector_free(sum);
+    gsl_vector_free(delta);
+
+    // all done
+    return;
+}
+
+
+// end of file
@@ -0,0 +1,42 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+// code guard
+#if !defined(altar_bayesian_langevin_h)
+#define altar_bayesian_langevin_h
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// the bulk kernels of the Langevin sampler
+namespace altar {
+    namespace bayesian {
+        namespace langevin {
+
+            // types
+            typedef gsl_vector vector_t;
+            typedef gsl_matrix matrix_t;
+
+            // compute the log of the ratio of the reverse and forward proposal densities for
+            // each sample, given the original samples {theta} and their {gradient}, the
+            // candidates {ctheta} and their {cgradient}, and the Cholesky factor {sigma_chol}
+            // of the proposal covariance; the result is deposited in {bias}
+            void bias(
+                      const matrix_t * theta, const matrix_t * gradient,
+                      const matrix_t * ctheta, const matrix_t * cgradient,
+                      const matrix_t * sigma_chol,
+                      vector_t * bias);
+
+        } // of namespace langevin
+    } // of namespace bayesian
+} // of namespace altar
+
+# endif
+// end of file
@@ -0,0 +1,271 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+// for the build system
+#include <portinfo>
+
+// for debugging
+#include <cassert>
+
+// externals
+#include <cmath>
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// get my declarations
+#include "metropolis.h"
+
+
+// the accept/reject phase
+void
+altar::bayesian::metropolis::
+accept(
+       const matrix_t * ctheta,
+       const vector_t * cprior, const vector_t * cdata, const vector_t * cpost,
+       matrix_t * theta,
+       vector_t * prior, vector_t * data, vector_t * posterior,
+       const vector_t * dice, const vector_t * rejects,
+       size_t & accepted, size_t & rejected, size_t & unlikely,
+       const vector_t * bias, vector_t * moves)
+{
+    // get the number of samples
+    const size_t samples = theta->size1;
+
+    // check the geometries
+    assert(ctheta->size1 == samples && ctheta->size2 == theta->size2);
+    assert(cprior->size == samples && cdata->size == samples && cpost->size == samples);
+    assert(prior->size == samples && data->size == samples && posterior->size == samples);
+    assert(dice->size == samples && rejects->size == samples);
+    assert(!bias || bias->size == samples);
+    assert(!moves || moves->size == samples);
+
+    // reset the counters
+    accepted = rejected = unlikely = 0;
+    // and the record of accepted samples
+    if (moves) gsl_vector_set_zero(moves);
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // a candidate is rejected if the model considered it invalid
+        if (gsl_vector_get(rejects, sample)) {
+            // nothing to do: {theta} and the likelihoods already contain the right statistics
+            // for this sample; just update the rejection count
+            ++rejected;
+            // and move on
+            continue;
+        }
+        // compute the difference of the two posterior likelihoods
+        double diff = gsl_vector_get(cpost, sample) - gsl_vector_get(posterior, sample);
+        // correct it for proposals that are not symmetric
+        if (bias) diff += gsl_vector_get(bias, sample);
+        // a candidate is also rejected if the model considered it less likely than the
+        // original and it wasn't saved by the dice
+        if (std::log(gsl_vector_get(dice, sample)) > diff) {
+            // update the unlikely count
+            ++unlikely;
+            // and move on
+            continue;
+        }
+
+        // otherwise, update the acceptance count
+        ++accepted;
+        // mark the sample
+        if (moves) gsl_vector_set(moves, sample, 1);
+        // copy the candidate sample; rows are contiguous, so use the row views
+        gsl_vector_const_view src = gsl_matrix_const_row(ctheta, sample);
+        gsl_vector_view dst = gsl_matrix_row(theta, sample);
+        gsl_vector_memcpy(&dst.vector, &src.vector);
+        // and its likelihoods
+        gsl_vector_set(prior, sample, gsl_vector_get(cprior, sample));
+        gsl_vector_set(data, sample, gsl_vector_get(cdata, sample));
+        gsl_vector_set(posterior, sample, gsl_vector_get(cpost, sample));
+    }
+
+    // all done
+    return;
+}
+
+
+// restore the candidates rejected by the model
+size_t
+altar::bayesian::metropolis::
+restore(const matrix_t * theta, matrix_t * ctheta, const vector_t * mask)
+{
+    // get the number of samples
+    const size_t samples = theta->size1;
+
+    // check the geometries
+    assert(ctheta->size1 == samples && ctheta->size2 == theta->size2);
+    assert(mask->size == samples);
+
+    // the number of restored samples
+    size_t restored = 0;
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // skip the ones that the model considered valid
+        if (!gsl_vector_get(mask, sample)) continue;
+        // copy the original row over the candidate
+        gsl_vector_const_view src = gsl_matrix_const_row(theta, sample);
+        gsl_vector_view dst = gsl_matrix_row(ctheta, sample);
+        gsl_vector_memcpy(&dst.vector, &src.vector);
+        // and update the count
+        ++restored;
+    }
+
+    // all done
+    return restored;
+}
+
+
+// restore the masked columns
+void
+altar::bayesian::metropolis::
+restoreColumns(const matrix_t * source, matrix_t * dest, const vector_t * mask)
+{
+    // get the shape
+    const size_t rows = source->size1;
+    const size_t columns = source->size2;
+
+    // check the geometries
+    assert(dest->size1 == rows && dest->size2 == columns);
+    assert(mask->size == columns);
+
+    // go through the rows; they are contiguous, so this is the cache friendly order
+    for (size_t row = 0; row < rows; ++row) {
+        // get the row of the source
+        const double * src = gsl_matrix_const_ptr(source, row, 0);
+        // and the row of the destination
+        double * dst = gsl_matrix_ptr(dest, row, 0);
+        // go through the columns
+        for (size_t column = 0; column < columns; ++column) {
+            // copy the flagged ones
+            if (gsl_vector_get(mask, column)) dst[column] = src[column];
+        }
+    }
+
+    // all done
+    return;
+}
+
+
+// count the unmasked samples
+size_t
+altar::bayesian::metropolis::
+survivors(const vector_t * mask)
+{
+    // initialize the count
+    size_t count = 0;
+    // go through the mask
+    for (size_t sample = 0; sample < mask->size; ++sample) {
+        // and count the clean entries
+        if (!gsl_vector_get(mask, sample)) ++count;
+    }
+    // all done
+    return count;
+}
+
+
+// gather the unmasked rows
+void
+altar::bayesian::metropolis::
+compact(const matrix_t * theta, const vector_t * mask, matrix_t * dest)
+{
+    // get the number of samples
+    const size_t samples = theta->size1;
+
+    // check the geometries
+    assert(mask->size == samples);
+    assert(dest->size2 == theta->size2 && dest->size1 == survivors(mask));
+
+    // the slot in {dest} that receives the next survivor
+    size_t slot = 0;
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // skip the ones that were flagged
+        if (gsl_vector_get(mask, sample)) continue;
+        // copy the row
+        gsl_vector_const_view src = gsl_matrix_const_row(theta, sample);
+        gsl_vector_view dst = gsl_matrix_row(dest, slot);
+        gsl_vector_memcpy(&dst.vector, &src.vector);
+        // and move on to the next slot
+        ++slot;
+    }
+
+    // all done
+    return;
+}
+
+
+// spread the dense values over the unmasked slots
+void
+altar::bayesian::metropolis::
+scatter(const vector_t * source, const vector_t * mask, vector_t * dest)
+{
+    // get the number of samples
+    const size_t samples = dest->size;
+
+    // check the geometries
+    assert(mask->size == samples);
+    assert(source->size == survivors(mask));
+
+    // the slot in {source} that holds the next value
+    size_t slot = 0;
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // skip the ones that were flagged
+        if (gsl_vector_get(mask, sample)) continue;
+        // copy the value
+        gsl_vector_set(dest, sample, gsl_vector_get(source, slot));
+        // and move on
+        ++slot;
+    }
+
+    // all done
+    return;
+}
+
+
+// the weighted squared distances of the candidates from the current samples
+void
+altar::bayesian::metropolis::
+jumps(const matrix_t * theta, const matrix_t * ctheta,
+      const vector_t * weights, vector_t * distances)
+{
+    // get the shape of the sample set
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check the geometries
+    assert(ctheta->size1 == samples && ctheta->size2 == parameters);
+    assert(weights->size == parameters && distances->size == samples);
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // initialize the distance
+        double distance = 0;
+        // go through the parameters
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            // compute the displacement
+            double delta =
+                gsl_matrix_get(ctheta, sample, parameter)
+                - gsl_matrix_get(theta, sample, parameter);
+            // and accumulate its weighted square
+            distance += gsl_vector_get(weights, parameter) * delta * delta;
+        }
+        // record it
+        gsl_vector_set(distances, sample, distance);
+    }
+
+    // all done
+    return;
+}
+
+
+// end of file
@@ -0,0 +1,68 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+// code guard
+#if !defined(altar_bayesian_metropolis_h)
+#define altar_bayesian_metropolis_h
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// the bulk kernels of the Metropolis sampler
+namespace altar {
+    namespace bayesian {
+        namespace metropolis {
+
+            // types
+            typedef gsl_vector vector_t;
+            typedef gsl_matrix matrix_t;
+
+            // the accept/reject phase: go through the candidate samples in {ctheta} and their
+            // likelihoods, and merge the ones that survive the Metropolis acceptance test into
+            // {theta} and its likelihoods; samples flagged in {rejects} are left alone; the
+            // optional {bias} is added to the log of the acceptance ratio of each sample, and the
+            // optional {moves} is filled with ones for the accepted samples and zeroes otherwise
+            void accept(
+                        const matrix_t * ctheta,
+                        const vector_t * cprior, const vector_t * cdata, const vector_t * cpost,
+                        matrix_t * theta,
+                        vector_t * prior, vector_t * data, vector_t * posterior,
+                        const vector_t * dice, const vector_t * rejects,
+                        size_t & accepted, size_t & rejected, size_t & unlikely,
+                        const vector_t * bias = 0, vector_t * moves = 0);
+
+            // restore the candidates in {ctheta} that are flagged in {mask} by overwriting them
+            // with the corresponding rows of {theta}; return the number of restored samples
+            size_t restore(const matrix_t * theta, matrix_t * ctheta, const vector_t * mask);
+
+            // the same for samples stored as columns: overwrite the columns of {dest} that are
+            // flagged in {mask} with the corresponding columns of {source}
+            void restoreColumns(const matrix_t * source, matrix_t * dest, const vector_t * mask);
+
+            // count the samples that are not flagged in {mask}
+            size_t survivors(const vector_t * mask);
+            // gather the rows of {theta} that are not flagged in {mask} into the dense {dest}
+            void compact(const matrix_t * theta, const vector_t * mask, matrix_t * dest);
+            // the inverse operation for vectors: spread the entries of the dense {source} over
+            // the slots of {dest} that are not flagged in {mask}; flagged slots are left alone
+            void scatter(const vector_t * source, const vector_t * mask, vector_t * dest);
+
+            // fill {distances} with the squared distance of each candidate in {ctheta} from the
+            // corresponding sample in {theta}, with each parameter weighted by its entry in
+            // {weights}
+            void jumps(const matrix_t * theta, const matrix_t * ctheta,
+                       const vector_t * weights, vector_t * distances);
+
+        } // of namespace metropolis
+    } // of namespace bayesian
+} // of namespace altar
+
+# endif
+// end of file
@@ -0,0 +1,415 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+// for the build system
+#include <portinfo>
+
+// for debugging
+#include <cassert>
+
+// externals
+#include <cmath>
+#include <cstring>
+#include <vector>
+#include <algorithm>
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+#include <gsl/gsl_blas.h>
+
+// get my declarations
+#include "scheduler.h"
+
+
+// the weighted covariance of a sample set
+void
+altar::bayesian::scheduler::
+covariance(const vector_t * w, const matrix_t * theta, vector_t * mean, matrix_t * sigma)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(w->size == samples);
+    assert(mean->size == parameters);
+    assert(sigma->size1 == parameters && sigma->size2 == parameters);
+
+    // the weighted mean: θbar = θ^T w
+    gsl_blas_dgemv(CblasTrans, 1.0, theta, w, 0.0, mean);
+    // and the second moment about it
+    comoment(w, theta, mean, sigma);
+
+    // all done
+    return;
+}
+
+
+// the weighted second moment about a given mean
+void
+altar::bayesian::scheduler::
+comoment(const vector_t * w, const matrix_t * theta, const vector_t * mean, matrix_t * sigma)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(w->size == samples);
+    assert(mean->size == parameters);
+    assert(sigma->size1 == parameters && sigma->size2 == parameters);
+
+    // build the weighted, centered samples: c_i = √w_i (θ_i - mean)
+    gsl_matrix * centered = gsl_matrix_alloc(samples, parameters);
+    // go through the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // get the scale
+        const double scale = std::sqrt(gsl_vector_get(w, sample));
+        // the source row
+        const double * src = gsl_matrix_const_ptr(theta, sample, 0);
+        // and the destination row
+        double * dst = gsl_matrix_ptr(centered, sample, 0);
+        // fill
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            dst[parameter] = scale * (src[parameter] - gsl_vector_get(mean, parameter));
+        }
+    }
+
+    // Σ = c^T c, in a single rank-k update of the lower triangle
+    gsl_blas_dsyrk(CblasLower, CblasTrans, 1.0, centered, 0.0, sigma);
+    // mirror it into the upper triangle
+    for (size_t i = 0; i < parameters; ++i) {
+        for (size_t j = 0; j < i; ++j) {
+            gsl_matrix_set(sigma, j, i, gsl_matrix_get(sigma, i, j));
+        }
+    }
+
+    // clean up
+    gsl_matrix_free(centered);
+
+    // all done
+    return;
+}
+
+
+// the median
+double
+altar::bayesian::scheduler::
+median(const vector_t * v)
+{
+    // get the size
+    const size_t n = v->size;
+    // if there is nothing there
+    if (n == 0) {
+        // there is no median either
+        return 0;
+    }
+
+    // copy the values, since selection reorders them
+    std::vector<double> values(n);
+    for (size_t i = 0; i < n; ++i) {
+        values[i] = gsl_vector_get(v, i);
+    }
+
+    // find the upper middle
+    const size_t half = n / 2;
+    auto middle = values.begin() + half;
+    std::nth_element(values.begin(), middle, values.end());
+    const double upper = *middle;
+    // for an odd number of entries, this is the median
+    if (n % 2 == 1) {
+        return upper;
+    }
+    // otherwise, average it with the largest of the entries below it, just like gsl does
+    const double lower = *std::max_element(values.begin(), middle);
+    // and return
+    return (lower + upper) / 2;
+}
+
+
+// the effective sample size
+double
+altar::bayesian::scheduler::
+ess(const vector_t * w)
+{
+    // the sum of the squares of the weights
+    const double norm = gsl_blas_dnrm2(w);
+    // if the weights vanish
+    if (norm == 0) {
+        // so does the sample
+        return 0;
+    }
+    // otherwise, for normalized weights
+    return 1 / (norm * norm);
+}
+
+
+// accumulate weights
+void
+altar::bayesian::scheduler::
+reweight(const vector_t * carried, vector_t * w)
+{
+    // check the geometry
+    assert(carried->size == w->size);
+
+    // scale
+    gsl_vector_mul(w, carried);
+    // compute the sum of the new weights; they are non-negative
+    const double total = gsl_blas_dasum(w);
+    // if it's non-zero
+    if (total > 0) {
+        // normalize
+        gsl_vector_scale(w, 1 / total);
+    }
+
+    // all done
+    return;
+}
+
+
+// resampling helpers
+namespace {
+    // walk the cumulative distribution of the {weight} of the samples, scaled by {total},
+    // along with {draws} sorted {position} values in [0,1), and add to the multiplicity of
+    // each sample the number of positions that land in its bin
+    template <typename weightT, typename positionT>
+    void sweep(size_t samples, weightT weight, double total,
+               size_t draws, positionT position, gsl_vector * multiplicities)
+    {
+        // the cumulative weight
+        double cumulative = 0;
+        // the next position
+        size_t draw = 0;
+        // the last sample with a non-zero weight
+        size_t last = 0;
+        // go through the samples
+        for (size_t sample = 0; sample < samples && draw < draws; ++sample) {
+            // get the weight of this sample
+            const double w = weight(sample);
+            // if it is non-zero
+            if (w > 0) {
+                // remember the sample
+                last = sample;
+            }
+            // update the cumulative weight
+            cumulative += w / total;
+            // the number of positions that land in this bin
+            size_t count = 0;
+            // count them
+            while (draw < draws && position(draw) < cumulative) {
+                ++count;
+                ++draw;
+            }
+            // and record them
+            *gsl_vector_ptr(multiplicities, sample) += count;
+        }
+        // roundoff may keep the cumulative weight from reaching one; give any leftovers to
+        // the last sample with a non-zero weight
+        *gsl_vector_ptr(multiplicities, last) += draws - draw;
+        // all done
+        return;
+    }
+}
+
+
+// systematic resampling
+void
+altar::bayesian::scheduler::
+systematic(const vector_t * w, double u, vector_t * multiplicities)
+{
+    // get the number of samples
+    const size_t samples = w->size;
+    // check
+    assert(multiplicities->size == samples);
+
+    // clear the multiplicities
+    gsl_vector_set_zero(multiplicities);
+    // the positions are a regular grid, offset by {u}
+    auto position = [samples, u](size_t i) { return (i + u) / samples; };
+    // the weights
+    auto weight = [w](size_t i) { return gsl_vector_get(w, i); };
+    // walk
+    sweep(samples, weight, 1.0, samples, position, multiplicities);
+
+    // all done
+    return;
+}
+
+
+// stratified resampling
+void
+altar::bayesian::scheduler::
+stratified(const vector_t * w, const vector_t * u, vector_t * multiplicities)
+{
+    // get the number of samples
+    const size_t samples = w->size;
+    // check
+    assert(u->size >= samples);
+    assert(multiplicities->size == samples);
+
+    // clear the multiplicities
+    gsl_vector_set_zero(multiplicities);
+    // each position is drawn uniformly from its own stratum
+    auto position = [samples, u](size_t i) { return (i + gsl_vector_get(u, i)) / samples; };
+    // the weights
+    auto weight = [w](size_t i) { return gsl_vector_get(w, i); };
+    // walk
+    sweep(samples, weight, 1.0, samples, position, multiplicities);
+
+    // all done
+    return;
+}
+
+
+// residual resampling
+void
+altar::bayesian::scheduler::
+residual(const vector_t * w, const vector_t * u, vector_t * multiplicities)
+{
+    // get the number of samples
+    const size_t samples = w->size;
+    // check
+    assert(u->size >= samples);
+    assert(multiplicities->size == samples);
+
+    // the number of copies assigned deterministically
+    size_t assigned = 0;
+    // go through the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // the integer part of the expected number of copies
+        const double copies = std::floor(samples * gsl_vector_get(w, sample));
+        // record it
+        gsl_vector_set(multiplicities, sample, copies);
+        // and update the count
+        assigned += static_cast<size_t>(copies);
+    }
+
+    // the number of copies left to assign
+    const size_t draws = samples > assigned ? samples - assigned : 0;
+    // if there are none
+    if (draws == 0) {
+        // we are done
+        return;
+    }
+
+    // the residual weights
+    auto weight = [samples, w, multiplicities](size_t i) {
+        return samples * gsl_vector_get(w, i) - gsl_vector_get(multiplicities, i);
+    };
+    // and their total, which is equal to {draws} up to roundoff
+    double total = 0;
+    for (size_t sample = 0; sample < samples; ++sample) {
+        total += weight(sample);
+    }
+    // the remaining copies get distributed by stratified sampling of the residuals
+    auto position = [draws, u](size_t i) { return (i + gsl_vector_get(u, i)) / draws; };
+    // walk; the sweep reads the residual weight of each sample before it updates its count
+    sweep(samples, weight, total, draws, position, multiplicities);
+
+    // all done
+    return;
+}
+
+
+// expand the sample multiplicities into an index
+size_t
+altar::bayesian::scheduler::
+expand(const vector_t * multiplicities, vector_t * index)
+{
+    // get the number of source samples
+    const size_t samples = multiplicities->size;
+
+    // make a list of the source samples
+    std::vector<size_t> order(samples);
+    for (size_t sample = 0; sample < samples; ++sample) {
+        order[sample] = sample;
+    }
+    // sort it by multiplicity, in reverse order
+    std::stable_sort(order.begin(), order.end(),
+                     [multiplicities](size_t a, size_t b) {
+                         return gsl_vector_get(multiplicities, a) >
+                             gsl_vector_get(multiplicities, b);
+                     });
+
+    // the number of slots filled so far
+    size_t done = 0;
+    // go through the source samples
+    for (size_t sample : order) {
+        // get the multiplicity
+        const size_t count = static_cast<size_t>(gsl_vector_get(multiplicities, sample));
+        // if it has dropped to zero, we are done
+        if (count == 0) break;
+        // otherwise, record the sample {count} times, as long as there is room
+        for (size_t dupl = 0; dupl < count && done < index->size; ++dupl) {
+            gsl_vector_set(index, done++, sample);
+        }
+    }
+
+    // report how many slots were filled
+    return done;
+}
+
+
+// gather sample rows
+void
+altar::bayesian::scheduler::
+gather(const vector_t * index, const matrix_t * source, matrix_t * dest)
+{
+    // get the geometry
+    const size_t samples = index->size;
+    const size_t parameters = source->size2;
+
+    // check it
+    assert(dest->size1 == samples);
+    assert(dest->size2 == parameters);
+
+    // go through the destination rows
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // get the source row
+        const size_t row = static_cast<size_t>(gsl_vector_get(index, sample));
+        // check it
+        assert(row < source->size1);
+        // and copy it over; rows are contiguous, even in views
+        std::memcpy(gsl_matrix_ptr(dest, sample, 0),
+                    gsl_matrix_const_ptr(source, row, 0),
+                    parameters * sizeof(double));
+    }
+
+    // all done
+    return;
+}
+
+
+// gather vector entries
+void
+altar::bayesian::scheduler::
+gather(const vector_t * index, const vector_t * source, vector_t * dest)
+{
+    // get the geometry
+    const size_t samples = index->size;
+
+    // check it
+    assert(dest->size == samples);
+
+    // go through the destination slots
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // get the source slot
+        const size_t slot = static_cast<size_t>(gsl_vector_get(index, sample));
+        // check it
+        assert(slot < source->size);
+        // and copy it over
+        gsl_vector_set(dest, sample, gsl_vector_get(source, slot));
+    }
+
+    // all done
+    return;
+}
+
+
+// end of file
@@ -0,0 +1,70 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+// code guard
+#if !defined(altar_bayesian_scheduler_h)
+#define altar_bayesian_scheduler_h
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// the bulk kernels of the annealing schedulers
+namespace altar {
+    namespace bayesian {
+        namespace scheduler {
+
+            // types
+            typedef gsl_vector vector_t;
+            typedef gsl_matrix matrix_t;
+
+            // compute the covariance {sigma} of the samples in {theta}, given the normalized
+            // weights {w}; the weighted mean of the samples is left in {mean}
+            void covariance(const vector_t * w, const matrix_t * theta,
+                            vector_t * mean, matrix_t * sigma);
+            // fill {sigma} with the weighted second moment of the samples in {theta} about the
+            // given {mean}; the weights {w} need not sum to one, so partial sums over disjoint
+            // subsets of the samples can be added up
+            void comoment(const vector_t * w, const matrix_t * theta,
+                          const vector_t * mean, matrix_t * sigma);
+
+            // the median of the entries in {v}, by selection rather than sorting
+            double median(const vector_t * v);
+
+            // the effective sample size of the normalized weights {w}
+            double ess(const vector_t * w);
+            // multiply the weights {w} by the {carried} weights of a sample set that was not
+            // resampled, and normalize the result
+            void reweight(const vector_t * carried, vector_t * w);
+
+            // resampling: fill {multiplicities} with the number of copies of each sample, given
+            // the normalized weights {w}
+            // systematic: a single uniform variate {u} offsets a regular grid of positions
+            void systematic(const vector_t * w, double u, vector_t * multiplicities);
+            // stratified: one uniform variate from {u} per stratum
+            void stratified(const vector_t * w, const vector_t * u, vector_t * multiplicities);
+            // residual: the integer part of the expected counts deterministically, the rest
+            // by stratified resampling of the residual weights
+            void residual(const vector_t * w, const vector_t * u, vector_t * multiplicities);
+
+            // convert the sample {multiplicities} into an {index} of source samples, with the
+            // most popular samples first; returns the number of slots filled
+            size_t expand(const vector_t * multiplicities, vector_t * index);
+
+            // fill the rows of {dest} with the rows of {source} listed in {index}
+            void gather(const vector_t * index, const matrix_t * source, matrix_t * dest);
+            // fill {dest} with the entries of {source} listed in {index}
+            void gather(const vector_t * index, const vector_t * source, vector_t * dest);
+
+        } // of namespace scheduler
+    } // of namespace bayesian
+} // of namespace altar
+
+# endif
+// end of file
@@ -0,0 +1,95 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+// for the build system
+#include <portinfo>
+
+// for debugging
+#include <cassert>
+
+// externals
+#include <cmath>
+#include <gsl/gsl_math.h>
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// get my declarations
+#include "gaussian.h"
+
+
+// the log density
+void
+altar::distributions::gaussian::
+logpdf(double mean, double sigma, const matrix_t * theta, vector_t * likelihood)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(likelihood->size == samples);
+
+    // the normalization of each parameter density: -log(σ √(2π))
+    const double normalization = - std::log(sigma) - 0.5 * std::log(2*M_PI);
+    // and the scale of the exponent
+    const double scale = - 1 / (2*sigma*sigma);
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // initialize the accumulator with the normalization of all parameters
+        double llk = parameters * normalization;
+        // go through the parameters
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            // get the distance from the mean
+            double dx = gsl_matrix_get(theta, sample, parameter) - mean;
+            // and update
+            llk += scale * dx*dx;
+        }
+        // store
+        *gsl_vector_ptr(likelihood, sample) += llk;
+    }
+
+    // all done
+    return;
+}
+
+
+// the gradient of the log density
+void
+altar::distributions::gaussian::
+gradient(double mean, double sigma, const matrix_t * theta, matrix_t * gradient)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(gradient->size1 == samples && gradient->size2 == parameters);
+
+    // the log density is -(x-μ)^2/(2σ^2) plus a constant, so its gradient is -(x-μ)/σ^2
+    const double scale = - 1 / (sigma*sigma);
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // and all the parameters
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            // get the value
+            double x = gsl_matrix_get(theta, sample, parameter);
+            // and update the gradient
+            *gsl_matrix_ptr(gradient, sample, parameter) += scale * (x - mean);
+        }
+    }
+
+    // all done
+    return;
+}
+
+
+// end of file
@@ -0,0 +1,40 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+// code guard
+#if !defined(altar_distributions_gaussian_h)
+#define altar_distributions_gaussian_h
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// bulk operations on samples of a gaussian distribution
+namespace altar {
+    namespace distributions {
+        namespace gaussian {
+
+            // types
+            typedef gsl_vector vector_t;
+            typedef gsl_matrix matrix_t;
+
+            // add the log density of each sample in {theta}, i.e. the sum of the log densities
+            // of its parameters, to the corresponding entry of {likelihood}
+            void logpdf(double mean, double sigma, const matrix_t * theta, vector_t * likelihood);
+
+            // add the gradient of the log density of each sample in {theta} to the
+            // corresponding row of {gradient}
+            void gradient(double mean, double sigma, const matrix_t * theta, matrix_t * gradient);
+
+        } // of namespace gaussian
+    } // of namespace distributions
+} // of namespace altar
+
+# endif
+// end of file
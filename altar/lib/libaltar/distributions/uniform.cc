@@ -0,0 +1,106 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+
+// for the build system
+#include <portinfo>
+
+// for debugging
+#include <cassert>
+
+// externals
+#include <cmath>
+#include <gsl/gsl_math.h>
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// get my declarations
+#include "uniform.h"
+
+
+// the log density
+void
+altar::distributions::uniform::
+logpdf(double low, double high, const matrix_t * theta, vector_t * likelihood)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(likelihood->size == samples);
+
+    // the density is constant inside the support, so the log density of a sample that lies
+    // entirely within it is just the sum of the log densities of its parameters
+    const double inside = - (parameters * std::log(high - low));
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // assume the sample is within the support
+        double llk = inside;
+        // go through the parameters
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            // get the value
+            double x = gsl_matrix_get(theta, sample, parameter);
+            // if it is outside the support
+            if (x < low || x > high) {
+                // the sample is impossible
+                llk = GSL_NEGINF;
+                // no need to look any further
+                break;
+            }
+        }
+        // store
+        *gsl_vector_ptr(likelihood, sample) += llk;
+    }
+
+    // all done
+    return;
+}
+
+
+// the bounds check
+void
+altar::distributions::uniform::
+verify(const vector_t * low, const vector_t * high, const matrix_t * theta, vector_t * mask)
+{
+    // get the geometry
+    const size_t samples = theta->size1;
+    const size_t parameters = theta->size2;
+
+    // check it
+    assert(low->size == parameters && high->size == parameters);
+    assert(mask->size == samples);
+
+    // go through all the samples
+    for (size_t sample = 0; sample < samples; ++sample) {
+        // skip the ones that have already been rejected
+        if (gsl_vector_get(mask, sample)) continue;
+        // get the row; it is contiguous in memory
+        const double * row = gsl_matrix_const_ptr(theta, sample, 0);
+        // go through the parameters
+        for (size_t parameter = 0; parameter < parameters; ++parameter) {
+            // get the value
+            double x = row[parameter];
+            // if it lies outside its support
+            if (x < gsl_vector_get(low, parameter) || x > gsl_vector_get(high, parameter)) {
+                // mark the sample as invalid
+                *gsl_vector_ptr(mask, sample) += 1;
+                // and skip checking the rest of the parameters
+                break;
+            }
+        }
+    }
+
+    // all done
+    return;
+}
+
+
+// end of file
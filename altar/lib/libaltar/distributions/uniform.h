@@ -0,0 +1,42 @@
+// -*- C++ -*-
+//
+// michael a.g. aïvázis <michael.aivazis@para-sim.com>
+//
+// (c) 2013-2020 parasim inc
+// (c) 2010-2020 california institute of technology
+// all rights reserved
+//
+
+// code guard
+#if !defined(altar_distributions_uniform_h)
+#define altar_distributions_uniform_h
+
+// externals
+#include <gsl/gsl_vector.h>
+#include <gsl/gsl_matrix.h>
+
+// bulk operations on samples of a uniform distribution
+namespace altar {
+    namespace distributions {
+        namespace uniform {
+
+            // types
+            typedef gsl_vector vector_t;
+            typedef gsl_matrix matrix_t;
+
+            // add the log density of each sample in {theta} to the corresponding entry of
+            // {likelihood}; samples with parameters outside of [low, high] get -∞
+            void logpdf(double low, double high, const matrix_t * theta, vector_t * likelihood);
+
+            // flag the samples in {theta} with a parameter outside of its [low, high] interval by
+            // incrementing the corresponding entry of {mask}; {low} and {high} have one entry per
+            // parameter, and samples that are already flagged are not checked again
+            void verify(const vector_t * low, const vector_t * high,
+                        const matrix_t * theta, vector_t * mask);
+
+        } // of namespace uniform
+    } // of namespace distributions
+} // of namespace altar
+
+# endif
+// end of file
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Walk the chains of the adaptive Metropolis sampler on a standard normal posterior, and verify
+that the walk stops as soon as the chains have traveled far enough, but no sooner
+"""
+
+
+def test(samples=2**10, parameters=2, steps=50):
+    # get the packages
+    import types
+    import altar
+    from altar.bayesian.Metropolis import Metropolis
+    from altar.bayesian.Notifier import Notifier
+    from altar.bayesian.CoolingStep import CoolingStep
+
+    # a standard normal model with a flat prior
+    class Normal(altar.models.bayesian, family="altar.models.tests.adaptive"):
+
+        @altar.export
+        def priorLikelihood(self, step):
+            # flat
+            step.prior.zero()
+            # all done
+            return self
+
+        @altar.export
+        def dataLikelihood(self, step):
+            # go through the samples
+            for sample in range(step.samples):
+                # get the sample
+                θ = step.theta.getRow(sample)
+                # and compute its log likelihood
+                step.data[sample] = -altar.blas.ddot(θ, θ) / 2
+            # all done
+            return self
+
+        @altar.export
+        def verify(self, step, mask):
+            # every sample is valid
+            return mask
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and the distribution of the initial samples
+    gaussian = altar.pdf.ugaussian(rng=rng)
+
+    # make the model
+    model = Normal(name="normal")
+    model.parameters = parameters
+    # the parts of the application the sampler needs
+    application = types.SimpleNamespace(
+        job=types.SimpleNamespace(steps=steps, gpus=0),
+        rng=types.SimpleNamespace(rng=rng),
+        model=model)
+    # and of the annealer
+    annealer = types.SimpleNamespace(model=model, dispatcher=Notifier(), scheduler=None)
+
+    # make a sample set at the posterior
+    step = CoolingStep.alloc(samples=samples, parameters=parameters)
+    step.beta = 1
+    # with the exact covariance
+    for i in range(parameters): step.sigma[i,i] = 1
+    # and the samples drawn from it
+    step.theta.random(pdf=gaussian)
+    # compute the likelihoods
+    model.likelihoods(annealer=annealer, step=step)
+
+    # go through a few mixing requirements, from easy to impossible
+    for mixing, shortest in ((.25, 1), (.25, 5), (steps, 1)):
+        # make an adaptive sampler
+        sampler = Metropolis(name="adaptive")
+        sampler.scaling = .5
+        sampler.adaptive = True
+        sampler.mixing = mixing
+        sampler.minSteps = shortest
+        sampler.initialize(application=application)
+        # walk the chains
+        stats = sampler.samplePosterior(annealer=annealer, step=step)
+        # every link accounts for every chain
+        assert sum(stats) == samples * sampler.length
+        # the walk is never shorter than requested
+        assert sampler.length >= shortest
+        # displacements of half a standard deviation can't cover a variance per link, so the
+        # last requirement walks the full length
+        if mixing == steps:
+            # check
+            assert sampler.length == steps
+        # otherwise
+        else:
+            # a quarter of a variance takes a handful of links
+            assert sampler.length < steps
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
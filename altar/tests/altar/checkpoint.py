@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Anneal a simple model for a few β steps with every δβ solver and a couple of covariance
+representations, restart from a checkpoint taken along the way, and verify that the restarted
+run retraces the uninterrupted one
+"""
+
+
+def build(model, solver, covariance, snapshot, period, samples, parameters):
+    """
+    Assemble the parts of a simulation of {model} that uses {solver} and the {covariance}
+    representation, and checkpoints to {snapshot} every {period} β steps
+    """
+    # get the packages
+    import types
+    import altar
+    from altar.bayesian.COV import COV
+    from altar.bayesian.Metropolis import Metropolis
+    from altar.bayesian.Notifier import Notifier
+    from altar.bayesian.SequentialAnnealing import SequentialAnnealing
+    from altar.simulations.Checkpoint import Checkpoint
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # the job; every walk takes five steps along each chain
+    job = types.SimpleNamespace(chains=samples, steps=5, gpus=0)
+
+    # make the model
+    model = model(name="normal")
+    model.parameters = parameters
+    # the parts of the application the simulation needs
+    application = types.SimpleNamespace(
+        job=job, rng=types.SimpleNamespace(rng=rng), model=model)
+    # that the model would get from its own initialization
+    model.job = job
+    model.rng = application.rng
+
+    # make the scheduler
+    scheduler = COV(name="scheduler")
+    scheduler.solver = solver(name="solver")
+    scheduler.covariance = covariance(name="covariance")
+    scheduler.initialize(application=application)
+    # the sampler
+    sampler = Metropolis(name="sampler")
+    sampler.initialize(application=application)
+    # and the archiver
+    archiver = Checkpoint(name="archiver")
+    archiver.snapshot = snapshot
+    archiver.period = period
+
+    # put them together
+    annealer = types.SimpleNamespace(
+        model=model, scheduler=scheduler, sampler=sampler, archiver=archiver,
+        dispatcher=Notifier())
+    # make the annealing method
+    worker = SequentialAnnealing(annealer=annealer)
+    # and return them
+    return annealer, worker
+
+
+def anneal(annealer, worker, steps):
+    """
+    Take {steps} β steps and record the temperature and the sample set at the end of each one
+    """
+    # the history
+    history = []
+    # go through the steps
+    for step in range(steps):
+        # compute a new temperature
+        worker.cool(annealer=annealer)
+        # walk the chains
+        statistics = worker.walk(annealer=annealer)
+        # resample
+        worker.resample(annealer=annealer, statistics=statistics)
+        # give the archiver a chance to save the state
+        worker.checkpoint(annealer=annealer)
+        # and record
+        history.append((worker.step.beta, worker.step.theta.clone()))
+    # all done
+    return history
+
+
+def test(samples=64, parameters=2, period=3, steps=5):
+    # get the packages
+    import os
+    import altar
+    from altar.bayesian.Brent import Brent
+    from altar.bayesian.Dense import Dense
+    from altar.bayesian.Grid import Grid
+    from altar.bayesian.LowRank import LowRank
+    from altar.bayesian.Newton import Newton
+
+    # a low rank covariance that has to be recovered from the dense one after a restart,
+    # unless the checkpoint remembers its structure
+    def lowrank(name):
+        # make one
+        representation = LowRank(name=name)
+        # that misses some of the variance
+        representation.rank = 1
+        # and return it
+        return representation
+
+    # a narrow gaussian posterior with a standard normal prior
+    class Normal(altar.models.bayesian, family="altar.models.tests.restart"):
+
+        @altar.export
+        def initializeSample(self, step):
+            # sample the prior
+            step.theta.random(pdf=altar.pdf.ugaussian(rng=self.rng.rng))
+            # all done
+            return self
+
+        @altar.export
+        def priorLikelihood(self, step):
+            # go through the samples
+            for sample in range(step.samples):
+                # get the sample
+                θ = step.theta.getRow(sample)
+                # and compute its log prior
+                step.prior[sample] = -altar.blas.ddot(θ, θ) / 2
+            # all done
+            return self
+
+        @altar.export
+        def dataLikelihood(self, step):
+            # go through the samples
+            for sample in range(step.samples):
+                # get the distance of the sample from the peak
+                θ = step.theta.getRow(sample)
+                for parameter in range(step.parameters): θ[parameter] -= 1
+                # and compute its log likelihood
+                step.data[sample] = -altar.blas.ddot(θ, θ) / (2 * .001**2)
+            # all done
+            return self
+
+        @altar.export
+        def verify(self, step, mask):
+            # every sample is valid
+            return mask
+
+    # the checkpoint file
+    snapshot = "checkpoint-test.bin"
+    # go through the solvers and the covariance representations
+    for solver, covariance in (
+            (Brent, Dense), (Grid, Dense), (Newton, Dense), (Brent, lowrank)):
+        # run uninterrupted; the only checkpoint is taken at the end of step {period}
+        annealer, worker = build(
+            model=Normal, solver=solver, covariance=covariance, snapshot=snapshot,
+            period=period, samples=samples, parameters=parameters)
+        worker.start(annealer=annealer)
+        expected = anneal(annealer=annealer, worker=worker, steps=steps)
+        # the schedule must still be in progress, or there is nothing to check
+        assert expected[-1][0] < 1
+
+        # start over from the checkpoint
+        annealer, worker = build(
+            model=Normal, solver=solver, covariance=covariance, snapshot=snapshot,
+            period=steps, samples=samples, parameters=parameters)
+        worker.restart(annealer=annealer)
+        assert worker.iteration == period
+        # and run the rest of the way
+        resumed = anneal(annealer=annealer, worker=worker, steps=steps-period)
+        # clean up
+        os.remove(snapshot)
+
+        # the two runs must agree
+        for (β, θ), (expectedβ, expectedθ) in zip(resumed, expected[period:]):
+            # on the temperature
+            assert β == expectedβ
+            # and the sample set
+            for sample in range(samples):
+                for parameter in range(parameters):
+                    assert θ[sample, parameter] == expectedθ[sample, parameter]
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Compare the weighted sample covariance computed one sample at a time against the compiled
+kernel used by the COV scheduler
+"""
+
+
+def bysample(w, theta):
+    """
+    The original strategy: a rank-1 update of Σ for every sample
+    """
+    # get the package
+    import altar
+    # unpack the shape
+    samples, parameters = theta.shape
+    # make room for the answer
+    Σ = altar.matrix(shape=(parameters, parameters)).zero()
+    # compute the weighted mean
+    θbar = altar.vector(shape=parameters)
+    for j in range(parameters):
+        θbar[j] = theta.getColumn(j).mean(weights=w)
+    # accumulate the weighted outer products
+    for i in range(samples):
+        altar.blas.dsyr(Σ.lowerTriangular, w[i], theta.getRow(i), Σ)
+    # subtract θbar θbar^T
+    altar.blas.dsyr(Σ.lowerTriangular, -1, θbar, Σ)
+    # fill the upper triangle
+    for i in range(parameters):
+        for j in range(i):
+            Σ[j,i] = Σ[i,j]
+    # all done
+    return Σ
+
+
+def kernel(w, theta):
+    """
+    The single rank-k update of the weighted, centered samples
+    """
+    # get the package
+    import altar
+    # unpack the shape
+    samples, parameters = theta.shape
+    # make room for the answer
+    Σ = altar.matrix(shape=(parameters, parameters)).zero()
+    θbar = altar.vector(shape=parameters)
+    # compute
+    altar.libaltar.covariance(w.data, theta.data, θbar.data, Σ.data)
+    # all done
+    return Σ
+
+
+def test(shapes=((2**10, 8), (2**12, 32), (2**14, 64)), steps=5):
+    # get the packages
+    import journal
+    import altar
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # the distribution of the samples
+    gaussian = altar.pdf.ugaussian(rng=rng)
+    # and of the weights
+    uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+
+    # make a timer
+    timer = altar.timers.wall("cov.covariance")
+    # and a channel
+    channel = journal.info("cov.covariance")
+
+    # go through the problem sizes
+    for samples, parameters in shapes:
+        # make a sample set
+        θ = altar.matrix(shape=(samples, parameters)).random(pdf=gaussian)
+        # and a set of normalized weights
+        w = altar.vector(shape=samples).random(pdf=uniform)
+        total = sum(w)
+        for i in range(samples): w[i] /= total
+
+        # time the original strategy
+        timer.reset()
+        timer.start()
+        for step in range(steps):
+            Σ_old = bysample(w=w, theta=θ)
+        timer.stop()
+        original = timer.read() / steps
+
+        # time the kernel
+        timer.reset()
+        timer.start()
+        for step in range(steps):
+            Σ_new = kernel(w=w, theta=θ)
+        timer.stop()
+        compiled = timer.read() / steps
+
+        # compare
+        error = max(abs(Σ_old[i,j] - Σ_new[i,j])
+                    for i in range(parameters) for j in range(parameters))
+        # the two must agree
+        assert error < 1e-10
+
+        # show me
+        channel.line(f"{samples} samples x {parameters} parameters")
+        channel.line(f"  by sample: {1e3*original:.3f} ms")
+        channel.line(f"  kernel: {1e3*compiled:.3f} ms")
+        channel.line(f"  max difference: {error:.3e}")
+    # flush
+    channel.log()
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Compare the structured representations of the parameter covariance against the dense estimate
+wherever they should agree with it
+"""
+
+
+def close(x, y, tolerance=1e-7):
+    """
+    Check whether {x} and {y} agree to within {tolerance}, relative to their size
+    """
+    # compare
+    return abs(x - y) <= tolerance * max(1, abs(x), abs(y))
+
+
+def test(samples=64, counts=(2, 3, 1)):
+    # get the packages
+    import types
+    import altar
+    from altar.bayesian.Diagonal import Diagonal
+    from altar.bayesian.Blocks import Blocks
+    from altar.bayesian.LowRank import LowRank
+    from altar.distributions.Gaussian import Gaussian
+    from altar.models.Contiguous import Contiguous
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and a couple of distributions
+    gaussian = altar.pdf.ugaussian(rng=rng)
+    uniform = altar.pdf.uniform(support=(.5, 1.5), rng=rng)
+
+    # the parameter sets of the model
+    psets = {}
+    for index, count in enumerate(counts):
+        # make one
+        pset = Contiguous(name=f"set{index}")
+        pset.count = count
+        # with its distributions
+        pset.prep = Gaussian(name=f"set{index}.prep")
+        pset.prior = Gaussian(name=f"set{index}.prior")
+        # and save it
+        psets[f"set{index}"] = pset
+    # the parts of the model the representations need
+    model = types.SimpleNamespace(rng=types.SimpleNamespace(rng=rng), psets=psets)
+    # and of the application
+    application = types.SimpleNamespace(model=model, rng=model.rng)
+
+    # the application initializes the representations before the model
+    diagonal = Diagonal(name="diagonal").initialize(application=application)
+    blocks = Blocks(name="blocks").initialize(application=application)
+    lowrank = LowRank(name="lowrank").initialize(application=application)
+    # which then places its parameter sets
+    offset = 0
+    for pset in psets.values():
+        offset += pset.initialize(model=model, offset=offset)
+    # and records the total number of parameters
+    parameters = model.parameters = offset
+
+    # make a sample set with correlated parameters
+    θ = altar.matrix(shape=(samples, parameters)).random(pdf=gaussian)
+    for sample in range(samples):
+        for parameter in range(1, parameters):
+            θ[sample, parameter] += θ[sample, parameter-1] / 2
+    # and some normalized weights
+    w = altar.vector(shape=samples).random(pdf=uniform)
+    total = sum(w[sample] for sample in range(samples))
+    for sample in range(samples): w[sample] /= total
+
+    # the dense estimate
+    dense = altar.matrix(shape=(parameters, parameters))
+    altar.libaltar.covariance(
+        w.data, θ.data, altar.vector(shape=parameters).data, dense.data)
+
+    # the diagonal estimate
+    Σ = altar.matrix(shape=(parameters, parameters))
+    diagonal.estimate(w=w, theta=θ, sigma=Σ)
+    # keeps the variances and nothing else
+    for i in range(parameters):
+        for j in range(parameters):
+            assert close(Σ[i,j], dense[i,j] if i == j else 0)
+
+    # the block diagonal estimate
+    blocks.estimate(w=w, theta=θ, sigma=Σ)
+    # follows the layout of the parameter sets
+    assert blocks.blocks == [(pset.offset, pset.count) for pset in psets.values()]
+    # and keeps each block and nothing else
+    owner = [next(b for b, (o, c) in enumerate(blocks.blocks) if o <= i < o+c)
+             for i in range(parameters)]
+    for i in range(parameters):
+        for j in range(parameters):
+            assert close(Σ[i,j], dense[i,j] if owner[i] == owner[j] else 0)
+
+    # a low rank estimate
+    lowrank.rank = 2
+    lowrank.estimate(w=w, theta=θ, sigma=Σ)
+    # keeps the variances
+    for i in range(parameters):
+        assert close(Σ[i,i], dense[i,i])
+
+    # at full rank, it is the dense estimate, up to the floor on the diagonal part
+    lowrank.rank = parameters
+    lowrank.estimate(w=w, theta=θ, sigma=Σ)
+    for i in range(parameters):
+        for j in range(parameters):
+            assert close(Σ[i,j], dense[i,j])
+
+    # and so are the factors recovered from the dense estimate
+    Ω = altar.matrix(shape=(parameters, parameters)).random(pdf=gaussian)
+    d = altar.vector(shape=parameters)
+    V = altar.matrix(shape=(parameters, parameters))
+    altar.libaltar.factor_lowrank(dense.data, Ω.data, d.data, V.data)
+    for i in range(parameters):
+        for j in range(parameters):
+            # assemble this entry
+            entry = sum(V[i,k] * V[j,k] for k in range(parameters)) + (d[i] if i == j else 0)
+            # and check it
+            assert close(entry, dense[i,j])
+
+    # the factors of an estimate survive the trip to another process
+    other = LowRank(name="other").initialize(application=application)
+    other.adopt(sigma=dense, shared=lowrank.share(sigma=Σ))
+    # so the other side uses them instead of recovering its own
+    _, d, V = lowrank.estimated
+    dr, Vr = other.describe(sigma=dense)
+    for i in range(parameters):
+        assert dr[i] == d[i]
+        for j in range(parameters):
+            assert Vr[i,j] == V[i,j]
+
+    # the diagonal displacement
+    scale = altar.vector(shape=parameters).random(pdf=uniform)
+    z = altar.matrix(shape=(samples, parameters)).random(pdf=gaussian)
+    candidate = z.clone()
+    altar.libaltar.displace_diagonal(θ.data, scale.data, candidate.data)
+    for sample in range(samples):
+        for i in range(parameters):
+            assert close(candidate[sample, i], θ[sample, i] + scale[i] * z[sample, i])
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Play the resampling exchange of the distributed annealing method for a few tasks in a single
+process, and verify that every task ends up with its part of the resampled set after receiving
+only the rows it needs
+"""
+
+
+def test(counts=(3, 5, 4), columns=4):
+    # get the packages
+    import altar
+    from altar.bayesian.DistributedAnnealing import DistributedAnnealing
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and a couple of distributions
+    gaussian = altar.pdf.ugaussian(rng=rng)
+    uniform = altar.pdf.uniform(support=(0, sum(counts)), rng=rng)
+
+    # where the chains of each task start
+    offsets = [0]
+    for count in counts:
+        offsets.append(offsets[-1] + count)
+    # the number of tasks
+    tasks = len(counts)
+    # and the total number of chains
+    samples = offsets[-1]
+
+    # the packed global state
+    packed = altar.matrix(shape=(samples, columns)).random(pdf=gaussian)
+    # a random resampling index
+    index = altar.vector(shape=samples).random(pdf=uniform)
+    for row in range(samples):
+        index[row] = int(index[row])
+    # and the resampled set it describes
+    expected = altar.matrix(shape=(samples, columns))
+    altar.libaltar.gather(index.data, packed.data, expected.data)
+
+    # build the routing table
+    routes = DistributedAnnealing.routes(index=index, offsets=offsets)
+    # every task sends each of the others exactly the rows that move there
+    for source in range(tasks):
+        for destination in range(tasks):
+            # the rows {destination} draws out of {source}
+            needed = {
+                int(index[row]) for row in range(offsets[destination], offsets[destination+1])
+                if offsets[source] <= index[row] < offsets[source+1] }
+            # check
+            assert set(routes[source][destination]) == (needed if source != destination else set())
+
+    # the blocks each task scatters
+    scattered = []
+    for task in range(tasks):
+        # the size of its largest block
+        rows = max(len(wanted) for wanted in routes[task])
+        # lay them out
+        scattered.append(
+            DistributedAnnealing.layout(
+                packed=packed.view(start=(offsets[task], 0), shape=(counts[task], columns)),
+                low=offsets[task], destinations=routes[task], rows=rows)
+            if rows else None)
+
+    # go through the tasks
+    for rank in range(tasks):
+        # the range of global rows that are mine
+        low, high = offsets[rank], offsets[rank+1]
+        # the pool starts with my own rows
+        pool = [packed.view(start=(low, 0), shape=(high-low, columns))]
+        received = {}
+        size = high - low
+        # go through the sources
+        for task in range(tasks):
+            # the rows i asked this task for
+            wanted = routes[task][rank]
+            # if there are none
+            if not wanted:
+                # move on
+                continue
+            # the size of the blocks of this task
+            rows = scattered[task].rows // tasks
+            # this is what the scatter hands me
+            pool.append(
+                scattered[task].view(start=(rank*rows, 0), shape=(len(wanted), columns)))
+            # record where each row lives
+            for position, row in enumerate(wanted):
+                received[row] = size + position
+            size += len(wanted)
+        # assemble the pool
+        everything = altar.matrix(shape=(size, columns))
+        start = 0
+        for block in pool:
+            everything.view(start=(start, 0), shape=block.shape).copy(block)
+            start += block.rows
+        # resample
+        local = DistributedAnnealing.localize(index=index, low=low, high=high, received=received)
+        resampled = altar.matrix(shape=(high-low, columns))
+        altar.libaltar.gather(local.data, everything.data, resampled.data)
+        # and check
+        for row in range(high-low):
+            for column in range(columns):
+                assert resampled[row, column] == expected[low+row, column]
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Factor a data covariance matrix through the cache and verify that the cached copy matches
+"""
+
+
+def test(size=4):
+    # get the packages
+    import shutil
+    import altar
+    from altar.models.Factorization import Factorization
+
+    # make a symmetric, diagonally dominant covariance
+    cd = altar.matrix(shape=(size, size))
+    for i in range(size):
+        for j in range(size):
+            cd[i,j] = size + 1.0 if i == j else 1.0 / (1 + i + j)
+
+    # factor it without the cache
+    expected, lndet = Factorization.factor(cd=cd)
+    # through an empty cache, which saves the result
+    computed, computedDet = Factorization.factor(cd=cd, cache="factorization-test")
+    # and again, which retrieves it
+    cached, cachedDet = Factorization.factor(cd=cd, cache="factorization-test")
+
+    # check
+    assert computedDet == lndet
+    assert cachedDet == lndet
+    for i in range(size):
+        for j in range(size):
+            assert computed[i,j] == expected[i,j]
+            assert cached[i,j] == expected[i,j]
+
+    # clean up
+    del cached
+    shutil.rmtree("factorization-test")
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Convert a text model input into a {.npy} file and verify that the memory mapped copy matches
+"""
+
+
+def test(rows=5, columns=3):
+    # get the packages
+    import os
+    import altar
+    from altar.models.Inputs import Inputs
+
+    # make a matrix
+    matrix = altar.matrix(shape=(rows, columns))
+    for i in range(rows):
+        for j in range(columns):
+            matrix[i,j] = i * columns + j + 0.5
+    # save it as text
+    matrix.save(filename="inputs-test.txt")
+
+    # convert it
+    destination = Inputs.convert(source="inputs-test.txt")
+    # map it
+    mapped = Inputs.load(uri=destination, shape=(rows, columns))
+    # and the text version
+    parsed = Inputs.load(uri="inputs-test.txt", shape=(rows, columns))
+
+    # check
+    for i in range(rows):
+        for j in range(columns):
+            assert mapped[i,j] == matrix[i,j]
+            assert parsed[i,j] == matrix[i,j]
+
+    # clean up
+    del mapped
+    os.remove("inputs-test.txt")
+    os.remove(destination)
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
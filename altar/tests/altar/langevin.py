@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Walk the chains of the Langevin sampler on a standard normal posterior, starting away from the
+peak, and verify that they settle on the right distribution
+"""
+
+
+def test(samples=2**12, parameters=2, walks=5, steps=10):
+    # get the packages
+    import types
+    import altar
+    from altar.bayesian.Langevin import Langevin
+    from altar.bayesian.Notifier import Notifier
+    from altar.bayesian.CoolingStep import CoolingStep
+
+    # a standard normal model with a flat prior
+    class Normal(altar.models.bayesian, family="altar.models.tests.normal"):
+
+        @altar.export
+        def priorLikelihood(self, step):
+            # flat
+            step.prior.zero()
+            # all done
+            return self
+
+        @altar.export
+        def dataLikelihood(self, step):
+            # go through the samples
+            for sample in range(step.samples):
+                # get the sample
+                θ = step.theta.getRow(sample)
+                # and compute its log likelihood
+                step.data[sample] = -altar.blas.ddot(θ, θ) / 2
+            # all done
+            return self
+
+        def priorLikelihoodGradient(self, step, gradient):
+            # flat
+            return self
+
+        def dataLikelihoodGradient(self, step, gradient):
+            # the gradient of {-θ^T θ / 2}
+            gradient -= step.theta
+            # all done
+            return self
+
+        @altar.export
+        def verify(self, step, mask):
+            # every sample is valid
+            return mask
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and the distribution of the initial samples
+    gaussian = altar.pdf.ugaussian(rng=rng)
+
+    # make the model
+    model = Normal(name="normal")
+    model.parameters = parameters
+    # the parts of the application the sampler needs
+    application = types.SimpleNamespace(
+        job=types.SimpleNamespace(steps=steps, gpus=0),
+        rng=types.SimpleNamespace(rng=rng),
+        model=model)
+    # and of the annealer
+    annealer = types.SimpleNamespace(model=model, dispatcher=Notifier(), scheduler=None)
+
+    # make the sampler
+    sampler = Langevin(name="langevin")
+    sampler.scaling = 1
+    sampler.initialize(application=application)
+
+    # make a sample set at the posterior
+    step = CoolingStep.alloc(samples=samples, parameters=parameters)
+    step.beta = 1
+    # with the exact covariance
+    for i in range(parameters): step.sigma[i,i] = 1
+    # start the chains away from the peak
+    step.theta.random(pdf=gaussian)
+    for sample in range(samples):
+        for i in range(parameters): step.theta[sample, i] += 2
+    # compute the likelihoods
+    model.likelihoods(annealer=annealer, step=step)
+
+    # walk
+    accepted = total = 0
+    for walk in range(walks):
+        # the chains
+        stats = sampler.samplePosterior(annealer=annealer, step=step)
+        # and count the moves
+        accepted += stats[0]
+        total += sum(stats)
+
+    # the drift along the gradient keeps the acceptance rate high
+    assert accepted > total / 2
+    # go through the parameters
+    for i in range(parameters):
+        # compute the moments of the samples
+        mean = sum(step.theta[sample, i] for sample in range(samples)) / samples
+        variance = sum((step.theta[sample, i] - mean)**2 for sample in range(samples)) / samples
+        # the chains must have forgotten their starting point
+        assert abs(mean) < .1
+        assert abs(variance - 1) < .15
+    # and the likelihoods of the samples must have been kept up to date
+    for sample in range(samples):
+        θ = step.theta.getRow(sample)
+        assert abs(step.data[sample] + altar.blas.ddot(θ, θ) / 2) < 1e-12
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Time the generation of the Metropolis candidates with and without the sampler workspace
+"""
+
+
+def allocating(theta, sigma_chol, pdf):
+    """
+    The original strategy: fresh storage for the displacements and their transpose every time
+    """
+    # get the package
+    import altar
+    # build the displacements as (parameters x samples)
+    δT = altar.matrix(shape=tuple(reversed(theta.shape))).random(pdf=pdf)
+    # multiply them by the decomposed covariance
+    δT = altar.blas.dtrmm(
+        sigma_chol.sideLeft, sigma_chol.lowerTriangular,
+        sigma_chol.opNoTrans, sigma_chol.nonUnitDiagonal,
+        1, sigma_chol, δT)
+    # allocate the transpose
+    δ = altar.matrix(shape=theta.shape)
+    # fill it
+    δT.transpose(δ)
+    # offset it by the original sample
+    δ += theta
+    # and return it
+    return δ
+
+
+def test(samples=2**14, parameters=32, steps=20):
+    # get the packages
+    import journal
+    import altar
+    # and the workspace
+    from altar.bayesian.Workspace import Workspace
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and the distribution of the displacements
+    pdf = altar.pdf.ugaussian(rng=rng)
+
+    # make a sample set
+    θ = altar.matrix(shape=(samples, parameters)).random(pdf=pdf)
+    # and a covariance matrix; make it diagonally dominant so it is positive definite
+    Σ = altar.matrix(shape=(parameters, parameters)).identity()
+    Σ *= parameters
+    # decompose it
+    Σ_chol = altar.lapack.cholesky_decomposition(Σ)
+
+    # make a timer
+    timer = altar.timers.wall("metropolis.workspace")
+
+    # time the original strategy
+    timer.reset()
+    timer.start()
+    for step in range(steps):
+        allocating(theta=θ, sigma_chol=Σ_chol, pdf=pdf)
+    timer.stop()
+    original = timer.read() / steps
+
+    # build a workspace
+    workspace = Workspace(beta=0, samples=samples, parameters=parameters)
+    # and time the candidate generation through it
+    timer.reset()
+    timer.start()
+    for step in range(steps):
+        workspace.reset()
+        workspace.displace(theta=θ, sigma_chol=Σ_chol, pdf=pdf)
+    timer.stop()
+    inplace = timer.read() / steps
+
+    # show me
+    channel = journal.info("metropolis.workspace")
+    channel.line(f"{samples} samples x {parameters} parameters, {steps} steps")
+    channel.line(f"  allocating: {1e3*original:.3f} ms/step")
+    channel.line(f"  workspace: {1e3*inplace:.3f} ms/step")
+    channel.log()
+
+    # all done
+    return workspace
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
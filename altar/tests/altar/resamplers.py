@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Exercise the resampling kernels and compare the number of distinct samples each one keeps
+"""
+
+
+def test(samples=2**12):
+    # get the packages
+    import journal
+    import altar
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and a uniform distribution
+    uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+
+    # make a set of normalized weights
+    w = altar.vector(shape=samples).random(pdf=uniform)
+    total = sum(w)
+    for i in range(samples): w[i] /= total
+    # some uniform variates
+    u = altar.vector(shape=samples).random(pdf=uniform)
+    # and room for the multiplicities
+    multi = altar.vector(shape=samples)
+
+    # the schemes
+    schemes = {
+        "systematic": lambda: altar.libaltar.resample_systematic(w.data, u[0], multi.data),
+        "stratified": lambda: altar.libaltar.resample_stratified(w.data, u.data, multi.data),
+        "residual": lambda: altar.libaltar.resample_residual(w.data, u.data, multi.data),
+        }
+
+    # make a channel
+    channel = journal.info("resamplers")
+    # go through the schemes
+    for name, scheme in schemes.items():
+        # resample
+        scheme()
+        # the multiplicities must add up to the number of samples
+        assert sum(multi) == samples
+        # show me how many samples survive
+        distinct = sum(1 for count in multi if count > 0)
+        channel.line(f"{name}: {distinct} distinct samples out of {samples}")
+    # flush
+    channel.log()
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -135,6 +135,42 @@ class Gaussian(altar.models.bayesian, family="altar.models.gaussian"):
         return self
 
 
+    def priorLikelihoodGradient(self, step, gradient):
+        """
+        Add the gradient of the prior log likelihood of each sample in {step.theta} to the
+        corresponding row of {gradient}
+        """
+        # grab the portions of the sample and the gradient that are mine
+        θ = self.restrict(theta=step.theta)
+        g = self.restrict(theta=gradient)
+        # and delegate to my prior
+        self.prior.priorLikelihoodGradient(theta=θ, gradient=g)
+        # all done
+        return self
+
+
+    def dataLikelihoodGradient(self, step, gradient):
+        """
+        Add the gradient of the data log likelihood of each sample in {step.theta} to the
+        corresponding row of {gradient}, i.e. {-σ_inv . (θ - peak)}
+        """
+        # cache the inverse of {σ}
+        σ_inv = self.σ_inv
+        # grab the portions of the sample and the gradient that are mine
+        θ = self.restrict(theta=step.theta)
+        g = self.restrict(theta=gradient)
+
+        # accumulate {- θ . σ_inv}; the samples are rows, and {σ_inv} is symmetric
+        altar.blas.dsymm(σ_inv.sideRight, σ_inv.upperTriangular, -1.0, σ_inv, θ, 1.0, g)
+        # add {σ_inv . peak} to every row, as the product of a column of ones with its transpose
+        ones = altar.matrix(shape=(θ.rows, 1))
+        ones.fill(1)
+        altar.blas.dgemm(ones.opNoTrans, ones.opNoTrans, 1.0, ones, self.pull, 1.0, g)
+
+        # all done
+        return self
+
+
     @altar.export
     def verify(self, step, mask):
         """
@@ -186,9 +222,16 @@ class Gaussian(altar.models.bayesian, family="altar.models.gaussian"):
         # compute its determinant and store it
         σ_lndet = log(λ0 * λ1)
 
+        # the gradient of the log likelihood is {σ_inv . (peak - θ)}; save the constant part as
+        # a row
+        pull = altar.matrix(shape=(1, dof)).zero()
+        for index in range(dof):
+            pull[0, index] = sum(σ_inv[index, j]*peak[j] for j in range(dof))
+
         # attach the characteristics of my pdf
         self.peak = peak
         self.σ_inv = σ_inv
+        self.pull = pull
 
         # the log-normalization
         self.normalization = -.5*(dof*log(2*π) + σ_lndet)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Compare the gradient of the data log likelihood of the gaussian model against finite
+differences of the data log likelihood itself
+"""
+
+
+def test(samples=4, h=1e-6, tolerance=1e-5):
+    # get the packages
+    import altar
+    from altar.bayesian.CoolingStep import CoolingStep
+    from altar.models.gaussian.Gaussian import Gaussian
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and a distribution
+    gaussian = altar.pdf.ugaussian(rng=rng)
+
+    # make a model
+    model = Gaussian(name="gradient")
+    parameters = model.parameters
+    # move its peak off the origin
+    model.peak[0], model.peak[1] = .3, -.2
+    # and rotate its covariance, so the off diagonal terms matter
+    model.σ_inv[0,0], model.σ_inv[1,1] = 150, 120
+    model.σ_inv[0,1] = model.σ_inv[1,0] = 40
+    # update the constant part of the gradient
+    for i in range(parameters):
+        model.pull[0,i] = sum(model.σ_inv[i,j] * model.peak[j] for j in range(parameters))
+
+    # make a sample set
+    step = CoolingStep.alloc(samples=samples, parameters=parameters)
+    step.theta.random(pdf=gaussian)
+    # compute the gradient
+    gradient = altar.matrix(shape=(samples, parameters)).zero()
+    model.dataLikelihoodGradient(step=step, gradient=gradient)
+
+    # make room for the displaced samples
+    shifted = CoolingStep.alloc(samples=samples, parameters=parameters)
+    # go through the parameters
+    for parameter in range(parameters):
+        # displace them forward; the model accumulates into the likelihoods, so clear them
+        shifted.theta.copy(step.theta)
+        for sample in range(samples): shifted.theta[sample, parameter] += h
+        model.dataLikelihood(step=shifted)
+        forward = shifted.data.clone()
+        shifted.data.zero()
+        # and backward
+        shifted.theta.copy(step.theta)
+        for sample in range(samples): shifted.theta[sample, parameter] -= h
+        model.dataLikelihood(step=shifted)
+        backward = shifted.data.clone()
+        shifted.data.zero()
+        # compare
+        for sample in range(samples):
+            estimate = (forward[sample] - backward[sample]) / (2*h)
+            exact = gradient[sample, parameter]
+            assert abs(estimate - exact) <= tolerance * max(1, abs(exact))
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -158,29 +158,127 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
         θ = self.restrict(theta=step.theta)
         # the green functions
         G = self.G
-        # the observations
-        d = self.d
-        # the inverse of the data covariance
-        Cd_inv = self.Cd_inv
-        # the normalization
-        normalization = self.normalization
-        # and the storage for the data likelihoods
-        dataLLK = step.data
 
-        # clone the residuals since the operations that follow write in-place
-        residuals = self.residuals.clone()
+        # clone the residuals since the operations that follow write in-place; the sampler may
+        # hand me fewer samples than chains, in which case i need a template of the right shape
+        residuals = (
+            self.residuals.clone() if θ.rows == self.residuals.columns
+            else self.initializeResiduals(samples=θ.rows, data=self.d))
         # compute G * transpose(θ) - d
         # we must transpose θ because its shape is (samples x parameters)
         # while the shape of G is (observations x parameters)
         residuals = altar.blas.dgemm(G.opNoTrans, θ.opTrans, 1.0, G, θ, -1.0, residuals)
+        # convert them into data log likelihoods
+        self.computeDataLikelihood(residuals=residuals, dataLLK=step.data)
+
+        # all done
+        return self
+
+
+    def priorLikelihoodGradient(self, step, gradient):
+        """
+        Add the gradient of the prior log likelihood of each sample in {step.theta} to the
+        corresponding row of {gradient}
+        """
+        # grab the portions of the sample and the gradient that are mine
+        θ = self.restrict(theta=step.theta)
+        g = self.restrict(theta=gradient)
+        # and delegate to my prior
+        self.prior.priorLikelihoodGradient(theta=θ, gradient=g)
+        # all done
+        return self
+
+
+    def dataLikelihoodGradient(self, step, gradient):
+        """
+        Add the gradient of the data log likelihood of each sample in {step.theta} to the
+        corresponding row of {gradient}
+
+        With r = G θ - d and L the decomposed inverse of the data covariance, the norm
+        evaluates |L r|, so the log likelihood -|L r|^2 / 2 has the gradient -G^T L^T L r
+        """
+        # grab the portions of the sample and the gradient that are mine
+        θ = self.restrict(theta=step.theta)
+        g = self.restrict(theta=gradient)
+        # the green functions
+        G = self.G
+        # and the decomposed inverse of the data covariance
+        L = self.Cd_inv
+
+        # build the residuals, one column per sample
+        residuals = (
+            self.residuals.clone() if θ.rows == self.residuals.columns
+            else self.initializeResiduals(samples=θ.rows, data=self.d))
+        residuals = altar.blas.dgemm(G.opNoTrans, θ.opTrans, 1.0, G, θ, -1.0, residuals)
+        # apply {L^T L}, in the order the norm applies {L}
+        altar.blas.dtrmm(
+            L.sideLeft, L.lowerTriangular, L.opNoTrans, L.nonUnitDiagonal, 1, L, residuals)
+        altar.blas.dtrmm(
+            L.sideLeft, L.lowerTriangular, L.opTrans, L.nonUnitDiagonal, 1, L, residuals)
+        # project onto the parameter space and accumulate; the samples are rows of {g}
+        altar.blas.dgemm(residuals.opTrans, G.opNoTrans, -1.0, residuals, G, 1.0, g)
+
+        # all done
+        return self
 
-        # go through the residual of each sample
-        for idx in range(residuals.columns):
-            # extract it
-            residual = residuals.getColumn(idx)
-            # compute its norm, normalize, and store it as the data log likelihood
-            dataLLK[idx] = normalization - self.norm.eval(v=residual, sigma_inv=Cd_inv)/2
 
+    def blockStart(self, annealer, step):
+        """
+        Cache the residuals of the samples in {step}, so that the blocked samplers can update
+        them one block of parameters at a time
+        """
+        # grab the portion of the sample that's mine
+        θ = self.restrict(theta=step.theta)
+        # the green functions
+        G = self.G
+        # prime the residuals
+        residuals = (
+            self.residuals.clone() if θ.rows == self.residuals.columns
+            else self.initializeResiduals(samples=θ.rows, data=self.d))
+        # compute G * transpose(θ) - d and save it
+        self.predictions = altar.blas.dgemm(G.opNoTrans, θ.opTrans, 1.0, G, θ, -1.0, residuals)
+        # make room for the residuals of the candidates
+        self.candidates = residuals.clone()
+        # all done
+        return True
+
+
+    def blockLikelihood(self, annealer, step, candidate, offset, count):
+        """
+        Fill {candidate.data} with the data likelihoods of the samples in {candidate.theta},
+        given that they differ from the ones in {step.theta} only in the {count} parameters that
+        start at column {offset}
+
+        The residuals of the candidates are the cached ones, corrected by the contribution of
+        the block that moved; this costs O(observations x count) per sample, rather than
+        O(observations x parameters) for the full forward model
+        """
+        # the block of the current samples that moved
+        θ = step.theta.view(start=(0, offset), shape=(step.samples, count))
+        # and the matching block of the candidates
+        cθ = candidate.theta.view(start=(0, offset), shape=(step.samples, count))
+        # the green functions of these parameters
+        G = self.G.view(start=(0, offset - self.offset), shape=(self.observations, count))
+        # get the storage for the residuals of the candidates
+        residuals = self.candidates
+        # start out with the residuals of the current samples
+        residuals.copy(self.predictions)
+        # add the contribution of the displaced block
+        altar.blas.dgemm(G.opNoTrans, cθ.opTrans, 1.0, G, cθ, 1.0, residuals)
+        # and remove the contribution of the original one
+        altar.blas.dgemm(G.opNoTrans, θ.opTrans, -1.0, G, θ, 1.0, residuals)
+        # convert them into data log likelihoods
+        self.computeDataLikelihood(residuals=residuals, dataLLK=candidate.data)
+        # all done
+        return self
+
+
+    def blockAccept(self, annealer, step, candidate, moves):
+        """
+        Update the cached residuals with the ones of the accepted candidates
+        """
+        # the samples are the columns of the residuals, so carry over the ones that moved
+        altar.libaltar.restore_columns(self.candidates.data, self.predictions.data, moves.data)
         # all done
         return self
 
@@ -249,10 +347,8 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
             raise
         # if all goes well
         else:
-            # allocate the matrix
-            green = altar.matrix(shape=(self.observations, self.parameters))
-            # and load the file contents into memory
-            green.load(gf.uri)
+            # load the file contents
+            green = self.loadInput(uri=gf.uri, shape=(self.observations, self.parameters))
 
         # next, the observations
         try:
@@ -268,10 +364,8 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
             raise
         # if all goes well
         else:
-            # allocate the vector
-            data = altar.vector(shape=self.observations)
-            # and load the file contents into memory
-            data.load(df.uri)
+            # load the file contents
+            data = self.loadInput(uri=df.uri, shape=self.observations)
 
         # finally, the data covariance
         try:
@@ -287,10 +381,8 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
             raise
         # if all goes well
         else:
-            # allocate the matrix
-            cd = altar.matrix(shape=(self.observations, self.observations))
-            # and load the file contents into memory
-            cd.load(cf.uri)
+            # load the file contents
+            cd = self.loadInput(uri=cf.uri, shape=(self.observations, self.observations))
 
         # all done
         return green, data, cd
@@ -300,14 +392,8 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
         """
         Compute the inverse of the data covariance matrix
         """
-        # make a copy so we don't destroy the original
-        cd = cd.clone()
-        # perform the LU decomposition
-        lu = altar.lapack.LU_decomposition(cd)
-        # invert; this creates a new matrix
-        inv = altar.lapack.LU_invert(*lu)
-        # compute the Cholesky decomposition
-        inv = altar.lapack.cholesky_decomposition(inv)
+        # get the Cholesky decomposition of the inverse
+        inv, _ = self.factorCovariance(cd=cd)
         # and return it
         return inv
 
@@ -318,16 +404,34 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
         """
         # support
         from math import log, pi as π
-        # make a copy of cd
-        cd = cd.clone()
-        # compute its LU decomposition
-        decomposition = altar.lapack.LU_decomposition(cd)
-        # use it to compute the log of its determinant
-        logdet = altar.lapack.LU_lndet(*decomposition)
+        # get the log of the determinant of cd
+        _, logdet = self.factorCovariance(cd=cd)
         # all done
         return - (log(2*π)*observations + logdet) / 2;
 
 
+    def computeDataLikelihood(self, residuals, dataLLK):
+        """
+        Fill {dataLLK} with the data log likelihoods of the samples whose residuals (G θ - d)
+        are the columns of {residuals}
+        """
+        # the inverse of the data covariance
+        Cd_inv = self.Cd_inv
+        # the normalization
+        normalization = self.normalization
+        # go through the residual of each sample
+        for idx in range(residuals.columns):
+            # extract it
+            residual = residuals.getColumn(idx)
+            # compute its norm
+            nrm = self.norm.eval(v=residual, sigma_inv=Cd_inv)
+            # normalize and store it as the data log likelihood; the norm must be squared for
+            # this to be the gaussian that {normalization} refers to
+            dataLLK[idx] = normalization - nrm**2 / 2
+        # all done
+        return dataLLK
+
+
     def initializeResiduals(self, samples, data):
         """
         Prime the matrix that will hold the residuals (G θ - d) for each sample by duplicating the
@@ -354,6 +458,8 @@ class Linear(altar.models.bayesian, family="altar.models.linear"):
     # computed
     Cd_inv = None # the inverse of the data covariance matrix
     residuals = None # matrix that holds (G θ - d) for each sample
+    predictions = None # the residuals of the current samples, cached by the blocked samplers
+    candidates = None # the residuals of the candidates of the blocked samplers
     normalization = 1 # the normalization of the L2 norm
 
 
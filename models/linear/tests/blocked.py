@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Walk a few links of blocked proposals through the incremental data likelihood of the linear
+model and verify that it agrees with the full forward model
+"""
+
+
+def close(x, y, tolerance=1e-9):
+    """
+    Check whether {x} and {y} agree to within {tolerance}, relative to their size
+    """
+    # compare
+    return abs(x - y) <= tolerance * max(1, abs(x), abs(y))
+
+
+def test(samples=8, parameters=5, observations=7, links=9):
+    # get the packages
+    import altar
+    from altar.bayesian.CoolingStep import CoolingStep
+    from altar.models.linear.Linear import Linear
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and a couple of distributions
+    gaussian = altar.pdf.ugaussian(rng=rng)
+    uniform = altar.pdf.uniform(support=(0,1), rng=rng)
+
+    # make a model
+    model = Linear(name="blocked")
+    model.parameters = parameters
+    model.observations = observations
+    # give it some green functions and some observations
+    model.G = altar.matrix(shape=(observations, parameters)).random(pdf=gaussian)
+    model.d = altar.vector(shape=observations).random(pdf=gaussian)
+    # a data covariance
+    model.Cd = altar.matrix(shape=(observations, observations)).identity()
+    model.Cd *= 2
+    # and the quantities it derives from them
+    model.normalization = model.computeNormalization(observations=observations, cd=model.Cd)
+    model.Cd_inv = model.computeCovarianceInverse(model.Cd)
+    model.residuals = model.initializeResiduals(samples=samples, data=model.d)
+
+    # make a sample set
+    step = CoolingStep.alloc(samples=samples, parameters=parameters)
+    step.theta.random(pdf=gaussian)
+    # compute its data likelihoods
+    model.dataLikelihood(step=step)
+    # make room for the candidates
+    candidate = CoolingStep.alloc(samples=samples, parameters=parameters)
+    # the full forward model of the candidates
+    full = CoolingStep.alloc(samples=samples, parameters=parameters)
+    # and the mask of the accepted candidates
+    moves = altar.vector(shape=samples)
+
+    # the parameter blocks
+    blocks = [(0, 2), (2, 2), (4, 1)]
+    # let the model prepare
+    assert model.blockStart(annealer=None, step=step)
+    # walk
+    for link in range(links):
+        # pick a block
+        offset, count = blocks[link % len(blocks)]
+        # displace it
+        candidate.theta.copy(step.theta)
+        δ = candidate.theta.view(start=(0, offset), shape=(samples, count))
+        δ.random(pdf=gaussian)
+        δ += step.theta.view(start=(0, offset), shape=(samples, count))
+
+        # compute the data likelihoods incrementally
+        model.blockLikelihood(
+            annealer=None, step=step, candidate=candidate, offset=offset, count=count)
+        # and from scratch
+        full.theta.copy(candidate.theta)
+        model.dataLikelihood(step=full)
+        # check
+        for sample in range(samples):
+            assert close(candidate.data[sample], full.data[sample])
+
+        # accept some of the candidates at random
+        moves.random(pdf=uniform)
+        for sample in range(samples):
+            moves[sample] = 1 if moves[sample] > .5 else 0
+        # merge them
+        altar.libaltar.restore(candidate.theta.data, step.theta.data, moves.data)
+        for sample in range(samples):
+            if moves[sample]: step.data[sample] = candidate.data[sample]
+        # and tell the model
+        model.blockAccept(annealer=None, step=step, candidate=candidate, moves=moves)
+
+    # the likelihoods of the samples must still match the full forward model
+    full.theta.copy(step.theta)
+    model.dataLikelihood(step=full)
+    for sample in range(samples):
+        assert close(step.data[sample], full.data[sample])
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Compare the gradient of the data log likelihood of the linear model against finite differences
+of the data log likelihood itself
+"""
+
+
+def test(samples=4, parameters=3, observations=5, h=1e-6, tolerance=1e-5):
+    # get the packages
+    import altar
+    from altar.bayesian.CoolingStep import CoolingStep
+    from altar.models.linear.Linear import Linear
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and a distribution
+    gaussian = altar.pdf.ugaussian(rng=rng)
+
+    # make a model
+    model = Linear(name="gradient")
+    model.parameters = parameters
+    model.observations = observations
+    # give it some green functions and some observations
+    model.G = altar.matrix(shape=(observations, parameters)).random(pdf=gaussian)
+    model.d = altar.vector(shape=observations).random(pdf=gaussian)
+    # a data covariance with correlations, so the order of the factors matters
+    model.Cd = altar.matrix(shape=(observations, observations)).zero()
+    for i in range(observations):
+        model.Cd[i,i] = 2
+        if i > 0: model.Cd[i,i-1] = model.Cd[i-1,i] = .3
+    # and the quantities it derives from them
+    model.normalization = model.computeNormalization(observations=observations, cd=model.Cd)
+    model.Cd_inv = model.computeCovarianceInverse(model.Cd)
+    model.residuals = model.initializeResiduals(samples=samples, data=model.d)
+
+    # make a sample set
+    step = CoolingStep.alloc(samples=samples, parameters=parameters)
+    step.theta.random(pdf=gaussian)
+    # compute the gradient
+    gradient = altar.matrix(shape=(samples, parameters)).zero()
+    model.dataLikelihoodGradient(step=step, gradient=gradient)
+
+    # make room for the displaced samples
+    shifted = CoolingStep.alloc(samples=samples, parameters=parameters)
+    # go through the parameters
+    for parameter in range(parameters):
+        # displace them forward
+        shifted.theta.copy(step.theta)
+        for sample in range(samples): shifted.theta[sample, parameter] += h
+        model.dataLikelihood(step=shifted)
+        forward = shifted.data.clone()
+        # and backward
+        shifted.theta.copy(step.theta)
+        for sample in range(samples): shifted.theta[sample, parameter] -= h
+        model.dataLikelihood(step=shifted)
+        backward = shifted.data.clone()
+        # compare
+        for sample in range(samples):
+            estimate = (forward[sample] - backward[sample]) / (2*h)
+            exact = gradient[sample, parameter]
+            assert abs(estimate - exact) <= tolerance * max(1, abs(exact))
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file
@@ -479,8 +479,12 @@ displacements(PyObject *, PyObject * args)
         << "displacements: " << displ
         << pyre::journal::endl;
 
+    // the source is not modified by the computation and touches no python state, so let
+    // other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
     // compute the predictions based on the sample parameters
     source->displacements(samples, displ);
+    Py_END_ALLOW_THREADS
 
     // all done
     Py_INCREF(Py_None);
@@ -547,8 +551,12 @@ residuals(PyObject *, PyObject * args)
         << "displacements: " << displ
         << pyre::journal::endl;
 
-    // compute the predictions based on the sample parameters
+    // the source is not modified by the computation and touches no python state, so let
+    // other threads run while it works
+    Py_BEGIN_ALLOW_THREADS
+    // compute the residuals in place
     source->residuals(displ);
+    Py_END_ALLOW_THREADS
 
     // all done
     Py_INCREF(Py_None);
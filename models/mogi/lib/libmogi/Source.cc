@@ -121,14 +121,8 @@ displacements(gsl_matrix_view * samples, gsl_matrix * predicted) const {
 void
 altar::models::mogi::Source::
 residuals(gsl_matrix * predicted) const {
-    // make a channel
-    pyre::journal::debug_t channel("mogi.source");
-
-    // sign on
-    channel
-        << pyre::journal::at(__HERE__)
-        << "computing residuals in place"
-        << pyre::journal::endl;
+    // no journal channels in here: the bindings call me without holding the interpreter lock,
+    // so they do the talking before they release it
 
     // unpack the number of samples and number of observations
     auto nSamples = predicted->size1;
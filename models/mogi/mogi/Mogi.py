@@ -205,22 +205,6 @@ class Mogi(altar.models.bayesian, family="altar.models.mogi"):
         return self
 
 
-    @altar.export
-    def verify(self, step, mask):
-        """
-        Check whether the samples in {step.theta} are consistent with the model requirements and
-        update the {mask}, a vector with zeroes for valid samples and non-zero for invalid ones
-        """
-        # grab the portion of the sample that's mine
-        θ = self.restrict(theta=step.theta)
-        # go through each parameter set
-        for pset in self.psets.values():
-            # and ask each one to verify the sample
-            pset.verify(theta=θ, mask=mask)
-        # all done; return the rejection map
-        return mask
-
-
     # implementation details
     def initializeParameterSets(self):
         """
@@ -237,6 +221,8 @@ class Mogi(altar.models.bayesian, family="altar.models.mogi"):
             offset += pset.initialize(model=self, offset=offset)
         # the total number of parameters is now known, so record it
         self.parameters = offset
+        # collect the supports of the priors, so that samples can be verified in a single pass
+        self.support = self.collectSupport()
 
         # record the layout of the sample vector
         self.xIdx = psets["location"].offset
@@ -315,10 +301,8 @@ class Mogi(altar.models.bayesian, family="altar.models.mogi"):
             raise
         # if all goes well
         else:
-            # allocate the matrix
-            covariance = altar.matrix(shape=[self.observations]*2)
-            # and load the contents into memory
-            covariance.load(node.uri)
+            # load the file contents
+            covariance = self.loadInput(uri=node.uri, shape=(self.observations,)*2)
 
         # all done
         return data, covariance
@@ -330,12 +314,8 @@ class Mogi(altar.models.bayesian, family="altar.models.mogi"):
         """
         # support
         from math import log, pi as π
-        # make a copy of my data covariance
-        cd = self.cd.clone()
-        # perform an LU decomposition
-        lu = altar.lapack.LU_decomposition(cd)
-        # use it to compute the log of its determinant
-        lndet = altar.lapack.LU_lndet(*lu)
+        # get the log of the determinant of my data covariance
+        _, lndet = self.factorCovariance(cd=self.cd)
         # compute and return
         return - 0.5 * (log(2*π)*self.observations + lndet);
 
@@ -344,14 +324,8 @@ class Mogi(altar.models.bayesian, family="altar.models.mogi"):
         """
         Compute the inverse of my data covariance
         """
-        # make a copy of the covariance matrix
-        cd = self.cd.clone()
-        # perform an LU decomposition
-        lu = altar.lapack.LU_decomposition(cd)
-        # invert it
-        inverse = altar.lapack.LU_invert(*lu)
-        # and compute the Cholesky decomposition of the inverse
-        chol = altar.lapack.cholesky_decomposition(inverse)
+        # get the Cholesky decomposition of the inverse of my data covariance
+        chol, _ = self.factorCovariance(cd=self.cd)
         # all done
         return chol
 
@@ -33,68 +33,135 @@ class Native:
         Fill {step.data} with the likelihoods of the samples in {step.theta} given the available
         data.
         """
-        # get the norm
-        norm = model.norm
         # grab the portion of the sample that belongs to this model
         θ = model.restrict(theta=step.theta)
-        # the observed displacements
-        displacements = model.d
-        # the inverse of the data covariance matrix
-        cd_inv = model.cd_inv
-        # the normalization
-        normalization = model.normalization
         # and the storage for the data likelihoods
         dataLLK = step.data
 
-        # find out how many samples in the set
-        samples = θ.rows
-        # get the parameter sets
-        psets = model.psets
+        # for each sample in the sample set
+        for sample in range(θ.rows):
+            # extract the parameters
+            parameters = θ.getRow(sample)
+            # compute the residual of the source displacements
+            u = self.residual(model=model, parameters=parameters)
+            # adjust it using the offsets and store the data log likelihood
+            dataLLK[sample] = self.likelihood(model=model, residual=u, parameters=parameters)
 
-        # get the offsets of the various parameter sets
-        xIdx = model.xIdx
-        yIdx = model.yIdx
-        dIdx = model.dIdx
-        sIdx = model.sIdx
-        offsetIdx = model.offsetIdx
+        # all done
+        return self
 
-        # get the observations
-        los = model.los
-        oid = model.oid
-        locations = model.points
-        observations = model.observations
+
+    def blockStart(self, model, step):
+        """
+        Cache the residuals of the source displacements of the samples in {step}
+        """
+        # grab the portion of the sample that belongs to this model
+        θ = model.restrict(theta=step.theta)
+        # compute the residuals
+        self.residuals = [
+            self.residual(model=model, parameters=θ.getRow(sample))
+            for sample in range(θ.rows) ]
+        # and make room for the ones of the candidates
+        self.candidates = list(self.residuals)
+        # all done
+        return True
+
+
+    def blockLikelihood(self, model, step, candidate, offset, count):
+        """
+        Fill {candidate.data} with the likelihoods of the samples in {candidate.theta}, given
+        that they differ from the ones in {step.theta} only in the {count} parameters that start
+        at column {offset}
+        """
+        # grab the portion of the candidates that belongs to this model
+        θ = model.restrict(theta=candidate.theta)
+        # and the storage for the data likelihoods
+        dataLLK = candidate.data
+        # the source displacements don't depend on the offsets, so if they are all that moved
+        reuse = offset - model.offset == model.offsetIdx
+        # the cached residuals
+        residuals = self.residuals
+        # and the ones of the candidates
+        candidates = self.candidates
 
         # for each sample in the sample set
-        for sample in range(samples):
+        for sample in range(θ.rows):
             # extract the parameters
             parameters = θ.getRow(sample)
-            # get the location of the source
-            x = parameters[xIdx]
-            y = parameters[yIdx]
-            # its depth
-            d = parameters[dIdx]
-            # and its strength; we model the logarithm of this one, so we have to exponentiate
-            dV = 10**parameters[sIdx]
-
-            # make a source using the sample parameters
-            mogi = source(x=x, y=y, d=d, dV=dV)
-            # compute the expected displacement
-            u = mogi.displacements(locations=locations, los=los)
-
-            # subtract the observed displacements
-            u -= displacements
-            # adjust using the offset
-            for obs in range(observations):
-                # appropriate for the corresponding dataset
-                u[obs] -= parameters[offsetIdx + oid[obs]]
-
-            # compute the norm of the displacements
-            nrm = norm.eval(v=u, sigma_inv=cd_inv)
-            # normalize and store it as the data log likelihood
-            dataLLK[sample] = normalization - nrm**2 / 2
+            # get the residual of the source displacements
+            u = residuals[sample] if reuse else self.residual(model=model, parameters=parameters)
+            # save it
+            candidates[sample] = u
+            # adjust a copy using the offsets and store the data log likelihood
+            dataLLK[sample] = self.likelihood(
+                model=model, residual=u.clone(), parameters=parameters)
 
         # all done
         return self
 
 
+    def blockAccept(self, model, moves):
+        """
+        Update the cached residuals with the ones of the accepted candidates
+        """
+        # go through the samples
+        for sample in range(moves.shape):
+            # if this one moved
+            if moves[sample]:
+                # carry its residual over
+                self.residuals[sample] = self.candidates[sample]
+        # all done
+        return self
+
+
+    # implementation details
+    def residual(self, model, parameters):
+        """
+        Compute the difference between the displacements of the source described by
+        {parameters} and the observations
+        """
+        # get the location of the source
+        x = parameters[model.xIdx]
+        y = parameters[model.yIdx]
+        # its depth
+        d = parameters[model.dIdx]
+        # and its strength; we model the logarithm of this one, so we have to exponentiate
+        dV = 10**parameters[model.sIdx]
+
+        # make a source using the sample parameters
+        mogi = source(x=x, y=y, d=d, dV=dV)
+        # compute the expected displacement
+        u = mogi.displacements(locations=model.points, los=model.los)
+        # subtract the observed displacements
+        u -= model.d
+
+        # all done
+        return u
+
+
+    def likelihood(self, model, residual, parameters):
+        """
+        Adjust {residual} in place using the offsets in {parameters} and compute the data log
+        likelihood
+        """
+        # get the offsets
+        offsetIdx = model.offsetIdx
+        # and the dataset of each observation
+        oid = model.oid
+        # adjust using the offset
+        for obs in range(model.observations):
+            # appropriate for the corresponding dataset
+            residual[obs] -= parameters[offsetIdx + oid[obs]]
+
+        # compute the norm of the displacements
+        nrm = model.norm.eval(v=residual, sigma_inv=model.cd_inv)
+        # normalize and return the data log likelihood
+        return model.normalization - nrm**2 / 2
+
+
+    # private data
+    residuals = None # the residuals of the current samples, cached by the blocked samplers
+    candidates = None # the residuals of the candidates of the blocked samplers
+
+
 # end of file
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# michael a.g. aïvázis <michael.aivazis@para-sim.com>
+#
+# (c) 2013-2020 parasim inc
+# (c) 2010-2020 california institute of technology
+# all rights reserved
+#
+
+
+"""
+Initialize the blocked Metropolis sampler before the mogi model lays out its parameter sets, as
+the application does, and verify that the blocked proposals follow the actual layout
+"""
+
+
+def test(samples=8):
+    # get the packages
+    import types
+    import altar
+    from altar.bayesian.CoolingStep import CoolingStep
+    from altar.bayesian.Metropolis import Metropolis
+    from altar.bayesian.Notifier import Notifier
+    from altar.distributions.Uniform import Uniform
+    from altar.models.Contiguous import Contiguous
+    from altar.models.mogi.Mogi import Mogi
+
+    # build the random number generator
+    rng = altar.rng(algorithm="ranlxs2")
+    # and the parts of the application the model and the sampler need
+    job = types.SimpleNamespace(chains=samples, steps=1, gpus=0)
+    application = types.SimpleNamespace(job=job, rng=types.SimpleNamespace(rng=rng))
+
+    # the parameter sets of the model, as in the example configuration
+    layout = {
+        "location": (2, (-5000, 5000)),
+        "depth": (1, (2000, 4000)),
+        "source": (1, (9, 11)),
+        "offsets": (2, (-.1, .1)),
+    }
+    psets = {}
+    for name, (count, support) in layout.items():
+        # make the set
+        pset = Contiguous(name=name)
+        pset.count = count
+        # and its distributions
+        pset.prep = Uniform(name=f"{name}.prep")
+        pset.prior = Uniform(name=f"{name}.prior")
+        pset.prep.support = pset.prior.support = support
+        # save it
+        psets[name] = pset
+
+    # make the model
+    model = Mogi(name="mogi")
+    model.psets = psets
+    model.rng = application.rng
+    application.model = model
+
+    # make a blocked sampler
+    sampler = Metropolis(name="sampler")
+    sampler.blocked = True
+    # the application initializes it before the model
+    sampler.initialize(application=application)
+    # which is when the parameter sets get their offsets
+    model.initializeParameterSets()
+    parameters = model.parameters
+
+    # make a sample set
+    step = CoolingStep.alloc(samples=samples, parameters=parameters)
+    model.initializeSample(step=step)
+    # and give it a covariance that fits the supports of the priors
+    low, high = model.support
+    for parameter in range(parameters):
+        step.sigma[parameter, parameter] = ((high[parameter] - low[parameter]) / 10)**2
+    # prepare the proposals
+    annealer = types.SimpleNamespace(model=model, scheduler=None, dispatcher=Notifier())
+    sampler.prepareSamplingPDF(annealer=annealer, step=step)
+    sampler.prepareWorkspace(step=step)
+
+    # the blocks are the parameter sets, where the model placed them
+    assert sampler.blocks == sorted((pset.offset, pset.count) for pset in psets.values())
+    # so the offsets of the data get a block of their own
+    assert (model.offsetIdx, psets["offsets"].count) in sampler.blocks
+
+    # go through the blocks
+    moved = set()
+    for block, (offset, count) in enumerate(sampler.blocks):
+        # displace the samples
+        cθ = sampler.proposeBlock(
+            step=step, offset=offset, count=count, chol=sampler.factors[block])
+        # and record the parameters that moved
+        for parameter in range(parameters):
+            if any(cθ[sample, parameter] != step.theta[sample, parameter]
+                   for sample in range(samples)):
+                moved.add(parameter)
+    # every parameter gets proposed
+    assert moved == set(range(parameters))
+
+    # all done
+    return
+
+
+# bootstrap
+if __name__ == "__main__":
+    # run the driver
+    test()
+    # report success
+    raise SystemExit(0)
+
+
+# end of file